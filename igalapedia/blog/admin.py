@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
+from main.models import VisitorSketch
 from .models import BlogPost, BlogPostLike, BlogPostComment, BlogGuidelinesAck, BlogPostReport, BlogPostView
 
 
@@ -9,18 +10,37 @@ class BlogPostAdmin(admin.ModelAdmin):
     list_display = ('title', 'author', 'status', 'published_at', 'is_hidden', 'created_at')
     list_filter = ('status', 'is_hidden', 'created_at')
     search_fields = ('title', 'author__username', 'body')
+    readonly_fields = ('view_count', 'visitors_last_7_days', 'visitors_all_time')
     actions = ['hide_posts', 'unhide_posts']
 
+    @admin.display(description='Unique visitors (7 days)')
+    def visitors_last_7_days(self, obj):
+        return VisitorSketch.unique_visitors('blog', obj.pk, days=7) if obj.pk else 0
+
+    @admin.display(description='Unique visitors (all time)')
+    def visitors_all_time(self, obj):
+        return VisitorSketch.unique_visitors('blog', obj.pk) if obj.pk else 0
+
     @admin.action(description='Hide selected posts')
     def hide_posts(self, request, queryset):
-        updated = queryset.update(is_hidden=True)
+        updated = self._set_hidden(queryset, True)
         self.message_user(request, f'{updated} post(s) hidden.')
 
     @admin.action(description='Unhide selected posts')
     def unhide_posts(self, request, queryset):
-        updated = queryset.update(is_hidden=False)
+        updated = self._set_hidden(queryset, False)
         self.message_user(request, f'{updated} post(s) unhidden.')
 
+    @staticmethod
+    def _set_hidden(queryset, hidden):
+        # Saved one by one (not queryset.update) so the post_save signals keep
+        # the feed and cached pages in step.
+        posts = list(queryset.exclude(is_hidden=hidden))
+        for post in posts:
+            post.is_hidden = hidden
+            post.save(update_fields=['is_hidden', 'updated_at'])
+        return len(posts)
+
 
 @admin.register(BlogPostLike)
 class BlogPostLikeAdmin(admin.ModelAdmin):
@@ -43,6 +63,7 @@ class BlogGuidelinesAckAdmin(admin.ModelAdmin):
 class BlogPostViewAdmin(admin.ModelAdmin):
     list_display = ('post', 'ip_hash', 'viewed_date')
     list_filter = ('viewed_date',)
+    list_select_related = ('post',)
     readonly_fields = ('post', 'ip_hash', 'viewed_date')
 
 
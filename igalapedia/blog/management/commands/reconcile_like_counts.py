@@ -0,0 +1,26 @@
+"""
+Management command to recompute the denormalized like_count of every blog post.
+Usage: python manage.py reconcile_like_counts
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from blog.models import BlogPost, BlogPostLike
+from main.page_cache import purge_tags
+
+
+class Command(BaseCommand):
+    help = "Recompute BlogPost.like_count from BlogPostLike rows, fixing any drift."
+
+    def handle(self, *args, **options):
+        likes = (
+            BlogPostLike.objects.filter(post=OuterRef("pk"))
+            .values("post").annotate(n=Count("id")).values("n")
+        )
+        exact = Coalesce(Subquery(likes), Value(0))
+        drifted = list(BlogPost.objects.annotate(exact=exact).exclude(like_count=exact).values_list("pk", flat=True))
+        if drifted:
+            BlogPost.objects.filter(pk__in=drifted).update(like_count=exact)
+            purge_tags("blog-list", *(f"blog:{pk}" for pk in drifted))
+        self.stdout.write(self.style.SUCCESS(f"Done. Fixed like_count on {len(drifted)} post(s)."))
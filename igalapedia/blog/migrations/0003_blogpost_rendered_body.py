@@ -0,0 +1,49 @@
+# Generated by Django 5.0.3 on 2026-10-18 18:42
+
+from django.db import migrations, models
+
+from core.richtext import render_rich_text, make_excerpt
+
+
+def render_bodies(apps, schema_editor):
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    posts = []
+    for post in BlogPost.objects.only('id', 'body').iterator(chunk_size=200):
+        rendered = render_rich_text(post.body)
+        post.body_html = rendered.html
+        post.excerpt = make_excerpt(rendered.text)
+        post.word_count = rendered.word_count
+        post.reading_time = rendered.reading_time
+        posts.append(post)
+    BlogPost.objects.bulk_update(posts, ['body_html', 'excerpt', 'word_count', 'reading_time'], batch_size=200)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_blogpostview_blogpostview_unique_blog_view_per_day'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='body_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=300),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Minutes'),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(render_bodies, migrations.RunPython.noop),
+    ]
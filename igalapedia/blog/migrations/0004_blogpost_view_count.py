@@ -0,0 +1,37 @@
+# Generated by Django 5.0.3 on 2026-10-18 18:51
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_post_views(apps, schema_editor):
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    BlogPostView = apps.get_model('blog', 'BlogPostView')
+    views = (
+        BlogPostView.objects.filter(post=OuterRef('pk'))
+        .values('post').annotate(n=Count('id')).values('n')
+    )
+    BlogPost.objects.update(view_count=Coalesce(Subquery(views), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_blogpost_rendered_body'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['status', 'is_hidden', '-published_at'], name='blogpost_public_idx'),
+        ),
+        migrations.RunPython(count_post_views, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.3 on 2026-10-18 18:53
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_likes(apps, schema_editor):
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    BlogPostLike = apps.get_model('blog', 'BlogPostLike')
+    likes = (
+        BlogPostLike.objects.filter(post=OuterRef('pk'))
+        .values('post').annotate(n=Count('id')).values('n')
+    )
+    BlogPost.objects.update(like_count=Coalesce(Subquery(likes), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_blogpost_view_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_likes, migrations.RunPython.noop),
+    ]
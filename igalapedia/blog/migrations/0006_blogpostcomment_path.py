@@ -0,0 +1,51 @@
+# Generated by Django 5.0.3 on 2026-10-18 18:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_paths(apps, schema_editor):
+    BlogPostComment = apps.get_model('blog', 'BlogPostComment')
+    placed = {}
+    comments = []
+    # Replies are always created after their parent, so id order visits parents first.
+    for comment in BlogPostComment.objects.order_by('pk').only('id', 'parent_id').iterator(chunk_size=1000):
+        parent = placed.get(comment.parent_id)
+        comment.path = (parent[0] if parent else '') + f'{comment.pk:010d}'
+        comment.depth = parent[1] + 1 if parent else 0
+        comment.root_id = parent[2] if parent else comment.pk
+        placed[comment.pk] = (comment.path, comment.depth, comment.root_id)
+        comments.append(comment)
+    BlogPostComment.objects.bulk_update(comments, ['path', 'depth', 'root'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_blogpost_like_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpostcomment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpostcomment',
+            name='path',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='blogpostcomment',
+            name='root',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='thread_comments', to='blog.blogpostcomment'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpostcomment',
+            index=models.Index(fields=['post', 'path'], name='blogcomment_post_path_idx'),
+        ),
+        migrations.RunPython(build_paths, migrations.RunPython.noop),
+    ]
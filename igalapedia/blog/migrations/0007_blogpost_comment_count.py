@@ -0,0 +1,36 @@
+# Generated by Django 5.0.3 on 2026-10-18 18:57
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_comments(apps, schema_editor):
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    BlogPostComment = apps.get_model('blog', 'BlogPostComment')
+    comments = (
+        BlogPostComment.objects.filter(post=OuterRef('pk'))
+        .values('post').annotate(n=Count('id')).values('n')
+    )
+    BlogPost.objects.update(comment_count=Coalesce(Subquery(comments), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_blogpostcomment_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='comment_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_comments, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
-from django.utils.text import slugify
 from django.utils import timezone
 from ckeditor.fields import RichTextField
 
+from core.richtext import render_rich_text, make_excerpt
+from core.slugs import save_with_unique_slug
+
 
 class BlogPost(models.Model):
     STATUS_CHOICES = [
@@ -19,28 +21,59 @@ class BlogPost(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(unique=True, max_length=220, blank=True)
     body = RichTextField()
+    # Derived from body on save (core.richtext); read paths use these, not body.
+    body_html = models.TextField(blank=True, editable=False)
+    excerpt = models.CharField(max_length=300, blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False, help_text="Minutes")
     cover_image = models.ImageField(upload_to='blog_covers/', blank=True, null=True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='draft')
     published_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_hidden = models.BooleanField(default=False)
+    # Unique visitors per day, summed; maintained by main.view_tracking.
+    view_count = models.PositiveIntegerField(default=0, editable=False)
+    # Maintained by blog.signals as likes are added and removed.
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+    # Maintained by blog.signals; comment_version changes whenever any comment
+    # changes and keys the cached comment fragments.
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    comment_version = models.PositiveIntegerField(default=0, editable=False)
+
+    RENDERED_FIELDS = ('body_html', 'excerpt', 'word_count', 'reading_time')
+    # Moved with F() elsewhere; a full save must not write back a stale copy.
+    COUNTER_FIELDS = ('view_count', 'like_count', 'comment_count', 'comment_version')
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'is_hidden', '-published_at'], name='blogpost_public_idx'),
+        ]
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base = slugify(self.title)
-            slug = base
-            i = 1
-            while BlogPost.objects.filter(slug=slug).exists():
-                slug = f"{base}-{i}"
-                i += 1
-            self.slug = slug
         if self.status == 'published' and self.published_at is None:
             self.published_at = timezone.now()
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding:
+            skip = {*self.COUNTER_FIELDS, *self.get_deferred_fields()}
+            update_fields = kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skip
+            ]
+        if update_fields is None or 'body' in update_fields:
+            self.render_body()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *self.RENDERED_FIELDS}
+        save_with_unique_slug(self, self.title, super().save, *args, fallback='post', **kwargs)
+
+    def render_body(self):
+        """Refresh the sanitized HTML, excerpt and reading statistics from body."""
+        rendered = render_rich_text(self.body)
+        self.body_html = rendered.html
+        self.excerpt = make_excerpt(rendered.text)
+        self.word_count = rendered.word_count
+        self.reading_time = rendered.reading_time
 
     def __str__(self):
         return self.title
@@ -69,6 +102,16 @@ class BlogPostLike(models.Model):
 
 
 class BlogPostComment(models.Model):
+    """
+    A comment or reply. Threads are stored as a materialized path: each
+    comment's path is its parent's path plus its own zero-padded id, so
+    ordering a post's comments by path lists every thread depth-first, and
+    root points at the top-level comment of the thread.
+    """
+    PATH_STEP = 10
+    # 21 segments fit in path; deeper replies are attached to the parent's parent.
+    MAX_DEPTH = 20
+
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -86,15 +129,76 @@ class BlogPostComment(models.Model):
         blank=True,
         related_name='replies'
     )
+    root = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='thread_comments'
+    )
+    path = models.CharField(max_length=255, blank=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
     body = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['post', 'path'], name='blogcomment_post_path_idx'),
+        ]
 
     def __str__(self):
         return f"Comment by {self.user.username} on {self.post.title}"
 
+    def save(self, *args, **kwargs):
+        creating = self._state.adding
+        if creating and self.parent_id and self.parent.depth >= self.MAX_DEPTH:
+            self.parent = self.parent.parent
+        # The path needs our id, so it is written right after the insert; both
+        # writes share a transaction so no comment is ever left without a path.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if creating and not self.path:
+                parent = self.parent if self.parent_id else None
+                self.path = (parent.path if parent else '') + f'{self.pk:0{self.PATH_STEP}d}'
+                self.depth = parent.depth + 1 if parent else 0
+                self.root_id = parent.root_id if parent else self.pk
+                BlogPostComment.objects.filter(pk=self.pk).update(path=self.path, depth=self.depth, root_id=self.root_id)
+
+    @property
+    def indent(self):
+        """Depth used for display; very deep replies stop stepping right."""
+        return min(self.depth, 6)
+
+    @classmethod
+    def thread_page(cls, post, cursor=None, limit=10):
+        """
+        Return (comments, next_cursor) for the next `limit` threads of a post,
+        oldest first. comments holds every comment of those threads, at any
+        depth, in display order, and is read with one query. next_cursor is an
+        opaque token for the following page, or None at the end.
+        """
+        from main.utils import encode_cursor, decode_cursor
+
+        roots = cls.objects.filter(post=post, parent=None)
+        after = decode_cursor(cursor)
+        if isinstance(after, int):
+            roots = roots.filter(pk__gt=after)
+        roots = roots.order_by('pk').values('pk')
+        # The first comment of the thread after this page tells us whether there is a next page.
+        comments = list(
+            cls.objects.filter(models.Q(root__in=roots[:limit]) | models.Q(pk__in=roots[limit:limit + 1]))
+            .select_related('user')
+            .order_by('path')
+        )
+        thread_roots = [comment for comment in comments if comment.depth == 0]
+        next_cursor = None
+        if len(thread_roots) > limit:
+            comments.pop()
+            next_cursor = encode_cursor(thread_roots[limit - 1].pk)
+        return comments, next_cursor
+
 
 class BlogGuidelinesAck(models.Model):
     user = models.OneToOneField(
@@ -0,0 +1,54 @@
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from main.page_cache import purge_tags
+from .models import BlogPost, BlogPostComment, BlogPostLike
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+def blog_post_purge_pages(sender, instance, raw=False, **kwargs):
+    """Publishing, hiding, editing or deleting a post changes its page, the list and the feed."""
+    if not raw:
+        purge_tags(f'blog:{instance.id}', 'blog-list', 'feed')
+
+
+@receiver(post_save, sender=BlogPostComment)
+@receiver(post_delete, sender=BlogPostComment)
+@receiver(post_save, sender=BlogPostLike)
+@receiver(post_delete, sender=BlogPostLike)
+def blog_activity_purge_pages(sender, instance, raw=False, **kwargs):
+    """Comment and like counts appear on the post page and in the list."""
+    if not raw:
+        purge_tags(f'blog:{instance.post_id}', 'blog-list')
+
+
+@receiver(post_save, sender=BlogPostLike)
+def blog_like_added(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        BlogPost.objects.filter(pk=instance.post_id).update(like_count=F('like_count') + 1)
+
+
+@receiver(post_delete, sender=BlogPostLike)
+def blog_like_removed(sender, instance, **kwargs):
+    BlogPost.objects.filter(pk=instance.post_id, like_count__gt=0).update(like_count=F('like_count') - 1)
+
+
+@receiver(post_save, sender=BlogPostComment)
+def blog_comment_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    changes = {'comment_version': F('comment_version') + 1}
+    if created:
+        changes['comment_count'] = F('comment_count') + 1
+    BlogPost.objects.filter(pk=instance.post_id).update(**changes)
+
+
+@receiver(post_delete, sender=BlogPostComment)
+def blog_comment_deleted(sender, instance, **kwargs):
+    BlogPost.objects.filter(pk=instance.post_id).update(
+        comment_count=Greatest(F('comment_count') - 1, Value(0)),
+        comment_version=F('comment_version') + 1,
+    )
@@ -1,3 +1,133 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
+from django.db import DatabaseError
+from django.db.models import QuerySet
 from django.test import TestCase
+from django.urls import reverse
+
+from .models import BlogPost, BlogPostComment
+
+
+class LikeCountTests(TestCase):
+    """like_count follows the like toggle and survives full saves of the post."""
+
+    def setUp(self):
+        User = get_user_model()
+        self.author = User.objects.create_user('author', password='pass12345')
+        self.reader = User.objects.create_user('reader', password='pass12345')
+        self.post = BlogPost.objects.create(author=self.author, title='Ocho', body='<p>Hello</p>', status='published')
+        self.url = reverse('blog:blog_like_toggle', kwargs={'slug': self.post.slug})
+        self.client.force_login(self.reader)
+
+    def test_toggle_returns_maintained_count(self):
+        self.assertEqual(self.client.post(self.url).json(), {'liked': True, 'count': 1})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 1)
+        self.assertEqual(self.client.post(self.url).json(), {'liked': False, 'count': 0})
+
+    def test_full_save_keeps_counters(self):
+        stale = BlogPost.objects.get(pk=self.post.pk)
+        self.client.post(self.url)
+        stale.title = 'Ocho Igala'
+        stale.save()
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.title, self.post.like_count), ('Ocho Igala', 1))
+
+
+class ThreadedCommentTests(TestCase):
+    """A page of threads comes back depth-first, at any depth, from one query."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('reader', password='pass12345')
+        self.post = BlogPost.objects.create(author=self.user, title='Ocho', body='<p>Hello</p>', status='published')
+
+    def comment(self, parent=None):
+        return BlogPostComment.objects.create(user=self.user, post=self.post, parent=parent, body='...')
+
+    def test_threads_load_depth_first_in_one_query(self):
+        first = self.comment()
+        second = self.comment()
+        reply = self.comment(first)
+        deep = self.comment(self.comment(reply))
+        late_reply = self.comment(first)
+        with self.assertNumQueries(1):
+            comments, next_cursor = BlogPostComment.thread_page(self.post, limit=1)
+        self.assertEqual([c.pk for c in comments], [first.pk, reply.pk, deep.parent_id, deep.pk, late_reply.pk])
+        self.assertEqual(deep.depth, 3)
+
+        comments, next_cursor = BlogPostComment.thread_page(self.post, cursor=next_cursor, limit=1)
+        self.assertEqual([c.pk for c in comments], [second.pk])
+        self.assertIsNone(next_cursor)
+
+    def test_replies_stop_nesting_at_max_depth(self):
+        comment = self.comment()
+        for _ in range(BlogPostComment.MAX_DEPTH + 2):
+            comment = self.comment(comment)
+        self.assertEqual(comment.depth, BlogPostComment.MAX_DEPTH)
+        self.assertLessEqual(len(comment.path), 255)
+
+    def test_comment_is_not_left_without_a_path(self):
+        real_update = QuerySet.update
+
+        def update(queryset, **kwargs):
+            if queryset.model is BlogPostComment:
+                raise DatabaseError('connection lost')
+            return real_update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', autospec=True, side_effect=update):
+            with self.assertRaises(DatabaseError):
+                self.comment()
+        self.assertFalse(BlogPostComment.objects.exists())
+        self.post.refresh_from_db(fields=['comment_count'])
+        self.assertEqual(self.post.comment_count, 0)
+
+
+class SlugTests(TestCase):
+
+    def test_repeated_titles_cost_one_lookup(self):
+        author = get_user_model().objects.create_user('author', password='pass12345')
+        for _ in range(3):
+            BlogPost.objects.create(author=author, title='Ocho', body='<p>Hello</p>')
+        post = BlogPost(author=author, title='Ocho', body='<p>Hello</p>')
+        # slug lookup, savepoint, insert, feed sync (drafts are not in the feed), release
+        with self.assertNumQueries(5):
+            post.save()
+        self.assertEqual(post.slug, 'ocho-3')
+
+
+class DetailQueryTests(TestCase):
+    """A repeat view reads the post (with the reader's like) and nothing else."""
+
+    def setUp(self):
+        User = get_user_model()
+        self.author = User.objects.create_user('author', password='pass12345')
+        self.reader = User.objects.create_user('reader', password='pass12345')
+        self.post = BlogPost.objects.create(author=self.author, title='Ocho', body='<p>Hello</p>', status='published')
+        BlogPostComment.objects.create(user=self.reader, post=self.post, body='First!')
+        self.url = reverse('blog:blog_detail', kwargs={'slug': self.post.slug})
+        self.client.force_login(self.reader)
+        caches['fragments'].clear()
+
+    def test_repeat_view_is_served_from_fragments(self):
+        self.client.get(self.url)
+        # Session, user, then the post with its liked flag.
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertContains(response, 'First!')
+        self.assertContains(response, 'Hello')
+
+    def test_fragments_use_their_own_cache(self):
+        self.client.get(self.url)
+        key = make_template_fragment_key('blog_body', [self.post.pk, self.post.updated_at.isoformat()])
+        self.assertIsNotNone(caches['fragments'].get(key))
+        self.assertIsNone(caches['default'].get(key))
 
-# Create your tests here.
+    def test_new_comment_invalidates_thread_fragment(self):
+        self.client.get(self.url)
+        BlogPostComment.objects.create(user=self.reader, post=self.post, body='Second!')
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Second!')
+        self.assertContains(response, 'Comments (2)')
@@ -12,5 +12,6 @@ urlpatterns = [
     path('<slug:slug>/delete/', views.blog_delete, name='blog_delete'),
     path('<slug:slug>/like/', views.blog_like_toggle, name='blog_like_toggle'),
     path('<slug:slug>/comment/', views.blog_comment_add, name='blog_comment_add'),
+    path('<slug:slug>/comments/', views.blog_comments, name='blog_comments'),
     path('<slug:slug>/report/', views.blog_report, name='blog_report'),
 ]
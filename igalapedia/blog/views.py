@@ -1,47 +1,96 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
 from django.http import JsonResponse, Http404
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Count
-from django.utils import timezone
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils.functional import SimpleLazyObject
 
-from main.utils import get_client_ip_hash
-from .models import BlogPost, BlogPostLike, BlogPostComment, BlogGuidelinesAck, BlogPostReport, BlogPostView
+from main.page_cache import tag_page
+from main.view_tracking import record_view
+from .models import BlogPost, BlogPostLike, BlogPostComment, BlogGuidelinesAck, BlogPostReport
 from .forms import BlogPostForm, BlogCommentForm
 
 
+COMMENT_THREADS_PER_PAGE = 10
+
+
 def blog_list(request):
-    qs = BlogPost.objects.filter(status='published', is_hidden=False).order_by('-published_at').annotate(view_count=Count('view_records'))
+    qs = (
+        BlogPost.objects.filter(status='published', is_hidden=False)
+        .defer('body', 'body_html')
+        .order_by('-published_at')
+    )
     paginator = Paginator(qs, 12)
     page = request.GET.get('page', 1)
     posts = paginator.get_page(page)
+    tag_page(request, 'blog-list')
     return render(request, 'blog/blog_list.html', {'posts': posts})
 
 
+def record_post_view(request, post_id):
+    """Count a unique visitor per day (buffered); also run for page-cache hits."""
+    record_view('blog', post_id, request)
+
+
+def comment_page(post, cursor=None):
+    """
+    A page of comment threads, loaded only if the template actually reads it,
+    i.e. when its cached fragment (keyed on post.comment_version) has expired.
+    """
+    def load():
+        comments, next_cursor = BlogPostComment.thread_page(post, cursor=cursor, limit=COMMENT_THREADS_PER_PAGE)
+        return {'comments': comments, 'next_cursor': next_cursor}
+    return SimpleLazyObject(load)
+
+
 def blog_detail(request, slug):
-    post = get_object_or_404(BlogPost.objects.annotate(view_count=Count('view_records')), slug=slug)
+    # Body and comments render from fragment caches, so their columns are only read on a miss.
+    posts = BlogPost.objects.select_related('author').defer('body', 'body_html')
+    if request.user.is_authenticated:
+        posts = posts.annotate(
+            liked=Exists(BlogPostLike.objects.filter(post=OuterRef('pk'), user=request.user))
+        )
+    post = get_object_or_404(posts, slug=slug)
     if post.is_hidden:
         raise Http404
-    if post.status == 'draft' and (not request.user.is_authenticated or request.user != post.author):
+    if post.status == 'draft' and (not request.user.is_authenticated or request.user.pk != post.author_id):
         raise Http404
-    ip_hash = get_client_ip_hash(request)
-    if ip_hash:
-        today = timezone.localdate()
-        BlogPostView.objects.get_or_create(post=post, ip_hash=ip_hash, viewed_date=today)
-    liked = False
-    if request.user.is_authenticated:
-        liked = BlogPostLike.objects.filter(user=request.user, post=post).exists()
-    comments = post.comments.filter(parent=None).select_related('user').prefetch_related('replies__user')
+    record_post_view(request, post.id)
+    if post.status == 'published':
+        tag_page(request, f'blog:{post.id}', on_hit=('blog.views.record_post_view', (post.id,)))
     return render(request, 'blog/blog_detail.html', {
         'post': post,
-        'liked': liked,
-        'comments': comments,
+        'liked': getattr(post, 'liked', False),
+        'comment_page': comment_page(post),
+        'cursor': '',
         'comment_form': BlogCommentForm(),
     })
 
 
+def blog_comments(request, slug):
+    """JSON API for loading further comment threads, paged by the opaque ?cursor= token."""
+    post = get_object_or_404(
+        BlogPost.objects.only('id', 'slug', 'status', 'is_hidden', 'author_id', 'comment_version'), slug=slug
+    )
+    if post.is_hidden:
+        raise Http404
+    if post.status == 'draft' and (not request.user.is_authenticated or request.user.pk != post.author_id):
+        raise Http404
+    if post.status == 'published':
+        tag_page(request, f'blog:{post.id}')
+    cursor = request.GET.get('cursor') or ''
+    html = render_to_string(
+        'blog/comment_threads.html',
+        {'post': post, 'comment_page': comment_page(post, cursor), 'cursor': cursor},
+        request=request,
+    )
+    return JsonResponse({'html': html})
+
+
 @login_required
 def blog_guidelines(request):
     if request.method == 'POST':
@@ -98,14 +147,18 @@ def blog_delete(request, slug):
 @login_required
 @require_POST
 def blog_like_toggle(request, slug):
-    post = get_object_or_404(BlogPost, slug=slug)
-    like, created = BlogPostLike.objects.get_or_create(user=request.user, post=post)
-    if not created:
-        like.delete()
-        liked = False
-    else:
-        liked = True
-    count = post.likes.count()
+    post = get_object_or_404(BlogPost.objects.only('id'), slug=slug)
+    # like_count moves in the same transaction, via the BlogPostLike signals.
+    with transaction.atomic():
+        unliked, _ = BlogPostLike.objects.filter(user=request.user, post=post).delete()
+        liked = not unliked
+        if liked:
+            try:
+                with transaction.atomic():
+                    BlogPostLike.objects.create(user=request.user, post=post)
+            except IntegrityError:
+                pass  # a concurrent request from this user already liked it
+        count = BlogPost.objects.filter(pk=post.pk).values_list('like_count', flat=True).get()
     return JsonResponse({'liked': liked, 'count': count})
 
 
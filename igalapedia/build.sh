@@ -3,3 +3,7 @@ set -o errexit
 pip install -r requirements.txt
 python manage.py collectstatic --noinput
 python manage.py migrate
+python manage.py backfill_lookup_keys
+python manage.py rebuild_feed --if-empty
+python manage.py rebuild_search_index --if-empty
+python manage.py refresh_leaderboard
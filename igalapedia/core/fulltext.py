@@ -0,0 +1,32 @@
+"""
+Turning a typed search term into a full-text query, shared by the dictionary
+reverse lookup and the site search.
+
+Every token must match, and the last one matches as a prefix so results
+appear while the user is still typing.
+"""
+import re
+
+
+MAX_TOKENS = 10
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def query_tokens(term):
+    """Lower-cased word tokens of a search term (at most MAX_TOKENS)."""
+    return _TOKEN_RE.findall((term or '').lower())[:MAX_TOKENS]
+
+
+def fts5_query(tokens):
+    """SQLite FTS5 MATCH expression for the tokens."""
+    parts = [f'"{t}"' for t in tokens]
+    parts[-1] += '*'
+    return ' '.join(parts)
+
+
+def tsquery(tokens):
+    """PostgreSQL to_tsquery() text for the tokens."""
+    parts = list(tokens)
+    parts[-1] += ':*'
+    return ' & '.join(parts)
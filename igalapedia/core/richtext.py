@@ -0,0 +1,246 @@
+"""
+Save-time processing for CKEditor rich text.
+
+render_rich_text() turns stored editor HTML into everything the read paths
+need, in one parse:
+- a sanitized HTML rendition (allowlisted tags, attributes, inline styles
+  and URL schemes; scripts removed, and embeds removed unless they are
+  YouTube/Vimeo players),
+- images marked loading="lazy" and given width/height from their inline
+  style, so pages do not reflow as images arrive,
+- the plain text, its word count and a reading-time estimate.
+Models store the result in columns so templates never parse HTML per request.
+"""
+import math
+import re
+from collections import namedtuple
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+
+WORDS_PER_MINUTE = 200
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'caption', 'cite', 'code', 'div', 'em',
+    'figcaption', 'figure', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img',
+    'li', 'ol', 'p', 'pre', 's', 'small', 'span', 'strike', 'strong', 'sub', 'sup',
+    'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'u', 'ul',
+}
+VOID_TAGS = {'br', 'hr', 'img'}
+# Dropped together with everything inside them (an allowed iframe is kept, its content is not).
+SKIP_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'noscript', 'template', 'svg', 'math'}
+
+# Video players authors may embed from the editor's Source view: host -> path prefix.
+ALLOWED_EMBEDS = {
+    'www.youtube.com': '/embed/',
+    'youtube.com': '/embed/',
+    'www.youtube-nocookie.com': '/embed/',
+    'player.vimeo.com': '/video/',
+}
+# Tags that separate words in the plain-text rendition.
+BLOCK_TAGS = {
+    'blockquote', 'br', 'caption', 'div', 'figcaption', 'figure', 'h1', 'h2', 'h3',
+    'h4', 'h5', 'h6', 'hr', 'li', 'p', 'pre', 'td', 'th', 'tr',
+}
+
+ALLOWED_ATTRIBUTES = {
+    '*': {'class', 'style', 'title', 'dir', 'lang'},
+    'a': {'href', 'target', 'rel', 'name'},
+    'img': {'src', 'alt', 'width', 'height'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan', 'scope'},
+    'ol': {'start', 'type'},
+}
+URL_ATTRIBUTES = {'href', 'src'}
+ALLOWED_SCHEMES = {'http', 'https', 'mailto', 'tel'}
+
+ALLOWED_STYLES = {
+    'background-color', 'border', 'border-collapse', 'color', 'float', 'font-size',
+    'font-style', 'font-weight', 'height', 'margin', 'margin-bottom', 'margin-left',
+    'margin-right', 'margin-top', 'padding', 'text-align', 'text-decoration',
+    'vertical-align', 'width',
+}
+_STYLE_VALUE_RE = re.compile(r'^[#\w\s.,%()+-]*$')
+_PIXELS_RE = re.compile(r'^\s*(\d{1,5})(?:\.\d+)?\s*(?:px)?\s*$')
+_SCHEME_RE = re.compile(r'^([a-z][a-z0-9+.-]*):', re.IGNORECASE)
+_CONTROL_RE = re.compile(r'[\x00-\x20\x7f]+')
+_SPACE_RE = re.compile(r'\s+')
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+RichText = namedtuple('RichText', ['html', 'text', 'word_count', 'reading_time'])
+
+
+def _safe_url(value):
+    compact = _CONTROL_RE.sub('', value or '')
+    match = _SCHEME_RE.match(compact)
+    if match and match.group(1).lower() not in ALLOWED_SCHEMES:
+        return None
+    return value.strip()
+
+
+def _embed_src(value):
+    """The https URL of an allowlisted video player, or None."""
+    url = _CONTROL_RE.sub('', value or '')
+    if url.startswith('//'):
+        url = 'https:' + url
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    prefix = ALLOWED_EMBEDS.get((parts.hostname or '').lower())
+    if parts.scheme.lower() != 'https' or prefix is None or not parts.path.startswith(prefix):
+        return None
+    return parts.geturl()
+
+
+def _clean_style(value):
+    """Keep allowlisted `property: value` pairs; return (style, {property: value})."""
+    kept = {}
+    for declaration in (value or '').split(';'):
+        name, _, val = declaration.partition(':')
+        name, val = name.strip().lower(), val.strip()
+        if name not in ALLOWED_STYLES or not val:
+            continue
+        lowered = val.lower()
+        if not _STYLE_VALUE_RE.match(val) or 'url' in lowered or 'expression' in lowered:
+            continue
+        kept[name] = val
+    return '; '.join(f'{name}: {val}' for name, val in kept.items()), kept
+
+
+class _RichTextParser(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.html = []
+        self.text = []
+        self.open_tags = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_CONTENT_TAGS:
+            if tag == 'iframe' and not self.skip_depth:
+                self._embed(attrs)
+            self.skip_depth += 1
+            return
+        if self.skip_depth:
+            return
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+        if tag not in ALLOWED_TAGS:
+            return
+
+        allowed = ALLOWED_ATTRIBUTES['*'] | ALLOWED_ATTRIBUTES.get(tag, set())
+        cleaned = {}
+        styles = {}
+        for name, value in attrs:
+            name = name.lower()
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES:
+                value = _safe_url(value)
+                if value is None:
+                    continue
+            elif name == 'style':
+                value, styles = _clean_style(value)
+                if not value:
+                    continue
+            cleaned[name] = value
+
+        if tag == 'a' and cleaned.get('target') == '_blank':
+            cleaned['rel'] = 'noopener noreferrer'
+        if tag == 'img':
+            if 'src' not in cleaned:
+                return
+            for dimension in ('width', 'height'):
+                match = _PIXELS_RE.match(cleaned.get(dimension) or styles.get(dimension, ''))
+                if match:
+                    cleaned[dimension] = match.group(1)
+                else:
+                    cleaned.pop(dimension, None)
+            cleaned['loading'] = 'lazy'
+            cleaned['decoding'] = 'async'
+
+        rendered = ''.join(f' {name}="{escape(value, quote=True)}"' for name, value in cleaned.items())
+        self.html.append(f'<{tag}{rendered}>')
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def _embed(self, attrs):
+        attrs = {name.lower(): value for name, value in attrs if value is not None}
+        src = _embed_src(attrs.get('src'))
+        if src is None:
+            return
+        rendered = f' src="{escape(src, quote=True)}"'
+        for dimension in ('width', 'height'):
+            match = _PIXELS_RE.match(attrs.get(dimension, ''))
+            if match:
+                rendered += f' {dimension}="{match.group(1)}"'
+        if attrs.get('title'):
+            rendered += f' title="{escape(attrs["title"], quote=True)}"'
+        rendered += (
+            ' loading="lazy" allowfullscreen referrerpolicy="strict-origin-when-cross-origin"'
+            ' sandbox="allow-scripts allow-same-origin allow-presentation allow-popups"'
+        )
+        self.html.append(f'<iframe{rendered}></iframe>')
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in SKIP_CONTENT_TAGS:
+            if tag == 'iframe' and not self.skip_depth:
+                self._embed(attrs)
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.open_tags and self.open_tags[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_CONTENT_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+            return
+        if self.skip_depth:
+            return
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+        if tag not in self.open_tags:
+            return
+        # Close anything left open inside this element so the output stays balanced.
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.html.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        self.html.append(escape(data, quote=False))
+        self.text.append(data)
+
+    def close(self):
+        super().close()
+        while self.open_tags:
+            self.html.append(f'</{self.open_tags.pop()}>')
+
+
+def render_rich_text(value):
+    """Sanitize editor HTML and measure it; returns a RichText(html, text, word_count, reading_time)."""
+    parser = _RichTextParser()
+    parser.feed(value or '')
+    parser.close()
+    text = _SPACE_RE.sub(' ', ''.join(parser.text)).strip()
+    word_count = len(_WORD_RE.findall(text))
+    reading_time = math.ceil(word_count / WORDS_PER_MINUTE) if word_count else 0
+    return RichText(''.join(parser.html), text, word_count, reading_time)
+
+
+def make_excerpt(text, length=300):
+    """Cut plain text to at most `length` characters at a word boundary."""
+    text = _SPACE_RE.sub(' ', text or '').strip()
+    if len(text) <= length:
+        return text
+    cut = text[:length - 3]
+    if ' ' in cut:
+        cut = cut.rsplit(' ', 1)[0]
+    return cut.rstrip(' ,;:.') + '...'
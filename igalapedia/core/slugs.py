@@ -0,0 +1,60 @@
+"""
+Unique slugs for models with a unique SlugField (blog posts, history articles, words).
+
+next_free_slug() reads every existing `base` / `base-N` slug in one query and
+returns the first free one (base, base-1, base-2, ...). save_with_unique_slug()
+wraps a model's save: it allocates a slug when the instance has none, and if a
+concurrent save claims the same slug first (a unique violation on the slug),
+it allocates again and retries. Other integrity errors are re-raised.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+
+# Room kept for "-N" when a base slug has to be shortened to fit.
+SUFFIX_ROOM = 8
+SAVE_ATTEMPTS = 5
+
+
+def next_free_slug(model, text, field='slug', fallback='item', exclude_pk=None):
+    """First unused slug for `text` among `model` rows, found with a single query."""
+    max_length = model._meta.get_field(field).max_length
+    base = (slugify(text) or fallback)[:max_length].strip('-') or fallback
+    stem = base[:max_length - SUFFIX_ROOM].rstrip('-')
+
+    rows = model._default_manager.filter(Q(**{field: base}) | Q(**{f'{field}__startswith': f'{stem}-'}))
+    if exclude_pk is not None:
+        rows = rows.exclude(pk=exclude_pk)
+    taken = set(rows.order_by().values_list(field, flat=True))
+
+    if base not in taken:
+        return base
+    suffix = 1
+    while f'{stem}-{suffix}' in taken:
+        suffix += 1
+    return f'{stem}-{suffix}'
+
+
+def save_with_unique_slug(instance, text, save, *args, field='slug', fallback='item', **kwargs):
+    """
+    Call save(*args, **kwargs) (the model's super().save), first giving the
+    instance a free slug derived from `text` when its slug is empty.
+    """
+    if getattr(instance, field):
+        return save(*args, **kwargs)
+
+    model = type(instance)
+    if kwargs.get('update_fields') is not None:
+        kwargs['update_fields'] = {*kwargs['update_fields'], field}
+    for attempt in range(SAVE_ATTEMPTS):
+        slug = next_free_slug(model, text, field=field, fallback=fallback, exclude_pk=instance.pk)
+        setattr(instance, field, slug)
+        try:
+            with transaction.atomic():
+                return save(*args, **kwargs)
+        except IntegrityError:
+            taken = model._default_manager.filter(**{field: slug}).exclude(pk=instance.pk).exists()
+            if not taken or attempt == SAVE_ATTEMPTS - 1:
+                setattr(instance, field, '')
+                raise
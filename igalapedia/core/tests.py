@@ -0,0 +1,65 @@
+from django.test import SimpleTestCase
+
+from .richtext import render_rich_text
+
+
+def clean(html):
+    return render_rich_text(html).html
+
+
+class SanitizerTests(SimpleTestCase):
+    """render_rich_text() output is rendered with |safe, so nothing executable may survive."""
+
+    def test_scripts_and_their_content_are_removed(self):
+        self.assertEqual(clean('<p>a<script>alert(1)</script>b</p>'), '<p>ab</p>')
+        self.assertEqual(clean('<p>a<SCRIPT src="x.js"></SCRIPT><style>p{}</style></p>'), '<p>a</p>')
+        self.assertEqual(clean('<svg><script>alert(1)</script></svg><p>ok</p>'), '<p>ok</p>')
+
+    def test_event_handlers_are_dropped(self):
+        self.assertEqual(clean('<p onclick="alert(1)" ONMOUSEOVER="x" class="lead">a</p>'), '<p class="lead">a</p>')
+        self.assertEqual(clean('<img src="/a.png" onerror="alert(1)">'), '<img src="/a.png" loading="lazy" decoding="async">')
+
+    def test_dangerous_url_schemes_are_dropped(self):
+        for href in (
+            'javascript:alert(1)',
+            'JaVaScRiPt:alert(1)',
+            ' java\tscript:alert(1)',
+            'jav&#x61;script:alert(1)',
+            '&#106;avascript:alert(1)',
+            'vbscript:msgbox(1)',
+            'data:text/html;base64,PHNjcmlwdD4=',
+        ):
+            self.assertEqual(clean(f'<a href="{href}">x</a>'), '<a>x</a>', href)
+        self.assertEqual(clean('<img src="data:image/svg+xml,<svg onload=alert(1)>">'), '')
+        self.assertEqual(clean('<a href="https://igala.ng/x?a=1&b=2">x</a>'), '<a href="https://igala.ng/x?a=1&amp;b=2">x</a>')
+
+    def test_styles_cannot_load_urls_or_expressions(self):
+        self.assertEqual(
+            clean('<p style="color: red; background-image: url(javascript:x); width: expression(alert(1))">a</p>'),
+            '<p style="color: red">a</p>',
+        )
+
+    def test_unclosed_and_misnested_tags_are_balanced(self):
+        self.assertEqual(clean('<p><b>bold<i>both</p>after'), '<p><b>bold<i>both</i></b></p>after')
+        self.assertEqual(clean('<ul><li>one<li>two</ul>'), '<ul><li>one<li>two</li></li></ul>')
+        self.assertEqual(clean('</div><p>x</em></p>'), '<p>x</p>')
+        self.assertEqual(clean('<p>a <b>b'), '<p>a <b>b</b></p>')
+
+    def test_text_is_escaped(self):
+        self.assertEqual(clean('<p>&lt;script&gt;alert(1)&lt;/script&gt;</p>'), '<p>&lt;script&gt;alert(1)&lt;/script&gt;</p>')
+        self.assertEqual(clean('<p title="&quot;><script>">x</p>'), '<p title="&quot;&gt;&lt;script&gt;">x</p>')
+
+    def test_only_allowlisted_video_embeds_are_kept(self):
+        html = clean('<iframe src="https://www.youtube.com/embed/abc" width="560" height="315" onload="x">fallback</iframe>')
+        self.assertTrue(html.startswith('<iframe src="https://www.youtube.com/embed/abc" width="560" height="315"'))
+        self.assertNotIn('onload', html)
+        self.assertNotIn('fallback', html)
+        self.assertIn('<iframe src="https://player.vimeo.com/video/1"', clean('<iframe src="//player.vimeo.com/video/1"/>'))
+        for src in (
+            'http://www.youtube.com/embed/abc',
+            'https://evil.example/embed/abc',
+            'https://www.youtube.com.evil.example/embed/abc',
+            'https://www.youtube.com/watch?v=abc',
+            'javascript:alert(1)',
+        ):
+            self.assertEqual(clean(f'<p>a</p><iframe src="{src}"><p>b</p></iframe>'), '<p>a</p>', src)
@@ -1,12 +1,14 @@
 from django.contrib import admin
 from django.contrib import messages
+from django.db import transaction
 from django.utils.html import format_html
 from django.urls import reverse, path
 from django.shortcuts import redirect, render
 from django.utils import timezone
 from .models import (
     PartOfSpeech, Example, Meaning, Words,
-    PendingWord, PendingMeaning, PendingExample, PendingExampleContribution, ContributionStats
+    PendingWord, PendingMeaning, PendingExample, PendingExampleContribution, ContributionStats,
+    LeaderboardEntry,
 )
 
 
@@ -143,11 +145,6 @@ class PendingWordAdmin(admin.ModelAdmin):
             for pending_word in pending_words:
                 pending_word.reject(request.user, notes=review_notes or 'No reason provided.')
 
-                stats, created = ContributionStats.objects.get_or_create(
-                    user=pending_word.submitted_by
-                )
-                stats.update_stats()
-
                 try:
                     from dictionary.emails import send_word_rejected_email
                     send_word_rejected_email(
@@ -229,7 +226,7 @@ class PendingWordAdmin(admin.ModelAdmin):
         duplicate_count = 0
         
         for pending_word in queryset.filter(status='PENDING'):
-            word = pending_word.approve(request.user)
+            word = pending_word.approve(request.user, refresh_leaderboard=False)
             if word:
                 # Create meanings and examples
                 for pending_meaning in pending_word.pending_meanings.all():
@@ -248,12 +245,6 @@ class PendingWordAdmin(admin.ModelAdmin):
                         )
                         meaning.examples.add(example)
                 
-                # Update contributor stats
-                stats, created = ContributionStats.objects.get_or_create(
-                    user=pending_word.submitted_by
-                )
-                stats.update_stats()
-                
                 # Send approval email to the contributor
                 try:
                     from dictionary.emails import send_word_approved_email
@@ -269,11 +260,6 @@ class PendingWordAdmin(admin.ModelAdmin):
                 pending_word.refresh_from_db()
                 if pending_word.status == 'REJECTED' and 'Duplicate' in (pending_word.review_notes or ''):
                     duplicate_count += 1
-                    # Update contributor stats
-                    stats, created = ContributionStats.objects.get_or_create(
-                        user=pending_word.submitted_by
-                    )
-                    stats.update_stats()
                     # Send rejection email for duplicate
                     try:
                         from dictionary.emails import send_word_rejected_email
@@ -283,6 +269,10 @@ class PendingWordAdmin(admin.ModelAdmin):
                     except Exception:
                         pass
         
+        if approved_count:
+            # One rebuild for the whole batch rather than one per approved word.
+            transaction.on_commit(LeaderboardEntry.refresh)
+
         # Build result message
         msg_parts = []
         if approved_count:
@@ -324,6 +314,8 @@ class ContributionStatsAdmin(admin.ModelAdmin):
         'pending_words_count',
         'rejected_words_count',
         'total_submissions',
+        'approved_examples_count',
+        'approved_histories_count',
         'first_contribution',
         'last_contribution'
     ]
@@ -335,6 +327,8 @@ class ContributionStatsAdmin(admin.ModelAdmin):
         'pending_words_count',
         'rejected_words_count',
         'total_submissions',
+        'approved_examples_count',
+        'approved_histories_count',
         'first_contribution',
         'last_contribution'
     ]
@@ -342,9 +336,8 @@ class ContributionStatsAdmin(admin.ModelAdmin):
     
     def recalculate_stats(self, request, queryset):
         """Recalculate statistics for selected users"""
-        for stats in queryset:
-            stats.update_stats()
-        self.message_user(request, f'Statistics updated for {queryset.count()} user(s).')
+        updated = ContributionStats.rebuild(user_ids=queryset.values_list('user_id', flat=True))
+        self.message_user(request, f'Statistics updated for {updated} user(s).')
     recalculate_stats.short_description = '🔄 Recalculate statistics'
 
 
@@ -1,11 +1,19 @@
 import django_filters
 from .models import Words
+from .utils import normalize_word
 
 class WordsFilters(django_filters.FilterSet):
-    word = django_filters.CharFilter(field_name='word', lookup_expr='istartswith')
+    word = django_filters.CharFilter(method='filter_word_prefix')
 
 
 
     class Meta:
         model = Words
-        fields = ['word']
\ No newline at end of file
+        fields = ['word']
+
+    def filter_word_prefix(self, queryset, name, value):
+        """Tone- and case-insensitive prefix match on the indexed lookup key."""
+        key = normalize_word(value)
+        if not key:
+            return queryset
+        return queryset.filter(lookup_key__startswith=key)
\ No newline at end of file
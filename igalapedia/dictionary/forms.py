@@ -1,5 +1,6 @@
 from django import forms
 from .models import PendingWord, PendingMeaning, PendingExample, PendingExampleContribution, PartOfSpeech, Meaning, Words
+from .utils import same_spelling
 
 
 class WordSubmissionForm(forms.ModelForm):
@@ -44,9 +45,10 @@ class WordSubmissionForm(forms.ModelForm):
         if not word:
             raise forms.ValidationError('This field is required.')
         
-        # Check if word already exists in approved dictionary (case-insensitive)
-        existing = Words.objects.filter(word__iexact=word).first()
-        if existing:
+        # Check if word already exists in approved dictionary (case-insensitive).
+        # Tone/diacritic variants are distinct words, so only an exact spelling blocks.
+        existing = Words.lookup(word)
+        if existing and same_spelling(existing.word, word):
             raise forms.ValidationError(
                 f'The word "{word}" already exists in the dictionary. '
                 f'View it at: /dictionary/single-word/{existing.slug}/'
@@ -199,7 +201,9 @@ class ExampleContributionForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         if word:
             # Filter meanings to those belonging to this word
-            self.fields['meaning'].queryset = word.meanings.all()
+            self.fields['meaning'].queryset = (
+                Meaning.objects.filter(word=word).select_related('part_of_speech').order_by('id')
+            )
             # Custom label_from_instance to show PoS + meaning
             self.fields['meaning'].label_from_instance = lambda m: f"({m.part_of_speech.name}) {m.meaning}"
 
@@ -0,0 +1,52 @@
+"""
+Management command to fill Words.lookup_key for existing rows.
+Usage: python manage.py backfill_lookup_keys [--batch-size 1000] [--all]
+"""
+from django.core.management.base import BaseCommand
+
+from dictionary.models import Words
+from dictionary.search_index import bump_words_version
+from dictionary.utils import normalize_word
+
+
+class Command(BaseCommand):
+    help = "Compute the normalized lookup key for dictionary words that are missing one."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of words to update per query.",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute keys for every word, not only empty ones.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        qs = Words.objects.order_by("id").only("id", "word", "lookup_key")
+        if not options["all"]:
+            qs = qs.filter(lookup_key="")
+
+        updated = 0
+        batch = []
+        for word in qs.iterator(chunk_size=batch_size):
+            key = normalize_word(word.word)
+            if key == word.lookup_key:
+                continue
+            word.lookup_key = key
+            batch.append(word)
+            if len(batch) >= batch_size:
+                Words.objects.bulk_update(batch, ["lookup_key"])
+                updated += len(batch)
+                batch = []
+        if batch:
+            Words.objects.bulk_update(batch, ["lookup_key"])
+            updated += len(batch)
+
+        if updated:
+            bump_words_version()
+        self.stdout.write(self.style.SUCCESS(f"Done. Updated lookup key for {updated} word(s)."))
@@ -0,0 +1,56 @@
+"""
+Management command to recompute ContributionStats for every user (or only recently active ones).
+Usage: python manage.py rebuild_contribution_stats [--since 2024-05-01T00:00 | --since 24h] [--batch-size 1000]
+Use --since from cron to refresh only users whose submissions changed recently.
+"""
+import re
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from dictionary.models import ContributionStats
+
+
+DURATION_RE = re.compile(r"^(\d+)([hd])$")
+
+
+def parse_since(value):
+    """An ISO date/datetime, or a look-back such as 6h or 2d."""
+    match = DURATION_RE.match(value.strip().lower())
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        delta = timedelta(hours=amount) if unit == "h" else timedelta(days=amount)
+        return timezone.now() - delta
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f'Invalid --since value "{value}". Use an ISO date/datetime or e.g. 6h, 2d.')
+        moment = datetime(day.year, day.month, day.day)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class Command(BaseCommand):
+    help = "Recompute word, example and history contribution counts with grouped queries and bulk_update."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Only rebuild users with a submission made or reviewed since this ISO timestamp or look-back (6h, 2d).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of users to aggregate and update per round.",
+        )
+
+    def handle(self, *args, **options):
+        since = parse_since(options["since"]) if options["since"] else None
+        written = ContributionStats.rebuild(since=since, batch_size=options["batch_size"])
+        scope = f" active since {since:%Y-%m-%d %H:%M}" if since else ""
+        self.stdout.write(self.style.SUCCESS(f"Done. Rebuilt stats for {written} user(s){scope}."))
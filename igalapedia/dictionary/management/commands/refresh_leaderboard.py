@@ -0,0 +1,28 @@
+"""
+Management command to rebuild the materialized leaderboard snapshots.
+Usage: python manage.py refresh_leaderboard [--period all|30d|7d]
+Run it daily (e.g. from cron) so the 30- and 7-day rankings roll forward.
+"""
+from django.core.management.base import BaseCommand
+
+from dictionary.models import LeaderboardEntry
+
+
+class Command(BaseCommand):
+    help = "Rebuild the all-time, 30-day and 7-day leaderboard rankings."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--period",
+            action="append",
+            choices=list(LeaderboardEntry.PERIOD_DAYS),
+            help="Period to rebuild (repeatable). Defaults to all periods.",
+        )
+
+    def handle(self, *args, **options):
+        periods = options["period"] or list(LeaderboardEntry.PERIOD_DAYS)
+        LeaderboardEntry.refresh(periods)
+        for period in periods:
+            count = LeaderboardEntry.objects.filter(period=period).count()
+            self.stdout.write(f"{period}: {count} contributor(s)")
+        self.stdout.write(self.style.SUCCESS("Done. Leaderboard refreshed."))
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.3 on 2026-10-18 18:27
+
+from django.db import migrations, models
+
+from dictionary.utils import normalize_word
+
+
+def fill_lookup_keys(apps, schema_editor, batch_size=1000):
+    Words = apps.get_model('dictionary', 'Words')
+    batch = []
+    for word in Words.objects.only('id', 'word').order_by('id').iterator(chunk_size=batch_size):
+        word.lookup_key = normalize_word(word.word)
+        batch.append(word)
+        if len(batch) >= batch_size:
+            Words.objects.bulk_update(batch, ['lookup_key'])
+            batch = []
+    if batch:
+        Words.objects.bulk_update(batch, ['lookup_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictionary', '0008_add_words_created_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='words',
+            name='lookup_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Tone- and diacritic-insensitive form of the word, used for lookups', max_length=100),
+        ),
+        migrations.RunPython(fill_lookup_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,91 @@
+"""
+Full-text indexes for the English -> Igala reverse lookup (dictionary.reverse_lookup).
+
+SQLite: external-content FTS5 tables over dictionary_meaning.meaning and
+dictionary_example.english_meaning, kept in sync by triggers.
+PostgreSQL: GIN expression indexes on to_tsvector('english', ...).
+Other backends get no index and fall back to LIKE queries.
+"""
+from django.db import migrations
+
+
+SQLITE_FORWARD = [
+    """CREATE VIRTUAL TABLE dictionary_meaning_fts USING fts5(
+        meaning, content='dictionary_meaning', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER dictionary_meaning_fts_ai AFTER INSERT ON dictionary_meaning BEGIN
+        INSERT INTO dictionary_meaning_fts(rowid, meaning) VALUES (new.id, new.meaning);
+    END""",
+    """CREATE TRIGGER dictionary_meaning_fts_ad AFTER DELETE ON dictionary_meaning BEGIN
+        INSERT INTO dictionary_meaning_fts(dictionary_meaning_fts, rowid, meaning)
+        VALUES ('delete', old.id, old.meaning);
+    END""",
+    """CREATE TRIGGER dictionary_meaning_fts_au AFTER UPDATE OF meaning ON dictionary_meaning BEGIN
+        INSERT INTO dictionary_meaning_fts(dictionary_meaning_fts, rowid, meaning)
+        VALUES ('delete', old.id, old.meaning);
+        INSERT INTO dictionary_meaning_fts(rowid, meaning) VALUES (new.id, new.meaning);
+    END""",
+    "INSERT INTO dictionary_meaning_fts(dictionary_meaning_fts) VALUES ('rebuild')",
+    """CREATE VIRTUAL TABLE dictionary_example_fts USING fts5(
+        english_meaning, content='dictionary_example', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER dictionary_example_fts_ai AFTER INSERT ON dictionary_example BEGIN
+        INSERT INTO dictionary_example_fts(rowid, english_meaning) VALUES (new.id, new.english_meaning);
+    END""",
+    """CREATE TRIGGER dictionary_example_fts_ad AFTER DELETE ON dictionary_example BEGIN
+        INSERT INTO dictionary_example_fts(dictionary_example_fts, rowid, english_meaning)
+        VALUES ('delete', old.id, old.english_meaning);
+    END""",
+    """CREATE TRIGGER dictionary_example_fts_au AFTER UPDATE OF english_meaning ON dictionary_example BEGIN
+        INSERT INTO dictionary_example_fts(dictionary_example_fts, rowid, english_meaning)
+        VALUES ('delete', old.id, old.english_meaning);
+        INSERT INTO dictionary_example_fts(rowid, english_meaning) VALUES (new.id, new.english_meaning);
+    END""",
+    "INSERT INTO dictionary_example_fts(dictionary_example_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS dictionary_meaning_fts_ai",
+    "DROP TRIGGER IF EXISTS dictionary_meaning_fts_ad",
+    "DROP TRIGGER IF EXISTS dictionary_meaning_fts_au",
+    "DROP TABLE IF EXISTS dictionary_meaning_fts",
+    "DROP TRIGGER IF EXISTS dictionary_example_fts_ai",
+    "DROP TRIGGER IF EXISTS dictionary_example_fts_ad",
+    "DROP TRIGGER IF EXISTS dictionary_example_fts_au",
+    "DROP TABLE IF EXISTS dictionary_example_fts",
+]
+
+POSTGRES_FORWARD = [
+    "CREATE INDEX IF NOT EXISTS dictionary_meaning_meaning_fts "
+    "ON dictionary_meaning USING gin (to_tsvector('english', meaning))",
+    "CREATE INDEX IF NOT EXISTS dictionary_example_english_fts "
+    "ON dictionary_example USING gin (to_tsvector('english', english_meaning))",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS dictionary_meaning_meaning_fts",
+    "DROP INDEX IF EXISTS dictionary_example_english_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictionary', '0009_words_lookup_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE}),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.3 on 2026-10-18 18:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictionary', '0010_meaning_fulltext_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='words',
+            index=models.Index(fields=['lookup_key', 'id'], name='words_sort_key_idx'),
+        ),
+    ]
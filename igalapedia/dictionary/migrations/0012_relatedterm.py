@@ -0,0 +1,28 @@
+# Generated by Django 5.0.3 on 2026-10-18 18:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictionary', '0011_words_sort_key_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('term_key', models.CharField(db_index=True, max_length=100)),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('target', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='dictionary.words')),
+                ('word', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='dictionary.words')),
+            ],
+            options={
+                'ordering': ['position'],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations
+
+from dictionary.utils import normalize_word, same_spelling
+
+
+def populate_related_terms(apps, schema_editor):
+    Words = apps.get_model('dictionary', 'Words')
+    RelatedTerm = apps.get_model('dictionary', 'RelatedTerm')
+
+    by_key = {}
+    for word in Words.objects.only('id', 'word').order_by('id'):
+        by_key.setdefault(normalize_word(word.word), []).append(word)
+
+    links = []
+    for word in Words.objects.exclude(related_terms__isnull=True).exclude(related_terms='').only('id', 'related_terms'):
+        seen = set()
+        position = 0
+        for term in word.related_terms.split(','):
+            term = term.strip()[:100]
+            key = normalize_word(term)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            candidates = [c for c in by_key.get(key, []) if c.id != word.id]
+            target = next((c for c in candidates if same_spelling(c.word, term)), None)
+            links.append(RelatedTerm(
+                word_id=word.id,
+                term=term,
+                term_key=key,
+                target=target or (candidates[0] if candidates else None),
+                position=position,
+            ))
+            position += 1
+    RelatedTerm.objects.bulk_create(links, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictionary', '0012_relatedterm'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_related_terms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.3 on 2026-10-18 18:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictionary', '0013_populate_related_terms'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('all', 'All time'), ('30d', 'Last 30 days'), ('7d', 'Last 7 days')], max_length=4)),
+                ('rank', models.PositiveIntegerField()),
+                ('display_name', models.CharField(max_length=300)),
+                ('word_count', models.PositiveIntegerField()),
+                ('last_approved_at', models.DateTimeField(blank=True, null=True)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Leaderboard Entry',
+                'verbose_name_plural': 'Leaderboard Entries',
+                'ordering': ['period', 'rank', 'id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='pendingword',
+            index=models.Index(fields=['status', 'reviewed_at'], name='pendingword_status_review_idx'),
+        ),
+        migrations.AddField(
+            model_name='leaderboardentry',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['period', 'rank', 'id'], name='leaderboard_period_rank_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('period', 'user'), name='unique_leaderboard_user_period'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.3 on 2026-10-18 18:47
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_example_counts(apps, schema_editor):
+    ContributionStats = apps.get_model('dictionary', 'ContributionStats')
+    PendingExampleContribution = apps.get_model('dictionary', 'PendingExampleContribution')
+    approved = (
+        PendingExampleContribution.objects.filter(status='APPROVED')
+        .values('submitted_by').annotate(n=Count('id')).order_by()
+        .values_list('submitted_by', 'n')
+    )
+    for user_id, count in approved:
+        ContributionStats.objects.filter(user_id=user_id).update(approved_examples_count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictionary', '0014_leaderboardentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contributionstats',
+            name='approved_examples_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_example_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.3 on 2026-10-18 19:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictionary', '0015_contributionstats_approved_examples_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WordsVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
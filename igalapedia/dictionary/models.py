@@ -1,8 +1,13 @@
-from django.db import models, transaction, IntegrityError
-from django.utils.text import slugify
+from django.db import connection, models, transaction, IntegrityError
+from django.db.models import Count, F, Max, Min, Q, Value
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.utils import timezone
 
+from core.slugs import save_with_unique_slug
+
+from .utils import normalize_word, same_spelling
+
 class PartOfSpeech(models.Model):
     name = models.CharField(max_length=100)
 
@@ -23,6 +28,13 @@ class Words(models.Model):
     dialects = models.CharField(max_length=200, blank=True, null=True)
     related_terms = models.CharField(max_length=200, null=True, blank=True)
     slug = models.SlugField(unique=True, max_length=100, blank=True)
+    lookup_key = models.CharField(
+        max_length=100,
+        db_index=True,
+        blank=True,
+        editable=False,
+        help_text="Tone- and diacritic-insensitive form of the word, used for lookups"
+    )
     created_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
     contributor = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -33,15 +45,37 @@ class Words(models.Model):
     )
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.word)
-        super().save(*args, **kwargs)
+        self.lookup_key = normalize_word(self.word)
+        if kwargs.get('update_fields') is not None and 'word' in kwargs['update_fields']:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'lookup_key'}
+        # Tone variants of a word can slugify identically; they get -1, -2, ...
+        save_with_unique_slug(self, self.word, super().save, *args, fallback='word', **kwargs)
 
     def __str__(self):
         return self.word
 
+    @classmethod
+    def lookup(cls, text):
+        """
+        Find the headword for `text` via the indexed lookup key.
+        Prefers an exact spelling (ignoring case); otherwise returns any
+        tone/diacritic variant, or None.
+        """
+        key = normalize_word(text)
+        if not key:
+            return None
+        candidates = list(cls.objects.filter(lookup_key=key).order_by('id')[:20])
+        for candidate in candidates:
+            if same_spelling(candidate.word, text):
+                return candidate
+        return candidates[0] if candidates else None
+
     class Meta:
         verbose_name = "Word"
+        indexes = [
+            # Keyset pagination of the dictionary listing
+            models.Index(fields=['lookup_key', 'id'], name='words_sort_key_idx'),
+        ]
 
 
 class Meaning(models.Model):
@@ -54,6 +88,103 @@ class Meaning(models.Model):
         return self.meaning
 
 
+class WordsVersion(models.Model):
+    """
+    Single-row version counter of the Words table, bumped with an atomic
+    F() update whenever words change. Workers compare it with the version
+    their in-memory search indexes were built at (dictionary.search_index).
+    """
+    version = models.PositiveBigIntegerField(default=0)
+
+    SINGLETON_ID = 1
+
+    def __str__(self):
+        return f"Words version {self.version}"
+
+    @classmethod
+    def current(cls):
+        return cls.objects.filter(pk=cls.SINGLETON_ID).values_list('version', flat=True).first() or 0
+
+    @classmethod
+    def bump(cls):
+        """Increment the version and return the new value; concurrent bumps never share one."""
+        with transaction.atomic():
+            if not cls.objects.filter(pk=cls.SINGLETON_ID).update(version=F('version') + 1):
+                cls.objects.get_or_create(pk=cls.SINGLETON_ID)
+                cls.objects.filter(pk=cls.SINGLETON_ID).update(version=F('version') + 1)
+            # The row stays locked by our update until commit, so this is our own value.
+            return cls.objects.filter(pk=cls.SINGLETON_ID).values_list('version', flat=True).get()
+
+
+class RelatedTerm(models.Model):
+    """
+    One comma-separated entry of Words.related_terms, linked to its headword
+    when it exists. Kept in sync by dictionary.signals; a dangling term is
+    resolved as soon as a word with the same lookup key is saved.
+    """
+    word = models.ForeignKey(Words, related_name='related_links', on_delete=models.CASCADE)
+    term = models.CharField(max_length=100)
+    term_key = models.CharField(max_length=100, db_index=True)
+    target = models.ForeignKey(
+        Words,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    position = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        ordering = ['position']
+
+    def __str__(self):
+        return f"{self.word.word} -> {self.term}"
+
+    @staticmethod
+    def parse(related_terms):
+        """Split a related_terms string into unique, ordered terms."""
+        terms = []
+        seen = set()
+        for term in (related_terms or '').split(','):
+            term = term.strip()[:100]
+            key = normalize_word(term)
+            if key and key not in seen:
+                seen.add(key)
+                terms.append(term)
+        return terms
+
+    @classmethod
+    def sync_for(cls, word):
+        """Rebuild the links for `word` if its related_terms text changed."""
+        terms = cls.parse(word.related_terms)
+        existing = list(cls.objects.filter(word=word).values_list('term', flat=True))
+        if existing == terms:
+            return
+        keys = [normalize_word(term) for term in terms]
+        targets = {}
+        for candidate in Words.objects.filter(lookup_key__in=keys).exclude(pk=word.pk).order_by('id'):
+            targets.setdefault(candidate.lookup_key, []).append(candidate)
+        links = []
+        for position, (term, key) in enumerate(zip(terms, keys)):
+            candidates = targets.get(key, [])
+            target = next((c for c in candidates if same_spelling(c.word, term)), None)
+            links.append(cls(
+                word=word,
+                term=term,
+                term_key=key,
+                target=target or (candidates[0] if candidates else None),
+                position=position,
+            ))
+        with transaction.atomic():
+            cls.objects.filter(word=word).delete()
+            cls.objects.bulk_create(links)
+
+    @classmethod
+    def resolve_for(cls, word):
+        """Point dangling terms that match `word` at it."""
+        if word.lookup_key:
+            cls.objects.filter(target__isnull=True, term_key=word.lookup_key).exclude(word=word).update(target=word)
+
 
 # CONTRIBUTION/SUBMISSION MODELS
 
@@ -103,13 +234,19 @@ class PendingWord(models.Model):
         verbose_name = "Pending Word Submission"
         verbose_name_plural = "Pending Word Submissions"
         ordering = ['-submitted_at']
+        indexes = [
+            # Leaderboard aggregates over approvals in a time window
+            models.Index(fields=['status', 'reviewed_at'], name='pendingword_status_review_idx'),
+        ]
     
     def __str__(self):
         return f"{self.word} - {self.get_status_display()}"
     
-    def approve(self, reviewer):
+    def approve(self, reviewer, refresh_leaderboard=True):
         """
         Approve this submission and create official Word entry.
+        Bulk approvals pass refresh_leaderboard=False and refresh the
+        leaderboard once at the end instead of once per word.
         Returns the created Words instance on success, or None if:
         - Already processed (not PENDING)
         - Duplicate word exists (race condition or concurrent approval)
@@ -136,11 +273,16 @@ class PendingWord(models.Model):
                 self.reviewed_at = timezone.now()
                 self.approved_word = word
                 self.save()
+                ContributionStats.record_transition(self.submitted_by, 'PENDING', 'APPROVED')
+                
+                # The Words post_save signal has already bumped the search index version.
+                if refresh_leaderboard:
+                    transaction.on_commit(LeaderboardEntry.refresh)
                 
                 return word
         except IntegrityError:
             # Duplicate word already exists - auto-reject this submission
-            existing = Words.objects.filter(word__iexact=self.word).first()
+            existing = Words.lookup(self.word)
             self.status = 'REJECTED'
             self.reviewed_by = reviewer
             self.reviewed_at = timezone.now()
@@ -148,17 +290,20 @@ class PendingWord(models.Model):
             if existing:
                 self.review_notes += f' See: /dictionary/single-word/{existing.slug}/'
             self.save()
+            ContributionStats.record_transition(self.submitted_by, 'PENDING', 'REJECTED')
             return None
     
     def reject(self, reviewer, notes=""):
         """
         Reject this submission
         """
+        previous_status = self.status
         self.status = 'REJECTED'
         self.reviewed_by = reviewer
         self.reviewed_at = timezone.now()
         self.review_notes = notes
         self.save()
+        ContributionStats.record_transition(self.submitted_by, previous_status, 'REJECTED')
 
 
 class PendingMeaning(models.Model):
@@ -215,6 +360,7 @@ class ContributionStats(models.Model):
     rejected_words_count = models.IntegerField(default=0)
     total_submissions = models.IntegerField(default=0)
     approved_histories_count = models.IntegerField(default=0)
+    approved_examples_count = models.IntegerField(default=0)
     
     # Timestamps
     first_contribution = models.DateTimeField(null=True, blank=True)
@@ -227,27 +373,277 @@ class ContributionStats(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.approved_words_count} approved"
     
+    STATUS_FIELDS = {
+        'PENDING': 'pending_words_count',
+        'APPROVED': 'approved_words_count',
+        'REJECTED': 'rejected_words_count',
+    }
+
     def update_stats(self):
         """
-        Recalculate contribution statistics
+        Recalculate contribution statistics (words, approved examples and
+        approved histories) from the submissions
         """
-        user_submissions = PendingWord.objects.filter(submitted_by=self.user)
-        
-        self.approved_words_count = user_submissions.filter(status='APPROVED').count()
-        self.pending_words_count = user_submissions.filter(status='PENDING').count()
-        self.rejected_words_count = user_submissions.filter(status='REJECTED').count()
-        self.total_submissions = user_submissions.count()
-        
-        first_submission = user_submissions.order_by('submitted_at').first()
-        last_submission = user_submissions.order_by('-submitted_at').first()
-        
-        if first_submission:
-            self.first_contribution = first_submission.submitted_at
-        if last_submission:
-            self.last_contribution = last_submission.submitted_at
-        
+        from history.models import PendingHistory
+
+        totals = PendingWord.objects.filter(submitted_by=self.user).aggregate(
+            approved=Count('id', filter=Q(status='APPROVED')),
+            pending=Count('id', filter=Q(status='PENDING')),
+            rejected=Count('id', filter=Q(status='REJECTED')),
+            total=Count('id'),
+            first=Min('submitted_at'),
+            last=Max('submitted_at'),
+        )
+
+        self.approved_words_count = totals['approved']
+        self.pending_words_count = totals['pending']
+        self.rejected_words_count = totals['rejected']
+        self.total_submissions = totals['total']
+        self.approved_examples_count = PendingExampleContribution.objects.filter(
+            submitted_by=self.user, status='APPROVED'
+        ).count()
+        self.approved_histories_count = PendingHistory.objects.filter(
+            submitted_by=self.user, status='APPROVED'
+        ).count()
+
+        if totals['first']:
+            self.first_contribution = totals['first']
+        if totals['last']:
+            self.last_contribution = totals['last']
+
         self.save()
 
+    @classmethod
+    def apply_deltas(cls, user, contributed_at=None, **deltas):
+        """
+        Apply counter changes such as pending_words_count=-1, approved_words_count=1
+        as atomic F() updates, without recounting. contributed_at moves
+        last_contribution (and fills first_contribution). A user without a stats
+        row yet gets a full recount instead; callers save the submission's new
+        status first, so the recount already includes this change.
+        """
+        stats, created = cls.objects.get_or_create(user=user)
+        if created:
+            stats.update_stats()
+            return
+
+        updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if contributed_at is not None:
+            updates['last_contribution'] = contributed_at
+            updates['first_contribution'] = Coalesce(F('first_contribution'), Value(contributed_at))
+        if not updates:
+            return
+        rows = cls.objects.filter(pk=stats.pk)
+        rows.update(**updates)
+
+        # Queryset updates skip the save signals that keep SiteCounters.contributor_count
+        # in step, so handle a user gaining or losing their only approved word here.
+        approved_delta = deltas.get('approved_words_count', 0)
+        if approved_delta:
+            from main.models import SiteCounters
+            from main.page_cache import purge_tags
+
+            approved = rows.values_list('approved_words_count', flat=True).first() or 0
+            was, now = approved - approved_delta > 0, approved > 0
+            if was != now:
+                SiteCounters.bump(contributor_count=1 if now else -1)
+                purge_tags('site-counters')
+
+    @classmethod
+    def record_transition(cls, user, old_status, new_status):
+        """Move one submission between status counters."""
+        if old_status == new_status:
+            return
+        deltas = {}
+        if old_status in cls.STATUS_FIELDS:
+            deltas[cls.STATUS_FIELDS[old_status]] = -1
+        if new_status in cls.STATUS_FIELDS:
+            deltas[cls.STATUS_FIELDS[new_status]] = 1
+        cls.apply_deltas(user, **deltas)
+
+    @classmethod
+    def rebuild(cls, user_ids=None, since=None, batch_size=1000):
+        """
+        Recompute stats for many users with grouped aggregates and bulk_update.
+
+        user_ids limits the rebuild to those users; since limits it to users
+        with a submission made or reviewed at or after that time. With neither,
+        every user is rebuilt. Returns the number of stats rows written.
+        """
+        from django.contrib.auth import get_user_model
+        from history.models import PendingHistory
+        from main.models import SiteCounters
+        from main.page_cache import purge_tags
+
+        sources = (PendingWord, PendingExampleContribution, PendingHistory)
+        if since is not None:
+            touched = set()
+            for model in sources:
+                touched.update(
+                    model.objects.filter(Q(submitted_at__gte=since) | Q(reviewed_at__gte=since))
+                    .values_list('submitted_by', flat=True)
+                    .distinct()
+                )
+            if user_ids is not None:
+                touched &= set(user_ids)
+            user_ids = touched
+        if user_ids is None:
+            user_ids = get_user_model().objects.values_list('pk', flat=True)
+        user_ids = sorted(user_ids)
+
+        fields = [
+            'approved_words_count', 'pending_words_count', 'rejected_words_count',
+            'total_submissions', 'approved_examples_count', 'approved_histories_count',
+            'first_contribution', 'last_contribution',
+        ]
+        written = 0
+        for start in range(0, len(user_ids), batch_size):
+            chunk = user_ids[start:start + batch_size]
+            words = {
+                row['submitted_by']: row
+                for row in PendingWord.objects.filter(submitted_by__in=chunk)
+                .values('submitted_by')
+                .annotate(
+                    approved=Count('id', filter=Q(status='APPROVED')),
+                    pending=Count('id', filter=Q(status='PENDING')),
+                    rejected=Count('id', filter=Q(status='REJECTED')),
+                    total=Count('id'),
+                    first=Min('submitted_at'),
+                    last=Max('submitted_at'),
+                )
+                .order_by()
+            }
+            examples = dict(
+                PendingExampleContribution.objects.filter(submitted_by__in=chunk, status='APPROVED')
+                .values('submitted_by').annotate(n=Count('id')).order_by()
+                .values_list('submitted_by', 'n')
+            )
+            histories = dict(
+                PendingHistory.objects.filter(submitted_by__in=chunk, status='APPROVED')
+                .values('submitted_by').annotate(n=Count('id')).order_by()
+                .values_list('submitted_by', 'n')
+            )
+
+            cls.objects.bulk_create([cls(user_id=pk) for pk in chunk], ignore_conflicts=True)
+            rows = list(cls.objects.filter(user_id__in=chunk))
+            for stats in rows:
+                totals = words.get(stats.user_id, {})
+                stats.approved_words_count = totals.get('approved', 0)
+                stats.pending_words_count = totals.get('pending', 0)
+                stats.rejected_words_count = totals.get('rejected', 0)
+                stats.total_submissions = totals.get('total', 0)
+                stats.first_contribution = totals.get('first')
+                stats.last_contribution = totals.get('last')
+                stats.approved_examples_count = examples.get(stats.user_id, 0)
+                stats.approved_histories_count = histories.get(stats.user_id, 0)
+            cls.objects.bulk_update(rows, fields, batch_size=batch_size)
+            written += len(rows)
+
+        # bulk_update skips the save signals that maintain contributor_count.
+        if written:
+            SiteCounters.reconcile()
+            purge_tags('site-counters')
+        return written
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Materialized leaderboard: one ranked row per contributor per period,
+    rebuilt by LeaderboardEntry.refresh() after word approvals (once per
+    admin action) and by
+    `python manage.py refresh_leaderboard` (run it daily so the rolling
+    windows move on).
+    """
+    PERIOD_CHOICES = [
+        ('all', 'All time'),
+        ('30d', 'Last 30 days'),
+        ('7d', 'Last 7 days'),
+    ]
+    PERIOD_DAYS = {'all': None, '30d': 30, '7d': 7}
+
+    period = models.CharField(max_length=4, choices=PERIOD_CHOICES)
+    rank = models.PositiveIntegerField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='leaderboard_entries'
+    )
+    display_name = models.CharField(max_length=300)
+    word_count = models.PositiveIntegerField()
+    last_approved_at = models.DateTimeField(null=True, blank=True)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Leaderboard Entry"
+        verbose_name_plural = "Leaderboard Entries"
+        ordering = ['period', 'rank', 'id']
+        indexes = [
+            models.Index(fields=['period', 'rank', 'id'], name='leaderboard_period_rank_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'user'], name='unique_leaderboard_user_period'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_period_display()} #{self.rank} {self.display_name}"
+
+    # Key of the PostgreSQL advisory lock that serializes refresh().
+    REFRESH_LOCK_ID = 0x6C656164
+
+    @classmethod
+    def refresh(cls, periods=None):
+        """
+        Rebuild the snapshots for the given periods (all by default). Each
+        period is one grouped aggregate over approved submissions joined to
+        their submitters; ties share a rank (1, 2, 2, 4).
+
+        Concurrent refreshes (two approvals committing together) run one after
+        the other, so the second never inserts over rows the first just wrote.
+        """
+        with transaction.atomic():
+            # Held until commit. SQLite serializes writers by itself. The
+            # aggregates run after the lock is taken, so they also see the
+            # approval that triggered the refresh we waited for.
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT pg_advisory_xact_lock(%s)', [cls.REFRESH_LOCK_ID])
+            cls._refresh_locked(periods)
+
+    @classmethod
+    def _refresh_locked(cls, periods):
+        now = timezone.now()
+        for period in periods or cls.PERIOD_DAYS:
+            approved = PendingWord.objects.filter(status='APPROVED')
+            days = cls.PERIOD_DAYS[period]
+            if days:
+                approved = approved.filter(reviewed_at__gte=now - timezone.timedelta(days=days))
+            rows = (
+                approved.values(
+                    'submitted_by', 'submitted_by__username',
+                    'submitted_by__first_name', 'submitted_by__last_name',
+                )
+                .annotate(word_count=models.Count('id'), last_approved_at=models.Max('reviewed_at'))
+                .order_by('-word_count', 'last_approved_at', 'submitted_by')
+            )
+            entries = []
+            rank = 0
+            previous_count = None
+            for position, row in enumerate(rows, 1):
+                if row['word_count'] != previous_count:
+                    rank, previous_count = position, row['word_count']
+                full_name = f"{row['submitted_by__first_name']} {row['submitted_by__last_name']}".strip()
+                entries.append(cls(
+                    period=period,
+                    rank=rank,
+                    user_id=row['submitted_by'],
+                    display_name=full_name or row['submitted_by__username'],
+                    word_count=row['word_count'],
+                    last_approved_at=row['last_approved_at'],
+                    refreshed_at=now,
+                ))
+            cls.objects.filter(period=period).delete()
+            cls.objects.bulk_create(entries, batch_size=1000)
+
 
 class PendingExampleContribution(models.Model):
     """
@@ -330,6 +726,7 @@ class PendingExampleContribution(models.Model):
         self.reviewed_at = timezone.now()
         self.approved_example = example
         self.save()
+        ContributionStats.apply_deltas(self.submitted_by, approved_examples_count=1)
         
         return example
     
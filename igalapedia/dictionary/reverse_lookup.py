@@ -0,0 +1,112 @@
+"""
+English -> Igala reverse lookup over Meaning.meaning and Example.english_meaning.
+
+Backed by a real full-text index (see migration 0010): FTS5 tables kept in sync
+by triggers on SQLite, and GIN expression indexes on to_tsvector('english', ...)
+on PostgreSQL. Each lookup is a single ranked query that returns the headword,
+part of speech and slug for every matching sense.
+"""
+from django.db import connection
+
+from core.fulltext import fts5_query, query_tokens, tsquery
+
+
+MAX_RESULTS = 50
+
+# Matches on the sense itself rank above matches that only occur in an example.
+EXAMPLE_WEIGHT = 0.5
+
+_SQLITE_SQL = """
+SELECT m.id, w.word, w.slug, p.name, m.meaning, MAX(hit.rank) AS rank
+FROM (
+    SELECT f.rowid AS meaning_id, -bm25(dictionary_meaning_fts) AS rank
+    FROM dictionary_meaning_fts f
+    WHERE dictionary_meaning_fts MATCH %s
+    UNION ALL
+    SELECT me.meaning_id, -{weight} * bm25(dictionary_example_fts)
+    FROM dictionary_example_fts f
+    JOIN dictionary_meaning_examples me ON me.example_id = f.rowid
+    WHERE dictionary_example_fts MATCH %s
+) hit
+JOIN dictionary_meaning m ON m.id = hit.meaning_id
+JOIN dictionary_words w ON w.id = m.word_id
+JOIN dictionary_partofspeech p ON p.id = m.part_of_speech_id
+GROUP BY m.id, w.word, w.slug, p.name, m.meaning
+ORDER BY rank DESC, w.word
+LIMIT %s
+""".format(weight=EXAMPLE_WEIGHT)
+
+_POSTGRES_SQL = """
+SELECT m.id, w.word, w.slug, p.name, m.meaning, MAX(hit.rank) AS rank
+FROM (
+    SELECT m.id AS meaning_id,
+           ts_rank(to_tsvector('english', m.meaning), to_tsquery('english', %s)) AS rank
+    FROM dictionary_meaning m
+    WHERE to_tsvector('english', m.meaning) @@ to_tsquery('english', %s)
+    UNION ALL
+    SELECT me.meaning_id,
+           {weight} * ts_rank(to_tsvector('english', e.english_meaning), to_tsquery('english', %s))
+    FROM dictionary_example e
+    JOIN dictionary_meaning_examples me ON me.example_id = e.id
+    WHERE to_tsvector('english', e.english_meaning) @@ to_tsquery('english', %s)
+) hit
+JOIN dictionary_meaning m ON m.id = hit.meaning_id
+JOIN dictionary_words w ON w.id = m.word_id
+JOIN dictionary_partofspeech p ON p.id = m.part_of_speech_id
+GROUP BY m.id, w.word, w.slug, p.name, m.meaning
+ORDER BY rank DESC, w.word
+LIMIT %s
+""".format(weight=EXAMPLE_WEIGHT)
+
+
+def _fallback_rows(tokens, limit):
+    """Unindexed LIKE search for database backends without a full-text index."""
+    from django.db.models import Q
+    from .models import Meaning
+
+    condition = Q()
+    for token in tokens:
+        condition &= Q(meaning__icontains=token) | Q(examples__english_meaning__icontains=token)
+    meanings = (
+        Meaning.objects.filter(condition)
+        .select_related('word', 'part_of_speech')
+        .distinct()
+        .order_by('word__word')[:limit]
+    )
+    return [(m.id, m.word.word, m.word.slug, m.part_of_speech.name, m.meaning, 0) for m in meanings]
+
+
+def reverse_lookup(term, limit=20):
+    """
+    Find Igala headwords whose senses (or their examples) match an English term.
+    Returns a list of dicts ordered by relevance:
+    {word, slug, part_of_speech, meaning, meaning_id}.
+    """
+    tokens = query_tokens(term)
+    if not tokens:
+        return []
+    limit = max(1, min(limit, MAX_RESULTS))
+
+    if connection.vendor == 'sqlite':
+        match = fts5_query(tokens)
+        with connection.cursor() as cursor:
+            cursor.execute(_SQLITE_SQL, [match, match, limit])
+            rows = cursor.fetchall()
+    elif connection.vendor == 'postgresql':
+        query = tsquery(tokens)
+        with connection.cursor() as cursor:
+            cursor.execute(_POSTGRES_SQL, [query, query, query, query, limit])
+            rows = cursor.fetchall()
+    else:
+        rows = _fallback_rows(tokens, limit)
+
+    return [
+        {
+            'meaning_id': meaning_id,
+            'word': word,
+            'slug': slug,
+            'part_of_speech': part_of_speech,
+            'meaning': meaning,
+        }
+        for meaning_id, word, slug, part_of_speech, meaning, _rank in rows
+    ]
@@ -0,0 +1,289 @@
+"""
+In-memory search indexes for dictionary live search.
+
+Each worker keeps a read-only, normalized and sorted array of (key, word, slug)
+entries and answers prefix queries with bisect. A version counter
+(dictionary.models.WordsVersion, bumped atomically in the database) changes
+whenever Words change; a worker that sees a new version rebuilds its copy with
+a single values_list() query. The version is read through the cache with a
+short timeout, so the search hot path only touches the database once every
+VERSION_CACHE_TIMEOUT seconds.
+
+Alongside it, a SymSpell-style deletion dictionary answers typo-tolerant
+lookups (edit distance <= 2) without scanning every headword. It is built
+lazily on the first fuzzy query after a rebuild. When the only changes since
+a worker's last refresh are newly added words (the approval path), both
+indexes are patched from a short change log in the cache instead of being
+rebuilt.
+"""
+import threading
+import time
+from bisect import bisect_left
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .utils import normalize_word
+
+
+WORDS_VERSION_KEY = 'dictionary:words_version'
+WORDS_CHANGE_KEY = 'dictionary:words_change:{}'
+
+# A bump deletes the cached copy; this bounds how long a copy cached by a
+# reader racing the bump can stay behind the database.
+VERSION_CACHE_TIMEOUT = 5
+
+# Change-log entries live this long; a worker further behind rebuilds.
+CHANGE_LOG_TIMEOUT = 60 * 60
+MAX_INCREMENTAL_CHANGES = 100
+
+# A change-log entry written after its version was already read is missed by
+# the patch, so an index that has been patched is rebuilt once it is this old.
+FULL_REBUILD_AFTER = 15 * 60
+
+FUZZY_MAX_DISTANCE = 2
+FUZZY_PREFIX_LENGTH = 7
+
+
+def search_key(text):
+    """Key used to order and match headwords in the prefix index."""
+    return normalize_word(text)
+
+
+def get_words_version():
+    """Current shared version of the Words table (0 if never bumped)."""
+    version = cache.get(WORDS_VERSION_KEY)
+    if version is None:
+        from .models import WordsVersion
+
+        version = WordsVersion.current()
+        cache.set(WORDS_VERSION_KEY, version, timeout=VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def bump_words_version(added=None):
+    """
+    Mark every worker's search indexes as stale.
+    Pass added=(word, slug) when the change is a newly created word so workers
+    can patch their indexes instead of rebuilding them.
+    Deferred until the surrounding transaction commits so rebuilds never see
+    uncommitted rows.
+    """
+    def _bump():
+        from .models import WordsVersion
+
+        version = WordsVersion.bump()
+        if added:
+            cache.set(WORDS_CHANGE_KEY.format(version), tuple(added), timeout=CHANGE_LOG_TIMEOUT)
+        cache.delete(WORDS_VERSION_KEY)
+    transaction.on_commit(_bump)
+
+
+class PrefixIndex:
+    """Sorted (key, word, slug) arrays searched with bisect."""
+
+    def __init__(self, entries=()):
+        entries = sorted(entries)
+        self.keys = [e[0] for e in entries]
+        self.words = [e[1] for e in entries]
+        self.slugs = [e[2] for e in entries]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def with_entries(self, entries):
+        """Return a copy with extra (key, word, slug) entries inserted in order."""
+        index = PrefixIndex()
+        index.keys, index.words, index.slugs = list(self.keys), list(self.words), list(self.slugs)
+        known = set(self.slugs)
+        for key, word, slug in entries:
+            if slug in known:
+                continue
+            i = bisect_left(index.keys, key)
+            index.keys.insert(i, key)
+            index.words.insert(i, word)
+            index.slugs.insert(i, slug)
+            known.add(slug)
+        return index
+
+    def search(self, prefix, limit=50):
+        """Return up to `limit` (word, slug) pairs whose key starts with prefix."""
+        prefix = search_key(prefix)
+        if not prefix:
+            return []
+        keys = self.keys
+        results = []
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and len(results) < limit and keys[i].startswith(prefix):
+            results.append((self.words[i], self.slugs[i]))
+            i += 1
+        return results
+
+
+def _deletes(text, max_distance):
+    """Every string obtainable from text by removing up to max_distance characters."""
+    result = {text}
+    frontier = {text}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for s in frontier:
+            for i in range(len(s)):
+                next_frontier.add(s[:i] + s[i + 1:])
+        next_frontier -= result
+        result |= next_frontier
+        frontier = next_frontier
+    return result
+
+
+def edit_distance(a, b, max_distance):
+    """Levenshtein distance, or max_distance + 1 as soon as it is known to exceed it."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """
+    SymSpell deletion dictionary: maps every deletion (up to max_distance) of
+    each key's first prefix_length characters to the entries that produced it.
+    A query only verifies entries sharing a deletion with its own prefix.
+    """
+
+    def __init__(self, entries=(), max_distance=FUZZY_MAX_DISTANCE, prefix_length=FUZZY_PREFIX_LENGTH):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.entries = []
+        self.deletes = {}
+        self._slugs = set()
+        for key, word, slug in entries:
+            self.add(key, word, slug)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, key, word, slug):
+        if not key or slug in self._slugs:
+            return
+        position = len(self.entries)
+        self.entries.append((key, word, slug))
+        self._slugs.add(slug)
+        for deletion in _deletes(key[:self.prefix_length], self.max_distance):
+            self.deletes.setdefault(deletion, []).append(position)
+
+    def search(self, term, limit=5):
+        """Return up to `limit` (word, slug, distance) tuples, nearest first."""
+        key = search_key(term)
+        if not key:
+            return []
+        candidates = set()
+        for deletion in _deletes(key[:self.prefix_length], self.max_distance):
+            candidates.update(self.deletes.get(deletion, ()))
+        matches = []
+        for position in candidates:
+            entry_key, word, slug = self.entries[position]
+            distance = edit_distance(key, entry_key, self.max_distance)
+            if distance <= self.max_distance:
+                matches.append((distance, entry_key, word, slug))
+        matches.sort()
+        return [(word, slug, distance) for distance, _key, word, slug in matches[:limit]]
+
+
+class _WorkerIndexes:
+    def __init__(self):
+        self.version = None
+        self.built_at = 0.0
+        self.patched = False
+        self.prefix = PrefixIndex()
+        self.fuzzy = None
+        self.lock = threading.Lock()
+
+
+_state = _WorkerIndexes()
+
+
+def _load_entries():
+    from .models import Words
+
+    return [
+        (search_key(word), word, slug)
+        for word, slug in Words.objects.values_list('word', 'slug').iterator(chunk_size=5000)
+    ]
+
+
+def build_index():
+    """Build a fresh PrefixIndex from the Words table."""
+    return PrefixIndex(_load_entries())
+
+
+def _pending_additions(since, version):
+    """(key, word, slug) entries added between two versions, or None if unknown."""
+    if since is None or version <= since or version - since > MAX_INCREMENTAL_CHANGES:
+        return None
+    if _state.patched and time.monotonic() - _state.built_at > FULL_REBUILD_AFTER:
+        return None
+    keys = [WORDS_CHANGE_KEY.format(v) for v in range(since + 1, version + 1)]
+    changes = cache.get_many(keys)
+    if len(changes) != len(keys):
+        return None
+    return [(search_key(word), word, slug) for word, slug in (changes[k] for k in keys)]
+
+
+def _refresh(version, with_fuzzy=False):
+    state = _state
+    with state.lock:
+        if version != state.version:
+            additions = _pending_additions(state.version, version)
+            if additions is None:
+                entries = _load_entries()
+                state.prefix = PrefixIndex(entries)
+                state.fuzzy = None
+                state.built_at = time.monotonic()
+                state.patched = False
+            else:
+                state.prefix = state.prefix.with_entries(additions)
+                if state.fuzzy is not None:
+                    for entry in additions:
+                        state.fuzzy.add(*entry)
+                state.patched = True
+            state.version = version
+        if with_fuzzy and state.fuzzy is None:
+            # Built from the prefix index's entries, so both stay at the same version.
+            state.fuzzy = FuzzyIndex(zip(state.prefix.keys, state.prefix.words, state.prefix.slugs))
+
+
+def get_index():
+    """Return this worker's prefix index, refreshing it first if the shared version moved."""
+    version = get_words_version()
+    if version != _state.version:
+        _refresh(version)
+    return _state.prefix
+
+
+def get_fuzzy_index():
+    """Return this worker's fuzzy index, building or refreshing it as needed."""
+    version = get_words_version()
+    if version != _state.version or _state.fuzzy is None:
+        _refresh(version, with_fuzzy=True)
+    return _state.fuzzy
+
+
+def search_prefix(prefix, limit=50):
+    """Prefix search over all headwords; returns a list of (word, slug) pairs."""
+    return get_index().search(prefix, limit)
+
+
+def search_fuzzy(term, limit=5):
+    """Nearest headwords within edit distance 2; returns (word, slug, distance) tuples."""
+    return get_fuzzy_index().search(term, limit)
@@ -0,0 +1,103 @@
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from main.page_cache import purge_tags
+from .models import Words, Meaning, Example, PartOfSpeech, RelatedTerm, ContributionStats
+from .search_index import bump_words_version
+
+
+def _word_tags(word_ids):
+    return [f'word:{word_id}' for word_id in set(word_ids)]
+
+
+def _linking_word_ids(word):
+    """Words whose related-term links point at (or can now resolve to) `word`."""
+    condition = Q(target=word)
+    if word.lookup_key:
+        condition |= Q(term_key=word.lookup_key)
+    return RelatedTerm.objects.filter(condition).values_list('word_id', flat=True)
+
+
+@receiver(post_save, sender=Words)
+def words_saved(sender, instance, created, **kwargs):
+    """Invalidate the live-search indexes; new words are patched in, not rebuilt."""
+    bump_words_version(added=(instance.word, instance.slug) if created else None)
+
+
+@receiver(post_save, sender=Words)
+def words_related_terms(sender, instance, raw=False, **kwargs):
+    """Keep the related-term links of this word current and resolve terms that name it."""
+    if raw:
+        return
+    RelatedTerm.sync_for(instance)
+    RelatedTerm.resolve_for(instance)
+
+
+@receiver(post_delete, sender=Words)
+def words_deleted(sender, instance, **kwargs):
+    """Invalidate the live-search indexes on every worker."""
+    bump_words_version()
+
+
+@receiver(post_save, sender=Words)
+def words_purge_pages(sender, instance, raw=False, **kwargs):
+    """Purge the word's page, pages linking to it, and the listings that show it."""
+    if raw:
+        return
+    purge_tags(
+        f'word:{instance.id}', 'feed', 'recent-words', 'site-counters',
+        *_word_tags(_linking_word_ids(instance)),
+    )
+
+
+@receiver(pre_delete, sender=Words)
+def words_purge_pages_on_delete(sender, instance, **kwargs):
+    # Collected before the delete nulls the links that point here.
+    purge_tags(
+        f'word:{instance.id}', 'feed', 'recent-words', 'site-counters',
+        *_word_tags(_linking_word_ids(instance)),
+    )
+
+
+@receiver(post_save, sender=Meaning)
+@receiver(post_delete, sender=Meaning)
+def meaning_purge_pages(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    purge_tags(f'word:{instance.word_id}', 'feed')
+
+
+@receiver(m2m_changed, sender=Meaning.examples.through)
+def meaning_examples_purge_pages(sender, instance, action, reverse, pk_set, **kwargs):
+    """Examples attached to or detached from a sense (including example approval)."""
+    if action not in ('post_add', 'post_remove', 'post_clear', 'pre_clear'):
+        return
+    if not reverse:
+        purge_tags(f'word:{instance.word_id}')
+    elif action == 'pre_clear':
+        purge_tags(*_word_tags(instance.meaning_set.values_list('word_id', flat=True)))
+    elif pk_set:
+        purge_tags(*_word_tags(Meaning.objects.filter(pk__in=pk_set).values_list('word_id', flat=True)))
+
+
+@receiver(post_save, sender=Example)
+@receiver(pre_delete, sender=Example)
+def example_purge_pages(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    purge_tags('recent-examples', *_word_tags(instance.meaning_set.values_list('word_id', flat=True)))
+
+
+@receiver(post_save, sender=PartOfSpeech)
+def part_of_speech_purge_pages(sender, instance, raw=False, created=False, **kwargs):
+    if raw or created:
+        return
+    purge_tags(*_word_tags(instance.meaning_set.values_list('word_id', flat=True)))
+
+
+@receiver(post_save, sender=ContributionStats)
+def contribution_stats_purge_pages(sender, instance, raw=False, **kwargs):
+    """The home page counts contributors with approved words."""
+    if not raw:
+        purge_tags('site-counters')
@@ -1,6 +1,6 @@
 from django import template
-from django.utils.text import slugify
 from django.urls import reverse
+from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
 register = template.Library()
@@ -13,43 +13,18 @@ def split_terms(value, delimiter=','):
     return []
 
 
-@register.filter
-def create_word_link(word):
-    """Create a clickable link for a word"""
-    from dictionary.models import Words
-    
-    # Try to find the word in database
-    try:
-        word_obj = Words.objects.filter(word__iexact=word.strip()).first()
-        if word_obj:
-            url = reverse('single-word', kwargs={'slug': word_obj.slug})
-            return mark_safe(f'<a href="{url}" class="related-term-link">{word}</a>')
-    except:
-        pass
-    
-    # If word not found, return as plain text
-    return word
-
-
 @register.simple_tag
-def related_terms_html(related_terms_string):
-    """Convert related terms string to HTML with links"""
-    from dictionary.models import Words
-    
-    if not related_terms_string:
-        return ""
-    
-    terms = [term.strip() for term in related_terms_string.split(',') if term.strip()]
+def related_terms_html(word):
+    """
+    Render a word's related terms as links (resolved) or plain text (dangling).
+    Reads word.related_links, so prefetch it (with target) to avoid queries.
+    """
     html_parts = []
-    
-    for term in terms:
-        # Try to find the word in database
-        word_obj = Words.objects.filter(word__iexact=term).first()
-        if word_obj:
-            url = reverse('single-word', kwargs={'slug': word_obj.slug})
-            html_parts.append(f'<a href="{url}" class="related-term-link">{term}</a>')
+    for link in word.related_links.all():
+        if link.target_id:
+            url = reverse('single-word', kwargs={'slug': link.target.slug})
+            html_parts.append(format_html('<a href="{}" class="related-term-link">{}</a>', url, link.term))
         else:
-            html_parts.append(f'<span class="related-term-plain">{term}</span>')
+            html_parts.append(format_html('<span class="related-term-plain">{}</span>', link.term))
     
     return mark_safe(', '.join(html_parts))
-
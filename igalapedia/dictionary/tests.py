@@ -1,3 +1,402 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.test import TestCase
+from django.urls import reverse
+
+from . import search_index
+from .reverse_lookup import reverse_lookup
+from .views import WORDS_LOOKUP_MAX_ITEMS
+from .models import (
+    Words, Meaning, Example, PartOfSpeech, PendingWord, ContributionStats, WordsVersion, LeaderboardEntry,
+    PendingExampleContribution,
+)
+
+
+class SingleWordQueryCountTests(TestCase):
+    """The single-word page must cost the same number of queries however big the entry is."""
+
+    @classmethod
+    def setUpTestData(cls):
+        noun = PartOfSpeech.objects.create(name='noun')
+        verb = PartOfSpeech.objects.create(name='verb')
+        cls.word = Words.objects.create(word='omi', related_terms='ata, unknown')
+        Words.objects.create(word='ata')
+        for i in range(10):
+            meaning = Meaning.objects.create(
+                word=cls.word,
+                meaning=f'sense {i}',
+                part_of_speech=noun if i % 2 else verb,
+            )
+            examples = [
+                Example.objects.create(igala_example=f'omi {i}-{j}', english_meaning=f'water {i}-{j}')
+                for j in range(5)
+            ]
+            meaning.examples.add(*examples)
+        cls.url = reverse('single-word', kwargs={'slug': cls.word.slug})
+
+    def setUp(self):
+        caches[settings.PAGE_CACHE_ALIAS].clear()
+
+    def test_anonymous_query_count(self):
+        # word, meanings (+ part of speech), examples, related terms (+ targets)
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'water 9-4')
+
+    def test_authenticated_query_count(self):
+        user = get_user_model().objects.create_user('reader', password='pass12345')
+        self.client.force_login(user)
+        # session, user, the four entry queries, and the example form's meaning choices
+        with self.assertNumQueries(7):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '(noun) sense 9')
+
+
+class SingleWordPageCacheTests(TestCase):
+    """Anonymous hits are served from the page cache until the word's tag is purged."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.noun = PartOfSpeech.objects.create(name='noun')
+        cls.word = Words.objects.create(word='omi')
+        cls.meaning = Meaning.objects.create(word=cls.word, meaning='water', part_of_speech=cls.noun)
+        cls.url = reverse('single-word', kwargs={'slug': cls.word.slug})
+
+    def setUp(self):
+        caches[settings.PAGE_CACHE_ALIAS].clear()
+        # First request starts tracking the tag, the second stores the page
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+    def test_hit_skips_the_database(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertContains(response, 'water')
+
+    def test_meaning_change_purges_the_page(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.meaning.meaning = 'river'
+            self.meaning.save()
+        response = self.client.get(self.url)
+        self.assertContains(response, 'river')
+
+    def test_new_example_purges_the_page(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            example = Example.objects.create(igala_example='omi gbo', english_meaning='cold water')
+            self.meaning.examples.add(example)
+        response = self.client.get(self.url)
+        self.assertContains(response, 'omi gbo')
+
+    def test_logged_in_users_bypass_the_cache(self):
+        user = get_user_model().objects.create_user('reader', password='pass12345')
+        self.client.force_login(user)
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Add Usage Example')
+
+
+class ContributionStatsTransitionTests(TestCase):
+    """Approve/reject move the counters with F() updates and agree with a full recount."""
+
+    def setUp(self):
+        User = get_user_model()
+        self.reviewer = User.objects.create_user('reviewer', password='pass12345')
+        self.user = User.objects.create_user('contributor', password='pass12345')
+        ContributionStats.objects.create(user=self.user)
+        self.submissions = [
+            PendingWord.objects.create(word=word, submitted_by=self.user)
+            for word in ('ojo', 'ile', 'ona')
+        ]
+        for submission in self.submissions:
+            ContributionStats.apply_deltas(
+                self.user,
+                contributed_at=submission.submitted_at,
+                pending_words_count=1,
+                total_submissions=1,
+            )
+
+    def counters(self):
+        stats = ContributionStats.objects.get(user=self.user)
+        return (
+            stats.approved_words_count,
+            stats.pending_words_count,
+            stats.rejected_words_count,
+            stats.total_submissions,
+        )
+
+    def test_transitions_match_recount(self):
+        Words.objects.create(word='ona')
+        self.submissions[0].approve(self.reviewer)
+        self.submissions[1].reject(self.reviewer, notes='Unclear')
+        self.submissions[2].approve(self.reviewer)  # duplicate: auto-rejected
+        self.assertEqual(self.counters(), (1, 0, 2, 3))
+
+        stats = ContributionStats.objects.get(user=self.user)
+        stats.update_stats()
+        self.assertEqual(self.counters(), (1, 0, 2, 3))
+        self.assertEqual(stats.first_contribution, self.submissions[0].submitted_at)
+        self.assertEqual(stats.last_contribution, self.submissions[2].submitted_at)
+
+    def test_bulk_rebuild_repairs_drift(self):
+        self.submissions[0].approve(self.reviewer)
+        ContributionStats.objects.filter(user=self.user).update(approved_words_count=7, pending_words_count=0)
+        self.assertEqual(ContributionStats.rebuild(), 2)
+        self.assertEqual(self.counters(), (1, 2, 0, 3))
+
+    def test_bulk_admin_approval_refreshes_leaderboard_once(self):
+        from django.contrib import admin
+        from django.test import RequestFactory
+
+        request = RequestFactory().post('/')
+        request.user = self.reviewer
+        model_admin = admin.site._registry[PendingWord]
+        with mock.patch.object(LeaderboardEntry, 'refresh') as refresh, \
+                mock.patch.object(model_admin, 'message_user'), \
+                self.captureOnCommitCallbacks(execute=True):
+            model_admin.approve_submissions(request, PendingWord.objects.all())
+        self.assertEqual(self.counters()[0], 3)
+        refresh.assert_called_once_with()
+
+    def test_first_history_for_user_without_stats_row_is_counted(self):
+        from history.models import PendingHistory
+
+        newcomer = get_user_model().objects.create_user('newcomer', password='pass12345')
+        PendingHistory.objects.create(title='Idah', submitted_by=newcomer, status='APPROVED')
+        ContributionStats.apply_deltas(newcomer, approved_histories_count=1)
+        self.assertEqual(ContributionStats.objects.get(user=newcomer).approved_histories_count, 1)
+
+    def test_first_example_for_user_without_stats_row_is_counted(self):
+        newcomer = get_user_model().objects.create_user('newcomer', password='pass12345')
+        meaning = Meaning.objects.create(
+            word=Words.objects.create(word='omi'), meaning='water',
+            part_of_speech=PartOfSpeech.objects.create(name='noun'),
+        )
+        contribution = PendingExampleContribution.objects.create(
+            meaning=meaning, igala_example='omi', english_meaning='water', submitted_by=newcomer,
+        )
+        contribution.approve(self.reviewer)
+        self.assertEqual(ContributionStats.objects.get(user=newcomer).approved_examples_count, 1)
+
+
+class WordSlugTests(TestCase):
+    """Tone variants that slugify identically get distinct slugs."""
+
+    def test_variants_get_suffixes(self):
+        slugs = [Words.objects.create(word=word).slug for word in ('ọ́kọ́', 'ọ̀kọ̀', 'oko')]
+        self.assertEqual(slugs, ['oko', 'oko-1', 'oko-2'])
+
+    def test_duplicate_word_still_raises(self):
+        from django.db import IntegrityError
+
+        Words.objects.create(word='omi')
+        with self.assertRaises(IntegrityError):
+            Words.objects.create(word='omi')
+
+
+class SearchIndexVersionTests(TestCase):
+    """Workers see every committed change to Words, patched in or rebuilt."""
+
+    def setUp(self):
+        caches['default'].clear()
+        search_index._state = search_index._WorkerIndexes()
+
+    def add_word(self, text):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Words.objects.create(word=text)
+
+    def test_bumps_are_atomic_and_visible_at_once(self):
+        self.assertEqual(search_index.get_words_version(), 0)
+        self.assertEqual([WordsVersion.bump() for _ in range(3)], [1, 2, 3])
+        # Cached by the read above; a bump after commit drops the cached copy.
+        self.assertEqual(search_index.get_words_version(), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            search_index.bump_words_version()
+        self.assertEqual(search_index.get_words_version(), 4)
+
+    def test_new_words_are_patched_into_the_index(self):
+        self.add_word('ata')
+        self.assertEqual(search_index.search_prefix('at'), [('ata', 'ata')])
+        self.add_word('atakpa')
+        with self.assertNumQueries(1):  # the version only, no rebuild
+            self.assertEqual([w for w, _ in search_index.search_prefix('at')], ['ata', 'atakpa'])
+        self.assertTrue(search_index._state.patched)
+
+    def test_approval_bumps_once(self):
+        User = get_user_model()
+        submission = PendingWord.objects.create(word='ata', submitted_by=User.objects.create_user('contributor'))
+        with self.captureOnCommitCallbacks(execute=True):
+            submission.approve(User.objects.create_user('reviewer'))
+        self.assertEqual(WordsVersion.current(), 1)
+        self.assertEqual(caches['default'].get(search_index.WORDS_CHANGE_KEY.format(1)), ('ata', 'ata'))
+
+    def test_missing_change_log_rebuilds(self):
+        self.add_word('ata')
+        search_index.search_prefix('at')
+        word = self.add_word('atakpa')
+        caches['default'].delete(search_index.WORDS_CHANGE_KEY.format(WordsVersion.current()))
+        caches['default'].delete(search_index.WORDS_VERSION_KEY)
+        self.assertEqual([w for w, _ in search_index.search_prefix('at')], ['ata', word.word])
+        self.assertFalse(search_index._state.patched)
+
+
+class FuzzyIndexTests(TestCase):
+    """Near misses within two edits find headwords, tone marks ignored, and the index follows word changes."""
+
+    def setUp(self):
+        caches['default'].clear()
+        search_index._state = search_index._WorkerIndexes()
+        for text in ('atakpa', 'ọ́kọ́', 'ẹ́gbẹ́lẹ́kọ'):
+            self.add_word(text)
+
+    def add_word(self, text):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Words.objects.create(word=text)
+
+    def nearest(self, term):
+        return [(word, distance) for word, _slug, distance in search_index.search_fuzzy(term)]
+
+    def test_matches_within_two_edits(self):
+        self.assertEqual(self.nearest('atakpa'), [('atakpa', 0)])
+        self.assertEqual(self.nearest('atapka'), [('atakpa', 2)])
+        self.assertEqual(self.nearest('takpa'), [('atakpa', 1)])
+        self.assertEqual(self.nearest('tapka'), [])
+
+    def test_typo_past_the_indexed_prefix(self):
+        self.assertEqual(self.nearest('egbelekko'), [('ẹ́gbẹ́lẹ́kọ', 1)])
+
+    def test_tone_marks_are_ignored(self):
+        self.assertEqual(self.nearest('Oko'), [('ọ́kọ́', 0)])
+        self.assertEqual(self.nearest('okọ'), [('ọ́kọ́', 0)])
+
+    def test_follows_added_and_deleted_words(self):
+        self.assertEqual(self.nearest('ile'), [])
+        self.add_word('ilẹ')
+        self.assertEqual(self.nearest('ile'), [('ilẹ', 0)])
+        self.assertTrue(search_index._state.patched)
+        with self.captureOnCommitCallbacks(execute=True):
+            Words.objects.get(word='atakpa').delete()
+        self.assertEqual(self.nearest('atakpa'), [])
+        self.assertEqual(self.nearest('ile'), [('ilẹ', 0)])
+
+
+class RelatedTermResolutionTests(TestCase):
+    """A related term saved before its word exists links to that word once it is approved."""
+
+    def setUp(self):
+        caches[settings.PAGE_CACHE_ALIAS].clear()
+        self.word = Words.objects.create(word='omi', related_terms='Ọkọ, ile')
+        self.url = reverse('single-word', kwargs={'slug': self.word.slug})
+
+    def test_dangling_term_links_once_its_word_is_approved(self):
+        self.assertEqual(
+            list(self.word.related_links.values_list('term', 'target')),
+            [('Ọkọ', None), ('ile', None)],
+        )
+        # Cache the page with the term still unlinked.
+        self.client.get(self.url)
+        self.assertContains(self.client.get(self.url), '<span class="related-term-plain">Ọkọ</span>', html=True)
+
+        User = get_user_model()
+        submission = PendingWord.objects.create(word='ọkọ', submitted_by=User.objects.create_user('contributor'))
+        with self.captureOnCommitCallbacks(execute=True):
+            submission.approve(User.objects.create_user('reviewer'))
+        oko = Words.objects.get(word='ọkọ')
+
+        link = self.word.related_links.get(term='Ọkọ')
+        self.assertEqual(link.target, oko)
+        self.assertIsNone(self.word.related_links.get(term='ile').target)
+        self.assertContains(
+            self.client.get(self.url),
+            f'<a href="{reverse("single-word", kwargs={"slug": oko.slug})}" class="related-term-link">Ọkọ</a>',
+            html=True,
+        )
+
+
+class WordsLookupApiTests(TestCase):
+    """A batch of words and slugs resolves with one query, reporting hits, tone variants and misses."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.omi = Words.objects.create(word='omi')
+        cls.oko = Words.objects.create(word='ọ́kọ́')
+        cls.url = reverse('words_lookup_api')
+
+    def test_mixed_batch_in_one_query(self):
+        payload = {'words': ['Omi', 'oko', 'ile', ' '], 'slugs': [self.oko.slug, 'missing']}
+        with self.assertNumQueries(1):
+            response = self.client.post(self.url, payload, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        omi_url = reverse('single-word', kwargs={'slug': 'omi'})
+        oko_url = reverse('single-word', kwargs={'slug': self.oko.slug})
+        self.assertEqual(response.json(), {
+            'words': [
+                {'query': 'Omi', 'exists': True, 'word': 'omi', 'slug': 'omi', 'word_url': omi_url},
+                {'query': 'oko', 'exists': False,
+                 'similar': {'word': 'ọ́kọ́', 'slug': self.oko.slug, 'word_url': oko_url}},
+                {'query': 'ile', 'exists': False},
+            ],
+            'slugs': [
+                {'query': self.oko.slug, 'exists': True, 'word': 'ọ́kọ́', 'slug': self.oko.slug, 'word_url': oko_url},
+                {'query': 'missing', 'exists': False},
+            ],
+        })
+
+    def test_get_parameters(self):
+        response = self.client.get(self.url, {'word': ['omi', 'ile'], 'slug': 'omi'})
+        self.assertEqual([r['exists'] for r in response.json()['words']], [True, False])
+        self.assertTrue(response.json()['slugs'][0]['exists'])
+
+    def test_batch_size_is_limited(self):
+        words = [f'w{i}' for i in range(WORDS_LOOKUP_MAX_ITEMS)]
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url, {'words': words, 'slugs': ['one-too-many']}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(self.url, {'words': words}, content_type='application/json')
+        self.assertEqual(len(response.json()['words']), WORDS_LOOKUP_MAX_ITEMS)
+
+    def test_malformed_body_is_rejected(self):
+        for body in ('not json', '[]', '{"words": "omi"}'):
+            response = self.client.post(self.url, body, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+
+
+class ReverseLookupTests(TestCase):
+    """English terms find headwords through the full-text index, which follows meaning edits."""
+
+    @classmethod
+    def setUpTestData(cls):
+        noun = PartOfSpeech.objects.create(name='noun')
+        cls.water = Meaning.objects.create(word=Words.objects.create(word='omi'), meaning='water', part_of_speech=noun)
+        cls.house = Meaning.objects.create(word=Words.objects.create(word='ụnyị'), meaning='house, home', part_of_speech=noun)
+        cls.house.examples.add(Example.objects.create(igala_example='Ụnyị ọma', english_meaning='a water jar in the house'))
+
+    def words(self, term):
+        return [result['word'] for result in reverse_lookup(term)]
+
+    def test_finds_word_by_meaning_term(self):
+        results = reverse_lookup('water')
+        self.assertEqual(results[0], {
+            'meaning_id': self.water.pk, 'word': 'omi', 'slug': 'omi',
+            'part_of_speech': 'noun', 'meaning': 'water',
+        })
+        # Matched only through an example, so ranked below the sense itself.
+        self.assertEqual([r['word'] for r in results], ['omi', 'ụnyị'])
+
+    def test_last_token_matches_as_prefix(self):
+        self.assertEqual(self.words('hou'), ['ụnyị'])
+        self.assertEqual(self.words(''), [])
+
+    def test_follows_meaning_edits_and_deletes(self):
+        self.water.meaning = 'river'
+        self.water.save()
+        self.assertEqual(self.words('river'), ['omi'])
+        self.assertEqual(self.words('water'), ['ụnyị'])
+        Example.objects.filter(english_meaning__contains='water').delete()
+        self.assertEqual(self.words('water'), [])
+        self.water.delete()
+        self.assertEqual(self.words('river'), [])
 
-# Create your tests here.
@@ -4,9 +4,11 @@ from . import views
 urlpatterns = [
     path('', views.all_words, name='words'),
     path('api/search/', views.dictionary_search_api, name='dictionary_search_api'),
+    path('api/reverse/', views.dictionary_reverse_api, name='dictionary_reverse_api'),
     path('single-word/<slug:slug>/', views.singleword, name='single-word'),
     path('leaderboard/', views.leaderboard, name='leaderboard'),
     path('submit/', views.submit_word, name='submit_word'),
     path('my-contributions/', views.my_contributions, name='my_contributions'),
     path('word-exists/', views.word_exists, name='word_exists'),
+    path('api/words/lookup/', views.words_lookup_api, name='words_lookup_api'),
 ]
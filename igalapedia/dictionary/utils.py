@@ -0,0 +1,22 @@
+import unicodedata
+
+
+def normalize_word(text):
+    """
+    Tone- and diacritic-insensitive lookup key for an Igala headword.
+
+    NFC-normalizes, casefolds and strips combining marks (tone accents and
+    dots under vowels), so "Ọ́kọ", "ọkọ" and "OKO" all map to "oko".
+    """
+    text = unicodedata.normalize('NFC', (text or '').strip()).casefold()
+    decomposed = unicodedata.normalize('NFD', text)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(unicodedata.normalize('NFC', stripped).split())
+
+
+def same_spelling(a, b):
+    """True if two spellings differ only by case (tone marks still count)."""
+    return (
+        unicodedata.normalize('NFC', (a or '').strip()).casefold()
+        == unicodedata.normalize('NFC', (b or '').strip()).casefold()
+    )
@@ -1,49 +1,101 @@
+import hashlib
+import json
+
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db import transaction
 from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
 from django.urls import reverse
-from .models import Words, PendingWord, PendingMeaning, PendingExample, PendingExampleContribution, ContributionStats
+from .models import Words, Meaning, RelatedTerm, LeaderboardEntry, PendingWord, PendingMeaning, PendingExample, PendingExampleContribution, ContributionStats
 from .filters import WordsFilters
+from .search_index import search_prefix, search_fuzzy, get_words_version
+from .reverse_lookup import reverse_lookup
+from .utils import normalize_word, same_spelling
 from .forms import WordSubmissionForm, MeaningFormSet, ExampleInlineFormSet, ExampleContributionForm
-from main.utils import paginate_queryset, get_filtered_queryset, get_object_or_404
-from django.contrib.auth import get_user_model
-from django.db.models import Count
+from main.utils import get_filtered_queryset, get_object_or_404, keyset_paginate, get_cached_count
+from main.page_cache import tag_page
+from django.core.paginator import Paginator
+from django.db.models import Count, Prefetch, Q
 
 
 def all_words(request):
-    # Get all words ordered by word
-    words = Words.objects.all().order_by('word')
+    # Keyset pagination on the word sort key: no OFFSET scan and no per-request COUNT
+    words = Words.objects.only('word', 'slug', 'lookup_key')
     filtered_words, word_filter = get_filtered_queryset(words, WordsFilters, request)
     
     # Paginate results
-    page_number = request.GET.get('page')
-    current_page_holder = paginate_queryset(filtered_words, 50, page_number)
+    cursor = request.GET.get('cursor')
+    current_page_holder = keyset_paginate(filtered_words, ['lookup_key', 'id'], 50, cursor)
+    
+    word_query = (request.GET.get('word') or '').strip()
+    filter_hash = hashlib.md5(normalize_word(word_query).encode()).hexdigest()
+    total_count = get_cached_count(
+        f'dictionary:word_count:{get_words_version()}:{filter_hash}',
+        filtered_words,
+        timeout=60 * 60,
+    )
     
     context = {
         'words': current_page_holder,
         'word_filter': word_filter,
-        'current_page_holder': current_page_holder
+        'current_page_holder': current_page_holder,
+        'total_count': total_count,
+        'word_query': word_query,
     }
     
     return render(request, "dictionary/dictionary.html", context)
 
 
 def dictionary_search_api(request):
-    """JSON API for live search: words starting with q (prefix match), cap at 50."""
+    """
+    JSON API for live search: words starting with q (prefix match), cap at 50.
+    Served from the in-memory prefix index; no database query per keystroke.
+    When nothing starts with q, "suggestions" lists the nearest headwords
+    within two typos.
+    """
     q = (request.GET.get('q') or '').strip()
     if not q:
         return JsonResponse({'words': []})
-    words = Words.objects.filter(word__istartswith=q).order_by('word')[:50]
-    return JsonResponse({
-        'words': [{'word': w.word, 'slug': w.slug} for w in words]
-    })
+    matches = search_prefix(q, limit=50)
+    data = {'words': [{'word': word, 'slug': slug} for word, slug in matches]}
+    if not matches:
+        data['suggestions'] = _fuzzy_suggestions(q)
+    return JsonResponse(data)
+
+
+def _fuzzy_suggestions(q, limit=5):
+    return [
+        {'word': word, 'slug': slug, 'distance': distance}
+        for word, slug, distance in search_fuzzy(q, limit=limit)
+    ]
+
+
+def dictionary_reverse_api(request):
+    """JSON API for English -> Igala lookup: ranked senses whose meaning or examples match q."""
+    q = (request.GET.get('q') or '').strip()
+    if not q:
+        return JsonResponse({'results': []})
+    results = reverse_lookup(q, limit=20)
+    for result in results:
+        result['url'] = reverse('single-word', kwargs={'slug': result['slug']})
+    return JsonResponse({'results': results})
 
 
 def singleword(request, slug):
-    word = get_object_or_404(Words, slug=slug)
+    # Load the whole entry in a constant number of queries, however many senses/examples
+    meanings = Meaning.objects.select_related('part_of_speech').prefetch_related('examples').order_by('id')
+    word = get_object_or_404(
+        Words.objects.prefetch_related(
+            Prefetch('meanings', queryset=meanings),
+            Prefetch('related_links', queryset=RelatedTerm.objects.select_related('target')),
+        ),
+        slug=slug
+    )
     example_form = None
+    tag_page(request, f'word:{word.id}')
     
     # Only show example contribution form to logged-in users
     if request.user.is_authenticated:
@@ -77,28 +129,21 @@ def singleword(request, slug):
 
 
 def leaderboard(request):
-    User = get_user_model()
-    contributors_data = []
-    pending_words = PendingWord.objects.select_related('submitted_by').all()
-    user_ids = set(pending_words.values_list('submitted_by_id', flat=True))
-    
-    for user_id in user_ids:
-        user = User.objects.get(id=user_id)
-        stats, created = ContributionStats.objects.get_or_create(user=user)
-        if created or stats.total_submissions == 0:
-            stats.update_stats()
-        
-        if stats.approved_words_count > 0:  # Only show Users with approved contributions
-            contributors_data.append({
-                'user': user,
-                'word_count': stats.approved_words_count,
-                'pending_count': stats.pending_words_count,
-                'total_submissions': stats.total_submissions
-            })
-    
-    # Sort by approved word count bb85c26eac1fb94fdd4e8dc885063783
-    contributors_data.sort(key=lambda x: x['word_count'], reverse=True)
-    context = {'contributors': contributors_data}
+    """Ranked contributors for a period, read from the materialized LeaderboardEntry snapshot."""
+    period = request.GET.get('period', 'all')
+    if period not in LeaderboardEntry.PERIOD_DAYS:
+        period = 'all'
+    entries = LeaderboardEntry.objects.filter(period=period).only(
+        'rank', 'display_name', 'word_count', 'refreshed_at'
+    )
+    paginator = Paginator(entries, 50)
+    page_obj = paginator.get_page(request.GET.get('page', 1))
+    context = {
+        'contributors': page_obj,
+        'page_obj': page_obj,
+        'period': period,
+        'periods': LeaderboardEntry.PERIOD_CHOICES,
+    }
     return render(request, 'dictionary/leaderboard.html', context)
 
 
@@ -148,8 +193,12 @@ def submit_word(request):
                         )
                     
                     # Update user stats
-                    stats, created = ContributionStats.objects.get_or_create(user=request.user)
-                    stats.update_stats()
+                    ContributionStats.apply_deltas(
+                        request.user,
+                        contributed_at=pending_word.submitted_at,
+                        pending_words_count=1,
+                        total_submissions=1,
+                    )
                     
                     messages.success(
                         request,
@@ -245,20 +294,107 @@ def word_exists(request):
     """
     JSON endpoint to check if a word already exists in the approved dictionary.
     Returns: { "exists": true/false, "word_url": string|null }
+    When only a tone/diacritic variant exists, "exists" is false and the
+    variant is returned under "similar" so the form can point to it.
+    Otherwise "suggestions" lists near-miss spellings (edit distance <= 2).
     """
     word = request.GET.get('word', '').strip()
     
     if not word:
         return JsonResponse({'exists': False, 'word_url': None})
     
-    existing = Words.objects.filter(word__iexact=word).first()
+    existing = Words.lookup(word)
     
     if existing:
         word_url = reverse('single-word', kwargs={'slug': existing.slug})
+        if same_spelling(existing.word, word):
+            return JsonResponse({
+                'exists': True,
+                'word_url': word_url,
+                'word': existing.word,
+            })
         return JsonResponse({
-            'exists': True,
-            'word_url': word_url,
-            'word': existing.word,
+            'exists': False,
+            'word_url': None,
+            'similar': {'word': existing.word, 'word_url': word_url},
         })
     
-    return JsonResponse({'exists': False, 'word_url': None})
+    suggestions = _fuzzy_suggestions(word)
+    for suggestion in suggestions:
+        suggestion['word_url'] = reverse('single-word', kwargs={'slug': suggestion['slug']})
+    return JsonResponse({'exists': False, 'word_url': None, 'suggestions': suggestions})
+
+
+WORDS_LOOKUP_MAX_ITEMS = 300
+
+
+@csrf_exempt
+@require_http_methods(['GET', 'POST'])
+def words_lookup_api(request):
+    """
+    Batch version of word_exists for up to 300 words and/or slugs.
+    GET ?word=a&word=b&slug=c, or POST JSON {"words": [...], "slugs": [...]}.
+    Everything is resolved with a single IN query on the indexed lookup key and slug.
+    Returns: { "words": [{query, exists, word, slug, word_url[, similar]}], "slugs": [...] }
+    """
+    if request.method == 'POST':
+        try:
+            payload = json.loads(request.body or b'{}')
+        except ValueError:
+            return JsonResponse({'error': 'Request body must be JSON.'}, status=400)
+        if not isinstance(payload, dict):
+            return JsonResponse({'error': 'Request body must be a JSON object.'}, status=400)
+        words = payload.get('words') or []
+        slugs = payload.get('slugs') or []
+    else:
+        words = request.GET.getlist('word')
+        slugs = request.GET.getlist('slug')
+
+    if not isinstance(words, list) or not isinstance(slugs, list):
+        return JsonResponse({'error': '"words" and "slugs" must be lists.'}, status=400)
+    words = [w.strip() for w in words if isinstance(w, str) and w.strip()]
+    slugs = [s.strip() for s in slugs if isinstance(s, str) and s.strip()]
+    if len(words) + len(slugs) > WORDS_LOOKUP_MAX_ITEMS:
+        return JsonResponse(
+            {'error': f'At most {WORDS_LOOKUP_MAX_ITEMS} words and slugs per request.'},
+            status=400,
+        )
+
+    keys = {normalize_word(w) for w in words} - {''}
+    by_key = {}
+    by_slug = {}
+    if keys or slugs:
+        matches = Words.objects.filter(
+            Q(lookup_key__in=keys) | Q(slug__in=slugs)
+        ).only('word', 'slug', 'lookup_key').order_by('id')
+        for match in matches:
+            by_key.setdefault(match.lookup_key, []).append(match)
+            by_slug[match.slug] = match
+
+    def describe(match):
+        return {
+            'word': match.word,
+            'slug': match.slug,
+            'word_url': reverse('single-word', kwargs={'slug': match.slug}),
+        }
+
+    word_results = []
+    for w in words:
+        candidates = by_key.get(normalize_word(w), [])
+        exact = next((c for c in candidates if same_spelling(c.word, w)), None)
+        if exact:
+            word_results.append({'query': w, 'exists': True, **describe(exact)})
+        elif candidates:
+            word_results.append({'query': w, 'exists': False, 'similar': describe(candidates[0])})
+        else:
+            word_results.append({'query': w, 'exists': False})
+
+    slug_results = []
+    for slug in slugs:
+        match = by_slug.get(slug)
+        if match:
+            slug_results.append({'query': slug, 'exists': True, **describe(match)})
+        else:
+            slug_results.append({'query': slug, 'exists': False})
+
+    return JsonResponse({'words': word_results, 'slugs': slug_results})
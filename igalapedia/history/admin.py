@@ -5,6 +5,7 @@ from django.urls import reverse
 from django.utils.html import format_html
 from .models import PendingHistory, HistoryArticle, ArticleView
 from dictionary.models import ContributionStats
+from main.models import VisitorSketch
 
 
 @admin.register(HistoryArticle)
@@ -12,13 +13,22 @@ class HistoryArticleAdmin(admin.ModelAdmin):
     list_display = ['title', 'contributor', 'published_at']
     list_filter = ['published_at']
     search_fields = ['title', 'excerpt']
-    readonly_fields = ['slug', 'published_at', 'updated_at']
+    readonly_fields = ['slug', 'published_at', 'updated_at', 'view_count', 'visitors_last_7_days', 'visitors_all_time']
+
+    @admin.display(description='Unique visitors (7 days)')
+    def visitors_last_7_days(self, obj):
+        return VisitorSketch.unique_visitors('history', obj.pk, days=7) if obj.pk else 0
+
+    @admin.display(description='Unique visitors (all time)')
+    def visitors_all_time(self, obj):
+        return VisitorSketch.unique_visitors('history', obj.pk) if obj.pk else 0
 
 
 @admin.register(ArticleView)
 class ArticleViewAdmin(admin.ModelAdmin):
     list_display = ('article', 'ip_hash', 'viewed_date')
     list_filter = ('viewed_date',)
+    list_select_related = ('article',)
     readonly_fields = ('article', 'ip_hash', 'viewed_date')
 
 
@@ -69,9 +79,7 @@ class PendingHistoryAdmin(admin.ModelAdmin):
                 sub.approved_article = article
                 sub.save()
 
-                stats, _ = ContributionStats.objects.get_or_create(user=sub.submitted_by)
-                stats.approved_histories_count = (stats.approved_histories_count or 0) + 1
-                stats.save()
+                ContributionStats.apply_deltas(sub.submitted_by, approved_histories_count=1)
 
                 approved_count += 1
             except Exception as e:
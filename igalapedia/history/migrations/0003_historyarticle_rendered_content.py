@@ -0,0 +1,62 @@
+# Generated by Django 5.0.3 on 2026-10-18 18:42
+
+from django.db import migrations, models
+
+from core.richtext import render_rich_text, make_excerpt
+
+
+def render_contents(apps, schema_editor):
+    HistoryArticle = apps.get_model('history', 'HistoryArticle')
+    articles = []
+    fields = ('id', 'excerpt', 'content_english', 'content_igala')
+    for article in HistoryArticle.objects.only(*fields).iterator(chunk_size=200):
+        english = render_rich_text(article.content_english)
+        igala = render_rich_text(article.content_igala)
+        main = english if english.word_count else igala
+        article.content_english_html = english.html
+        article.content_igala_html = igala.html
+        article.word_count = main.word_count
+        article.reading_time = main.reading_time
+        article.summary = (article.excerpt or '').strip()[:300] or make_excerpt(main.text)
+        articles.append(article)
+    HistoryArticle.objects.bulk_update(
+        articles,
+        ['content_english_html', 'content_igala_html', 'summary', 'word_count', 'reading_time'],
+        batch_size=200,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('history', '0002_articleview_articleview_unique_article_view_per_day'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historyarticle',
+            name='content_english_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='historyarticle',
+            name='content_igala_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='historyarticle',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Minutes'),
+        ),
+        migrations.AddField(
+            model_name='historyarticle',
+            name='summary',
+            field=models.CharField(blank=True, editable=False, help_text='Excerpt, or the start of the text when none was given', max_length=300),
+        ),
+        migrations.AddField(
+            model_name='historyarticle',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(render_contents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.3 on 2026-10-18 18:51
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_article_views(apps, schema_editor):
+    HistoryArticle = apps.get_model('history', 'HistoryArticle')
+    ArticleView = apps.get_model('history', 'ArticleView')
+    views = (
+        ArticleView.objects.filter(article=OuterRef('pk'))
+        .values('article').annotate(n=Count('id')).values('n')
+    )
+    HistoryArticle.objects.update(view_count=Coalesce(Subquery(views), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('history', '0003_historyarticle_rendered_content'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historyarticle',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='historyarticle',
+            index=models.Index(fields=['-published_at'], name='historyarticle_published_idx'),
+        ),
+        migrations.RunPython(count_article_views, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,11 @@
 from django.db import models, transaction
 from django.conf import settings
-from django.utils.text import slugify
 from django.utils import timezone
 from ckeditor.fields import RichTextField
 
+from core.richtext import render_rich_text, make_excerpt
+from core.slugs import save_with_unique_slug
+
 
 class PendingHistory(models.Model):
     """User-submitted history article awaiting admin approval."""
@@ -66,6 +68,12 @@ class HistoryArticle(models.Model):
     thumbnail = models.ImageField(upload_to='history_thumbnails/', blank=True, null=True)
     content_english = RichTextField(blank=True)
     content_igala = RichTextField(blank=True)
+    # Derived from the content fields on save (core.richtext); read paths use these.
+    content_english_html = models.TextField(blank=True, editable=False)
+    content_igala_html = models.TextField(blank=True, editable=False)
+    summary = models.CharField(max_length=300, blank=True, editable=False, help_text="Excerpt, or the start of the text when none was given")
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False, help_text="Minutes")
     audio_english = models.FileField(upload_to='history_audio/', blank=True, null=True)
     audio_igala = models.FileField(upload_to='history_audio/', blank=True, null=True)
 
@@ -78,22 +86,51 @@ class HistoryArticle(models.Model):
     )
     published_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Unique visitors per day, summed; maintained by main.view_tracking.
+    view_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Large text columns that list pages never need.
+    CONTENT_FIELDS = ('content_english', 'content_igala', 'content_english_html', 'content_igala_html')
+    RENDERED_FIELDS = ('content_english_html', 'content_igala_html', 'summary', 'word_count', 'reading_time')
+    # Moved with F() elsewhere; a full save must not write back a stale copy.
+    COUNTER_FIELDS = ('view_count',)
 
     class Meta:
         verbose_name = 'History Article'
         verbose_name_plural = 'History Articles'
         ordering = ['-published_at']
+        indexes = [
+            models.Index(fields=['-published_at'], name='historyarticle_published_idx'),
+        ]
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base = slugify(self.title)
-            slug = base
-            i = 1
-            while HistoryArticle.objects.filter(slug=slug).exists():
-                slug = f"{base}-{i}"
-                i += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding:
+            skip = {*self.COUNTER_FIELDS, *self.get_deferred_fields()}
+            update_fields = kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skip
+            ]
+        if update_fields is None or {'content_english', 'content_igala', 'excerpt'} & set(update_fields):
+            self.render_content()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *self.RENDERED_FIELDS}
+        save_with_unique_slug(self, self.title, super().save, *args, fallback='article', **kwargs)
+
+    def render_content(self):
+        """
+        Refresh the sanitized HTML of both versions. Word count and reading time
+        follow the English text (the Igala one when there is no English), and
+        the summary falls back to the start of that text when excerpt is blank.
+        """
+        english = render_rich_text(self.content_english)
+        igala = render_rich_text(self.content_igala)
+        main = english if english.word_count else igala
+        self.content_english_html = english.html
+        self.content_igala_html = igala.html
+        self.word_count = main.word_count
+        self.reading_time = main.reading_time
+        self.summary = (self.excerpt or '').strip()[:300] or make_excerpt(main.text)
 
     def __str__(self):
         return self.title
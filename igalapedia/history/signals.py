@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from main.page_cache import purge_tags
+from .models import HistoryArticle
+
+
+@receiver(post_save, sender=HistoryArticle)
+@receiver(post_delete, sender=HistoryArticle)
+def history_article_purge_pages(sender, instance, raw=False, **kwargs):
+    """Approval, edits and deletes change the article page, the feed and the home page count."""
+    if not raw:
+        purge_tags(f'history:{instance.id}', 'feed', 'site-counters')
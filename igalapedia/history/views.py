@@ -2,17 +2,19 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Count
-from django.utils import timezone
 
-from main.utils import get_client_ip_hash
-from .models import HistoryArticle, PendingHistory, ArticleView
+from main.page_cache import tag_page
+from main.view_tracking import record_view
+from .models import HistoryArticle, PendingHistory
 from .forms import HistorySubmissionForm
 
 
 def history_list(request):
     """List all published history articles in a clean card grid."""
-    articles = HistoryArticle.objects.all().order_by('-published_at').annotate(view_count=Count('view_records'))
+    articles = (
+        HistoryArticle.objects.defer(*HistoryArticle.CONTENT_FIELDS)
+        .order_by('-published_at')
+    )
     paginator = Paginator(articles, 12)
     page = request.GET.get('page', 1)
     page_obj = paginator.get_page(page)
@@ -25,13 +27,19 @@ def history_list(request):
     return render(request, 'history/history_list.html', context)
 
 
+def record_article_view(request, article_id):
+    """Count a unique visitor per day (buffered); also run for page-cache hits."""
+    record_view('history', article_id, request)
+
+
 def history_detail(request, slug):
     """Detail page with English/Igala toggle and audio per version."""
-    article = get_object_or_404(HistoryArticle.objects.annotate(view_count=Count('view_records')), slug=slug)
-    ip_hash = get_client_ip_hash(request)
-    if ip_hash:
-        today = timezone.localdate()
-        ArticleView.objects.get_or_create(article=article, ip_hash=ip_hash, viewed_date=today)
+    article = get_object_or_404(
+        HistoryArticle.objects.defer('content_english', 'content_igala'),
+        slug=slug,
+    )
+    record_article_view(request, article.id)
+    tag_page(request, f'history:{article.id}', on_hit=('history.views.record_article_view', (article.id,)))
 
     context = {
         'article': article,
@@ -61,6 +61,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'main.page_cache.AnonymousPageCacheMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -156,6 +157,43 @@ DATABASES = {
 """
 
 
+# Cache
+# Shared by all gunicorn workers on the instance, so version counters and
+# invalidations bumped in one worker are seen by the others.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION', '/tmp/igalapedia-cache'),
+    },
+    # Rendered pages for anonymous visitors (main.page_cache); kept apart so
+    # page churn never culls the counters above.
+    'pages': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(os.environ.get('CACHE_LOCATION', '/tmp/igalapedia-cache'), 'pages'),
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+    # {% cache ... using="fragments" %} blocks (blog post bodies and comment
+    # threads); their keys carry a version, so stale entries simply age out.
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(os.environ.get('CACHE_LOCATION', '/tmp/igalapedia-cache'), 'fragments'),
+        'KEY_PREFIX': os.environ.get('RENDER_GIT_COMMIT', '')[:12],
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+
+PAGE_CACHE_ALIAS = 'pages'
+# Templates change on deploy, so pages rendered by an older release are not reused.
+PAGE_CACHE_KEY_PREFIX = os.environ.get('RENDER_GIT_COMMIT', '')[:12]
+
+# Blog/history page views are buffered per process and written in bulk
+# (main.view_tracking): every VIEW_FLUSH_INTERVAL seconds, or sooner once
+# VIEW_BUFFER_SIZE views are waiting.
+VIEW_FLUSH_INTERVAL = int(os.environ.get('VIEW_FLUSH_INTERVAL', '30'))
+VIEW_BUFFER_SIZE = 500
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from . models import Community, Pioneer
+from . models import Community, Pioneer, DailyViews
 
 # Register your models here.
 admin.site.register(Community)
@@ -24,4 +24,12 @@ class PioneerAdmin(admin.ModelAdmin):
     
     def has_image(self, obj):
         return "✅" if obj.profile_image else "❌"
-    has_image.short_description = "Image"
\ No newline at end of file
+    has_image.short_description = "Image"
+
+
+@admin.register(DailyViews)
+class DailyViewsAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'object_id', 'day', 'unique_views')
+    list_filter = ('kind',)
+    date_hierarchy = 'day'
+    readonly_fields = ('kind', 'object_id', 'day', 'unique_views')
@@ -1,70 +1,166 @@
 """
 Feed aggregation: unified items from Words, HistoryArticle, and BlogPost for the discovery feed.
+
+The feed is read from the denormalized FeedItem table, newest first by
+(date, id). main.signals upserts a row whenever a source object is saved and
+removes it when the object is deleted or stops being public; the
+rebuild_feed command recreates the whole table from the sources.
 """
-import re
-from django.utils import timezone
+from datetime import datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q, OuterRef, Subquery
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
+from .utils import encode_cursor, decode_cursor, get_cached_count
 
-def get_feed_items(offset=0, limit=12):
-    """
-    Return a list of feed items (dicts) from Words, HistoryArticle, and BlogPost,
-    merged and sorted by date descending, then sliced by offset/limit.
-    Each item: title, excerpt, thumbnail_url, url, type, date (for sorting).
-    """
-    from dictionary.models import Words
+
+FEED_COUNT_KEY = 'feed:count'
+
+# Words saved before created_at existed sort after everything dated.
+UNDATED_WORD_DATE = timezone.make_aware(datetime(2000, 1, 1))
+
+def blog_feed_fields(post):
+    """FeedItem fields for a blog post, or None if it is not public."""
+    if post.status != 'published' or post.is_hidden:
+        return None
+    return {
+        'title': post.title,
+        'excerpt': post.excerpt or 'Read more...',
+        'thumbnail_url': post.cover_image.url if post.cover_image else '',
+        'url': reverse('blog:blog_detail', kwargs={'slug': post.slug}),
+        'date': post.published_at or post.created_at,
+    }
+
+
+def history_feed_fields(article):
+    """FeedItem fields for a history article."""
+    return {
+        'title': article.title,
+        'excerpt': article.summary or 'Read more...',
+        'thumbnail_url': article.thumbnail.url if article.thumbnail else '',
+        'url': reverse('history_detail', kwargs={'slug': article.slug}),
+        'date': article.published_at,
+    }
+
+
+def word_feed_fields(word, first_meaning=None):
+    """FeedItem fields for a dictionary word; first_meaning is looked up when not given."""
+    if first_meaning is None:
+        first_meaning = word.meanings.order_by('id').values_list('meaning', flat=True).first()
+    return {
+        'title': word.word,
+        'excerpt': (first_meaning or f'Igala word: {word.word}')[:300],
+        'thumbnail_url': '',
+        'url': reverse('single-word', kwargs={'slug': word.slug}),
+        'date': word.created_at or UNDATED_WORD_DATE,
+    }
+
+
+FEED_FIELDS = {
+    'blog': blog_feed_fields,
+    'history': history_feed_fields,
+    'word': word_feed_fields,
+}
+
+
+def _invalidate_feed_count():
+    transaction.on_commit(lambda: cache.delete(FEED_COUNT_KEY))
+
+
+def sync_feed_item(item_type, obj):
+    """Insert, update or remove the FeedItem for a saved source object."""
+    from .models import FeedItem
+
+    fields = FEED_FIELDS[item_type](obj)
+    if fields is None:
+        remove_feed_item(item_type, obj.pk)
+        return
+    _, created = FeedItem.objects.update_or_create(item_type=item_type, object_id=obj.pk, defaults=fields)
+    if created:
+        _invalidate_feed_count()
+
+
+def remove_feed_item(item_type, object_id):
+    """Drop the FeedItem for a deleted (or no longer public) source object."""
+    from .models import FeedItem
+
+    deleted, _ = FeedItem.objects.filter(item_type=item_type, object_id=object_id).delete()
+    if deleted:
+        _invalidate_feed_count()
+
+
+def iter_feed_items():
+    """Unsaved FeedItem instances for every public source object (used by rebuild_feed)."""
+    from dictionary.models import Words, Meaning
     from history.models import HistoryArticle
     from blog.models import BlogPost
+    from .models import FeedItem
+
+    posts = BlogPost.objects.filter(status='published', is_hidden=False).defer('body', 'body_html')
+    for post in posts.iterator(chunk_size=500):
+        yield FeedItem(item_type='blog', object_id=post.pk, **blog_feed_fields(post))
+    articles = HistoryArticle.objects.defer(*HistoryArticle.CONTENT_FIELDS)
+    for article in articles.iterator(chunk_size=500):
+        yield FeedItem(item_type='history', object_id=article.pk, **history_feed_fields(article))
+    first_meaning = Meaning.objects.filter(word=OuterRef('pk')).order_by('id').values('meaning')[:1]
+    words = Words.objects.annotate(first_meaning=Subquery(first_meaning))
+    for word in words.iterator(chunk_size=2000):
+        yield FeedItem(item_type='word', object_id=word.pk, **word_feed_fields(word, word.first_meaning or ''))
+
+
+def _parse_feed_cursor(token):
+    data = decode_cursor(token)
+    if not isinstance(data, dict):
+        return None
+    date = parse_datetime(data.get('d') or '')
+    pk = data.get('i')
+    if date is None or not isinstance(pk, int):
+        return None
+    if timezone.is_naive(date):
+        date = timezone.make_aware(date)
+    return date, pk
+
+
+def get_feed_total():
+    """Number of items in the feed, cached until an item is added or removed."""
+    from .models import FeedItem
+
+    return get_cached_count(FEED_COUNT_KEY, FeedItem.objects.all())
+
+
+def get_feed_items(cursor=None, limit=12):
+    """
+    Return (items, next_cursor, total) for the page after `cursor` (None for the first page).
+    Each item: title, excerpt, thumbnail_url, url, type, date.
+    next_cursor is an opaque token for the following page, or None at the end.
+    """
+    from .models import FeedItem
+
+    qs = FeedItem.objects.values('id', 'item_type', 'title', 'excerpt', 'thumbnail_url', 'url', 'date')
+    position = _parse_feed_cursor(cursor)
+    if position:
+        date, pk = position
+        qs = qs.filter(Q(date__lt=date) | Q(date=date, id__lt=pk))
+    rows = list(qs.order_by('-date', '-id')[:limit + 1])
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor({'d': rows[-1]['date'].isoformat(), 'i': rows[-1]['id']})
 
-    items = []
-
-    # Blog posts (published only)
-    for post in BlogPost.objects.filter(status='published', is_hidden=False).select_related('author').order_by('-published_at', '-created_at'):
-        date_val = post.published_at or post.created_at
-        excerpt = (post.body[:300] if post.body else '') or 'Read more...'
-        excerpt = re.sub(r'<[^>]+>', '', excerpt)[:300]
-        items.append({
-            'title': post.title,
-            'excerpt': excerpt or 'Read more...',
-            'thumbnail_url': post.cover_image.url if post.cover_image else None,
-            'url': reverse('blog:blog_detail', kwargs={'slug': post.slug}),
-            'type': 'blog',
-            'date': date_val,
-        })
-
-    # History articles
-    for art in HistoryArticle.objects.all().order_by('-published_at').select_related('contributor'):
-        items.append({
-            'title': art.title,
-            'excerpt': (art.excerpt or '').strip() or 'Read more...',
-            'thumbnail_url': art.thumbnail.url if art.thumbnail else None,
-            'url': reverse('history_detail', kwargs={'slug': art.slug}),
-            'type': 'history',
-            'date': art.published_at,
-        })
-
-    # Dictionary words (use created_at if set, else id as proxy)
-    words_qs = Words.objects.prefetch_related('meanings').order_by('-created_at', '-id')
-    for w in words_qs:
-        first_meaning = w.meanings.first()
-        excerpt = (first_meaning.meaning if first_meaning else None) or f'Igala word: {w.word}'
-        # Use created_at for sorting; if null, use a date far in past so they sort after dated items
-        sort_date = w.created_at if w.created_at else timezone.datetime(2000, 1, 1, tzinfo=timezone.get_current_timezone())
-        items.append({
-            'title': w.word,
-            'excerpt': excerpt[:300] if excerpt else 'Igala word',
-            'thumbnail_url': None,
-            'url': reverse('single-word', kwargs={'slug': w.slug}),
-            'type': 'word',
-            'date': sort_date,
-        })
-
-    # Sort by date descending
-    items.sort(key=lambda x: x['date'], reverse=True)
-
-    # Apply offset and limit
-    total = len(items)
-    page = items[offset:offset + limit]
-    has_more = (offset + limit) < total
-
-    return page, has_more, total
+    items = [
+        {
+            'title': row['title'],
+            'excerpt': row['excerpt'],
+            'thumbnail_url': row['thumbnail_url'] or None,
+            'url': row['url'],
+            'type': row['item_type'],
+            'date': row['date'],
+        }
+        for row in rows
+    ]
+    return items, next_cursor, get_feed_total()
@@ -0,0 +1,83 @@
+"""
+Management command to roll raw page views up into DailyViews and prune old raw rows.
+Usage: python manage.py compact_views [--keep-days 90] [--batch-size 5000]
+Run it daily (e.g. from cron): every completed day is rolled up, and raw
+BlogPostView/ArticleView rows and daily visitor sketches older than
+--keep-days are deleted once their totals are in the rollup.
+"""
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from main.models import DailyViews, VisitorSketch
+from main.view_tracking import TRACKED_VIEWS, flush_views
+
+
+class Command(BaseCommand):
+    help = "Roll raw view rows up into per-day unique view counts and delete raw rows past the retention window."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-days",
+            type=int,
+            default=90,
+            help="Days of raw view rows (and daily visitor sketches) to keep.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of raw rows to delete per query.",
+        )
+
+    def handle(self, *args, **options):
+        flush_views()
+        today = timezone.localdate()
+        cutoff = today - timedelta(days=max(options["keep_days"], 1))
+        batch_size = options["batch_size"]
+
+        for kind, (label, fk) in TRACKED_VIEWS.items():
+            model = apps.get_model(label)
+            rolled_up = self.roll_up(kind, model, fk, today)
+
+            deleted = 0
+            old_rows = model.objects.filter(viewed_date__lt=cutoff)
+            while True:
+                pks = list(old_rows.values_list("pk", flat=True)[:batch_size])
+                if not pks:
+                    break
+                deleted += model.objects.filter(pk__in=pks).delete()[0]
+            sketches, _ = VisitorSketch.objects.filter(kind=kind, day__lt=cutoff).delete()
+
+            self.stdout.write(
+                f"{kind}: {rolled_up} day total(s) rolled up, {deleted} raw row(s) "
+                f"and {sketches} daily sketch(es) before {cutoff} deleted"
+            )
+        self.stdout.write(self.style.SUCCESS("Done. Views compacted."))
+
+    def roll_up(self, kind, model, fk, today):
+        """Write DailyViews for every completed day that still has raw rows (recomputed, so reruns are safe)."""
+        totals = (
+            model.objects.filter(viewed_date__lt=today)
+            .values(fk, "viewed_date")
+            .annotate(n=Count("id"))
+            .order_by()
+            .values_list(fk, "viewed_date", "n")
+        )
+        rows = [
+            DailyViews(kind=kind, object_id=object_id, day=day, unique_views=n)
+            for object_id, day, n in totals.iterator(chunk_size=5000)
+        ]
+        with transaction.atomic():
+            DailyViews.objects.bulk_create(
+                rows,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=["kind", "object_id", "day"],
+                update_fields=["unique_views"],
+            )
+        return len(rows)
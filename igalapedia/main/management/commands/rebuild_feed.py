@@ -0,0 +1,52 @@
+"""
+Management command to recreate the discovery feed table from its sources.
+Usage: python manage.py rebuild_feed [--batch-size 1000] [--if-empty]
+"""
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from main.feeds_utils import FEED_COUNT_KEY, iter_feed_items
+from main.models import FeedItem
+from main.page_cache import purge_tags
+
+
+class Command(BaseCommand):
+    help = "Rebuild FeedItem rows for every published blog post, history article and word."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of feed items to insert per query.",
+        )
+        parser.add_argument(
+            "--if-empty",
+            action="store_true",
+            help="Only build the feed when the table is empty (safe to run on every deploy).",
+        )
+
+    def handle(self, *args, **options):
+        if options["if_empty"] and FeedItem.objects.exists():
+            self.stdout.write("Feed already built; nothing to do.")
+            return
+
+        batch_size = options["batch_size"]
+        created = 0
+        with transaction.atomic():
+            FeedItem.objects.all().delete()
+            batch = []
+            for item in iter_feed_items():
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    FeedItem.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+            if batch:
+                FeedItem.objects.bulk_create(batch)
+                created += len(batch)
+            purge_tags("feed")
+            transaction.on_commit(lambda: cache.delete(FEED_COUNT_KEY))
+
+        self.stdout.write(self.style.SUCCESS(f"Done. Rebuilt the feed with {created} item(s)."))
@@ -0,0 +1,48 @@
+"""
+Management command to recreate the site search documents from their sources.
+Usage: python manage.py rebuild_search_index [--batch-size 500] [--if-empty]
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from main.models import SearchDocument
+from main.search import iter_search_documents
+
+
+class Command(BaseCommand):
+    help = "Rebuild SearchDocument rows for every word, history article and published blog post."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of search documents to insert per query.",
+        )
+        parser.add_argument(
+            "--if-empty",
+            action="store_true",
+            help="Only build the index when the table is empty (safe to run on every deploy).",
+        )
+
+    def handle(self, *args, **options):
+        if options["if_empty"] and SearchDocument.objects.exists():
+            self.stdout.write("Search index already built; nothing to do.")
+            return
+
+        batch_size = options["batch_size"]
+        created = 0
+        with transaction.atomic():
+            SearchDocument.objects.all().delete()
+            batch = []
+            for document in iter_search_documents():
+                batch.append(document)
+                if len(batch) >= batch_size:
+                    SearchDocument.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+            if batch:
+                SearchDocument.objects.bulk_create(batch)
+                created += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Done. Indexed {created} document(s) for search."))
@@ -0,0 +1,66 @@
+"""
+Management command to rebuild the HyperLogLog visitor sketches from the raw view tables.
+All-time sketches are merged into, never reset: they are the only record of
+visitors whose raw rows compact_views has pruned.
+Usage: python manage.py rebuild_visitor_sketches [--kind blog|history]
+"""
+from itertools import groupby
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from main.hyperloglog import HyperLogLog
+from main.models import VisitorSketch
+from main.view_tracking import TRACKED_VIEWS
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreate the daily VisitorSketch rows from BlogPostView and ArticleView and merge them into "
+        "the all-time sketches, which keep the visitors of days compact_views has already pruned."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind",
+            action="append",
+            choices=list(TRACKED_VIEWS),
+            help="Content kind to rebuild (repeatable). Defaults to all kinds.",
+        )
+
+    def handle(self, *args, **options):
+        for kind in options["kind"] or list(TRACKED_VIEWS):
+            label, fk = TRACKED_VIEWS[kind]
+            views = (
+                apps.get_model(label).objects
+                .order_by(fk, "viewed_date")
+                .values_list(fk, "viewed_date", "ip_hash")
+            )
+            all_time_rows = VisitorSketch.objects.filter(kind=kind, day__isnull=True)
+            with transaction.atomic():
+                # Daily sketches are pruned together with the raw rows, so every
+                # remaining one is rebuilt from the rows below.
+                VisitorSketch.objects.filter(kind=kind, day__isnull=False).delete()
+                existing = {row.object_id: row for row in all_time_rows}
+                rows, merged = [], []
+                for object_id, object_views in groupby(views.iterator(chunk_size=5000), key=lambda view: view[0]):
+                    row = existing.get(object_id)
+                    all_time = row.sketch if row else HyperLogLog()
+                    for day, day_views in groupby(object_views, key=lambda view: view[1]):
+                        sketch = HyperLogLog()
+                        sketch.update(ip_hash for _, _, ip_hash in day_views)
+                        all_time.merge(sketch)
+                        rows.append(VisitorSketch(kind=kind, object_id=object_id, day=day, registers=sketch.to_bytes()))
+                    if row:
+                        row.registers = all_time.to_bytes()
+                        merged.append(row)
+                    else:
+                        rows.append(VisitorSketch(kind=kind, object_id=object_id, day=None, registers=all_time.to_bytes()))
+                    if len(rows) >= 500:
+                        VisitorSketch.objects.bulk_create(rows)
+                        rows = []
+                VisitorSketch.objects.bulk_create(rows)
+                VisitorSketch.objects.bulk_update(merged, ["registers"], batch_size=500)
+            self.stdout.write(f"{kind}: {all_time_rows.count()} item(s)")
+        self.stdout.write(self.style.SUCCESS("Done. Visitor sketches rebuilt."))
@@ -0,0 +1,25 @@
+"""
+Management command to recompute the site counters shown on the home and login pages.
+Usage: python manage.py reconcile_site_counters
+"""
+from django.core.management.base import BaseCommand
+
+from main.models import SiteCounters
+from main.page_cache import purge_tags
+
+
+class Command(BaseCommand):
+    help = "Recompute SiteCounters with exact COUNT queries, fixing any drift."
+
+    def handle(self, *args, **options):
+        before = SiteCounters.objects.filter(pk=SiteCounters.SINGLETON_ID).first()
+        counters = SiteCounters.reconcile()
+        purge_tags("site-counters")
+
+        fields = ["word_count", "audio_count", "example_count", "history_count", "contributor_count", "user_count"]
+        for field in fields:
+            value = getattr(counters, field)
+            old = getattr(before, field) if before else None
+            drift = "" if old is None or old == value else f" (was {old})"
+            self.stdout.write(f"{field}: {value}{drift}")
+        self.stdout.write(self.style.SUCCESS("Done. Site counters reconciled."))
@@ -0,0 +1,39 @@
+"""
+Management command to recompute the denormalized view_count of blog posts and history articles.
+Usage: python manage.py reconcile_view_counts
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from main.models import DailyViews
+from main.view_tracking import TRACKED_VIEWS, flush_views, purge_view_count_pages
+
+
+class Command(BaseCommand):
+    help = "Recompute view_count on BlogPost and HistoryArticle from the raw views and the compacted daily totals."
+
+    def handle(self, *args, **options):
+        flush_views()
+        for kind, (label, fk) in TRACKED_VIEWS.items():
+            model = apps.get_model(label)
+            target = model._meta.get_field(fk).related_model
+            field = model._meta.get_field(fk).name
+            views = (
+                model.objects.filter(**{field: OuterRef("pk")})
+                .values(field).annotate(n=Count("id")).values("n")
+            )
+            # Days before the oldest raw row were pruned by compact_views; their totals live in DailyViews.
+            first_raw_day = model.objects.aggregate(day=Min("viewed_date"))["day"]
+            compacted = DailyViews.objects.filter(kind=kind, object_id=OuterRef("pk"))
+            if first_raw_day is not None:
+                compacted = compacted.filter(day__lt=first_raw_day)
+            compacted = compacted.values("object_id").annotate(n=Sum("unique_views")).values("n")
+            exact = Coalesce(Subquery(views), Value(0)) + Coalesce(Subquery(compacted), Value(0))
+            drifted = list(target.objects.annotate(exact=exact).exclude(view_count=exact).values_list("pk", flat=True))
+            if drifted:
+                target.objects.filter(pk__in=drifted).update(view_count=exact)
+                purge_view_count_pages(kind, drifted)
+            self.stdout.write(f"{kind}: fixed {len(drifted)} item(s)")
+        self.stdout.write(self.style.SUCCESS("Done. View counts reconciled."))
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.3 on 2026-10-18 18:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0002_alter_pioneer_options_pioneer_bio_pioneer_position_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_type', models.CharField(choices=[('blog', 'Blog'), ('history', 'History'), ('word', 'Dictionary')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=200)),
+                ('excerpt', models.CharField(blank=True, max_length=300)),
+                ('thumbnail_url', models.CharField(blank=True, max_length=500)),
+                ('url', models.CharField(max_length=300)),
+                ('date', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['-date', '-id'],
+                'indexes': [models.Index(fields=['date', 'id'], name='feeditem_date_id_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='feeditem',
+            constraint=models.UniqueConstraint(fields=('item_type', 'object_id'), name='unique_feed_item'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.3 on 2026-10-18 18:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_feeditem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word_count', models.PositiveIntegerField(default=0)),
+                ('audio_count', models.PositiveIntegerField(default=0, help_text='Words with a pronunciation')),
+                ('example_count', models.PositiveIntegerField(default=0)),
+                ('history_count', models.PositiveIntegerField(default=0)),
+                ('contributor_count', models.PositiveIntegerField(default=0, help_text='Users with at least one approved word')),
+                ('user_count', models.PositiveIntegerField(default=0)),
+                ('reconciled_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Site counters',
+                'verbose_name_plural': 'Site counters',
+            },
+        ),
+    ]
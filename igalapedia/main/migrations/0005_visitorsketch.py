@@ -0,0 +1,32 @@
+# Generated by Django 5.0.3 on 2026-10-18 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_sitecounters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VisitorSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('blog', 'Blog post'), ('history', 'History article')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('day', models.DateField(blank=True, help_text='Empty for the all-time sketch', null=True)),
+                ('registers', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='visitorsketch',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id', 'day'), name='unique_visitor_sketch_day'),
+        ),
+        migrations.AddConstraint(
+            model_name='visitorsketch',
+            constraint=models.UniqueConstraint(condition=models.Q(('day__isnull', True)), fields=('kind', 'object_id'), name='unique_visitor_sketch_all_time'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.3 on 2026-10-18 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_visitorsketch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyViews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('blog', 'Blog post'), ('history', 'History article')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('day', models.DateField()),
+                ('unique_views', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Daily views',
+                'verbose_name_plural': 'Daily views',
+                'ordering': ['-day', 'kind', 'object_id'],
+                'indexes': [models.Index(fields=['kind', 'day'], name='dailyviews_kind_day_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyviews',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id', 'day'), name='unique_daily_views'),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 5.0.3 on 2026-10-18 19:00
+"""
+Full-text index for the site search (main.search).
+
+SQLite: an external-content FTS5 table over main_searchdocument
+(title, keywords, body), kept in sync by triggers, with prefix indexes for
+the two- and three-letter prefixes typed-ahead queries use most.
+PostgreSQL: a stored, weighted tsvector column (title and keywords rank above
+body) with a GIN index.
+Other backends get no index and fall back to LIKE queries.
+"""
+from django.db import migrations, models
+
+
+SQLITE_FORWARD = [
+    """CREATE VIRTUAL TABLE main_searchdocument_fts USING fts5(
+        title, keywords, body, content='main_searchdocument', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER main_searchdocument_fts_ai AFTER INSERT ON main_searchdocument BEGIN
+        INSERT INTO main_searchdocument_fts(rowid, title, keywords, body)
+        VALUES (new.id, new.title, new.keywords, new.body);
+    END""",
+    """CREATE TRIGGER main_searchdocument_fts_ad AFTER DELETE ON main_searchdocument BEGIN
+        INSERT INTO main_searchdocument_fts(main_searchdocument_fts, rowid, title, keywords, body)
+        VALUES ('delete', old.id, old.title, old.keywords, old.body);
+    END""",
+    """CREATE TRIGGER main_searchdocument_fts_au AFTER UPDATE ON main_searchdocument BEGIN
+        INSERT INTO main_searchdocument_fts(main_searchdocument_fts, rowid, title, keywords, body)
+        VALUES ('delete', old.id, old.title, old.keywords, old.body);
+        INSERT INTO main_searchdocument_fts(rowid, title, keywords, body)
+        VALUES (new.id, new.title, new.keywords, new.body);
+    END""",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS main_searchdocument_fts_ai",
+    "DROP TRIGGER IF EXISTS main_searchdocument_fts_ad",
+    "DROP TRIGGER IF EXISTS main_searchdocument_fts_au",
+    "DROP TABLE IF EXISTS main_searchdocument_fts",
+]
+
+POSTGRES_FORWARD = [
+    """ALTER TABLE main_searchdocument ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', title), 'A')
+        || setweight(to_tsvector('simple', keywords), 'A')
+        || setweight(to_tsvector('english', body), 'B')
+    ) STORED""",
+    "CREATE INDEX main_searchdocument_fts ON main_searchdocument USING gin (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS main_searchdocument_fts",
+    "ALTER TABLE main_searchdocument DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_dailyviews'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('word', 'Dictionary'), ('history', 'History'), ('blog', 'Blog')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=200)),
+                ('keywords', models.CharField(blank=True, max_length=200)),
+                ('body', models.TextField(blank=True)),
+                ('url', models.CharField(max_length=300)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_document'),
+        ),
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE}),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
 
 # Create your models here.
 class Community(models.Model):
@@ -21,4 +23,232 @@ class Pioneer(models.Model):
         ordering = ['-id']
     
     def __str__(self):
-        return self.pioneer_name if self.pioneer_name else "Unnamed Pioneer" 
\ No newline at end of file
+        return self.pioneer_name if self.pioneer_name else "Unnamed Pioneer" 
+
+class FeedItem(models.Model):
+    """
+    Denormalized row of the discovery feed, one per published blog post,
+    history article or dictionary word. Kept current by main.signals;
+    rebuild with `python manage.py rebuild_feed`.
+    """
+    TYPE_CHOICES = [
+        ('blog', 'Blog'),
+        ('history', 'History'),
+        ('word', 'Dictionary'),
+    ]
+
+    item_type = models.CharField(max_length=10, choices=TYPE_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=200)
+    excerpt = models.CharField(max_length=300, blank=True)
+    thumbnail_url = models.CharField(max_length=500, blank=True)
+    url = models.CharField(max_length=300)
+    date = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-date', '-id']
+        indexes = [
+            models.Index(fields=['date', 'id'], name='feeditem_date_id_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['item_type', 'object_id'], name='unique_feed_item'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_item_type_display()}: {self.title}"
+
+
+class SearchDocument(models.Model):
+    """
+    Plain-text copy of every searchable word, history article and published
+    blog post, indexed for full-text search (see main.search and migration
+    0007). Kept current by main.signals; rebuild with
+    `python manage.py rebuild_search_index`.
+    """
+    KIND_CHOICES = [
+        ('word', 'Dictionary'),
+        ('history', 'History'),
+        ('blog', 'Blog'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=200)
+    # Tone- and diacritic-free form of the title, so "oko" finds "ọkọ".
+    keywords = models.CharField(max_length=200, blank=True)
+    body = models.TextField(blank=True)
+    url = models.CharField(max_length=300)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
+
+
+class SiteCounters(models.Model):
+    """
+    Single-row table of the site totals shown on the home and login pages.
+    main.signals applies +1/-1 deltas as content changes; run
+    `python manage.py reconcile_site_counters` to recompute exact values.
+    """
+    word_count = models.PositiveIntegerField(default=0)
+    audio_count = models.PositiveIntegerField(default=0, help_text="Words with a pronunciation")
+    example_count = models.PositiveIntegerField(default=0)
+    history_count = models.PositiveIntegerField(default=0)
+    contributor_count = models.PositiveIntegerField(default=0, help_text="Users with at least one approved word")
+    user_count = models.PositiveIntegerField(default=0)
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+
+    SINGLETON_ID = 1
+
+    class Meta:
+        verbose_name = "Site counters"
+        verbose_name_plural = "Site counters"
+
+    def __str__(self):
+        return "Site counters"
+
+    @classmethod
+    def load(cls):
+        """Return the counters row, computing it from scratch the first time."""
+        counters = cls.objects.filter(pk=cls.SINGLETON_ID).first()
+        if counters is None:
+            counters = cls.reconcile()
+        return counters
+
+    @classmethod
+    def bump(cls, **deltas):
+        """
+        Apply deltas such as word_count=1, audio_count=-1 atomically (no-op
+        before the first load). Decrements stop at zero, so a counter that has
+        drifted low never fails the delete that triggered it.
+        """
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if deltas:
+            cls.objects.filter(pk=cls.SINGLETON_ID).update(**{
+                field: F(field) + delta if delta > 0 else Greatest(F(field) + delta, Value(0))
+                for field, delta in deltas.items()
+            })
+
+    @classmethod
+    def reconcile(cls):
+        """Recompute every counter with exact COUNT queries and store the result."""
+        from django.contrib.auth import get_user_model
+        from django.utils import timezone
+        from dictionary.models import Words, Example, ContributionStats
+        from history.models import HistoryArticle
+
+        values = {
+            'word_count': Words.objects.count(),
+            'audio_count': Words.objects.exclude(pronunciation__isnull=True).exclude(pronunciation='').count(),
+            'example_count': Example.objects.count(),
+            'history_count': HistoryArticle.objects.count(),
+            'contributor_count': ContributionStats.objects.filter(approved_words_count__gt=0).count(),
+            'user_count': get_user_model().objects.count(),
+            'reconciled_at': timezone.now(),
+        }
+        counters, _ = cls.objects.update_or_create(pk=cls.SINGLETON_ID, defaults=values)
+        return counters
+
+
+class VisitorSketch(models.Model):
+    """
+    HyperLogLog sketch of the distinct visitors (ip hashes) of one blog post
+    or history article: one row per day, plus a running all-time row with
+    day = NULL. Each row is a constant 2 KiB however much traffic arrives.
+    main.view_tracking folds buffered views in on every flush; rebuild from the
+    raw view tables with `python manage.py rebuild_visitor_sketches`.
+    """
+    KIND_CHOICES = [
+        ('blog', 'Blog post'),
+        ('history', 'History article'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    day = models.DateField(null=True, blank=True, help_text="Empty for the all-time sketch")
+    registers = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id', 'day'], name='unique_visitor_sketch_day'),
+            models.UniqueConstraint(
+                fields=['kind', 'object_id'],
+                condition=models.Q(day__isnull=True),
+                name='unique_visitor_sketch_all_time',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} {self.day or 'all time'}"
+
+    @property
+    def sketch(self):
+        from .hyperloglog import HyperLogLog
+        return HyperLogLog(self.registers) if self.registers else HyperLogLog()
+
+    @classmethod
+    def add_visitors(cls, kind, object_id, day, ip_hashes):
+        """Fold visitor ip hashes seen on `day` into that day's and the all-time sketch."""
+        from django.db import transaction
+
+        ip_hashes = list(ip_hashes)
+        with transaction.atomic():
+            for sketch_day in (day, None):
+                row, _ = cls.objects.select_for_update().get_or_create(
+                    kind=kind, object_id=object_id, day=sketch_day,
+                    defaults={'registers': b''},
+                )
+                sketch = row.sketch
+                if sketch.update(ip_hashes) or not row.registers:
+                    row.registers = sketch.to_bytes()
+                    row.save(update_fields=['registers', 'updated_at'])
+
+    @classmethod
+    def unique_visitors(cls, kind, object_id, days=None, today=None):
+        """
+        Estimated distinct visitors over the last `days` days (including
+        today), or of all time when days is None.
+        """
+        from django.utils import timezone
+        from .hyperloglog import HyperLogLog
+
+        rows = cls.objects.filter(kind=kind, object_id=object_id)
+        if days is None:
+            rows = rows.filter(day__isnull=True)
+        else:
+            today = today or timezone.localdate()
+            rows = rows.filter(day__gt=today - timezone.timedelta(days=days), day__lte=today)
+        return HyperLogLog.union(row.sketch for row in rows).count()
+
+
+class DailyViews(models.Model):
+    """
+    Unique visitors per blog post or history article per completed day,
+    rolled up from the raw BlogPostView/ArticleView rows by
+    `python manage.py compact_views`, which then prunes raw rows past the
+    retention window. The admin's Daily views list and reconcile_view_counts
+    read the pruned days from here.
+    """
+    kind = models.CharField(max_length=10, choices=VisitorSketch.KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    day = models.DateField()
+    unique_views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Daily views"
+        verbose_name_plural = "Daily views"
+        ordering = ['-day', 'kind', 'object_id']
+        indexes = [
+            models.Index(fields=['kind', 'day'], name='dailyviews_kind_day_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id', 'day'], name='unique_daily_views'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} {self.day}: {self.unique_views}"
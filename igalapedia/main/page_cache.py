@@ -0,0 +1,162 @@
+"""
+Full-page cache for anonymous GET requests, invalidated by tags.
+
+A view opts in by calling tag_page(request, 'word:12', ...) with the objects
+the page depends on. AnonymousPageCacheMiddleware then stores the rendered
+response together with the current token of each tag, and serves it to later
+cookie-less anonymous requests for as long as none of those tokens changed.
+purge_tags() replaces a tag's token, so every page tagged with it misses on
+its next request; nothing relies on a TTL.
+
+Tag tokens are (timestamp, nonce) pairs rather than counters: an evicted token
+is re-created with a fresh nonce, so a lost token can never make an old entry
+look current, and a page whose tags were purged while it was being rendered is
+not stored.
+
+Tags used across the site:
+    word:<id>, history:<id>, blog:<id>  one object's detail page
+    blog-list, feed, pioneers, community, recent-words, recent-examples
+    site-counters                       the totals shown on the home page
+"""
+import hashlib
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+
+
+PAGE_KEY = 'page:{}:{}'
+TAG_KEY = 'page-tag:{}'
+
+# Cookies that mean the response may be personalised (a session, or flash
+# messages waiting to be shown).
+PERSONAL_COOKIES = (settings.SESSION_COOKIE_NAME, 'messages')
+
+
+def _cache():
+    return caches[settings.PAGE_CACHE_ALIAS]
+
+
+def _page_key(request):
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return PAGE_KEY.format(settings.PAGE_CACHE_KEY_PREFIX, url)
+
+
+def _new_token():
+    return (time.time(), uuid.uuid4().hex)
+
+
+def tag_page(request, *tags, on_hit=None):
+    """
+    Mark the response to this request as cacheable for anonymous visitors,
+    depending on `tags`. on_hit=('dotted.path.to.function', args) is called as
+    function(request, *args) whenever the cached page is served instead.
+    """
+    request._page_cache_tags = set(getattr(request, '_page_cache_tags', ())) | set(tags)
+    if on_hit is not None:
+        request._page_cache_on_hit = on_hit
+
+
+def purge_tags(*tags):
+    """Invalidate every cached page tagged with any of `tags` once the transaction commits."""
+    tags = {tag for tag in tags if tag}
+    if not tags:
+        return
+
+    def _purge():
+        token = _new_token()
+        _cache().set_many({TAG_KEY.format(tag): token for tag in tags}, timeout=None)
+    transaction.on_commit(_purge)
+
+
+def _is_cacheable_request(request):
+    return (
+        request.method == 'GET'
+        and not any(name in request.COOKIES for name in PERSONAL_COOKIES)
+    )
+
+
+class AnonymousPageCacheMiddleware:
+    """
+    Serve tagged pages to anonymous visitors without running the view.
+    Sits above the session, auth and CSRF middleware so a hit never touches
+    the database.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not _is_cacheable_request(request):
+            return self.get_response(request)
+
+        started_at = time.time()
+        key = _page_key(request)
+        response = self._cached_response(request, key)
+        if response is not None:
+            return response
+
+        response = self.get_response(request)
+        self._store(request, key, response, started_at)
+        return response
+
+    def _cached_response(self, request, key):
+        cache = _cache()
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        tag_keys = {TAG_KEY.format(tag): token for tag, token in entry['tags'].items()}
+        if tag_keys:
+            current = cache.get_many(list(tag_keys))
+            if any(current.get(tag_key) != token for tag_key, token in tag_keys.items()):
+                return None
+
+        response = _build_response(entry)
+        if entry['on_hit']:
+            path, args = entry['on_hit']
+            import_string(path)(request, *args)
+        return response
+
+    def _store(self, request, key, response, started_at):
+        tags = getattr(request, '_page_cache_tags', None)
+        if tags is None or response.status_code != 200 or response.streaming:
+            return
+        if response.cookies or request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+            return
+        if 'private' in response.get('Cache-Control', '') or 'no-store' in response.get('Cache-Control', ''):
+            return
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return
+
+        cache = _cache()
+        tag_keys = {TAG_KEY.format(tag): tag for tag in tags}
+        tokens = cache.get_many(list(tag_keys))
+        missing = [tag_key for tag_key in tag_keys if tag_key not in tokens]
+        if missing:
+            # First sighting (or eviction) of a tag: start tracking it and store
+            # the page on a later request, once its token predates the render.
+            for tag_key in missing:
+                cache.add(tag_key, _new_token(), timeout=None)
+            return
+        if any(token[0] >= started_at for token in tokens.values()):
+            return
+
+        cache.set(key, {
+            'status': response.status_code,
+            'headers': dict(response.items()),
+            'content': response.content,
+            'tags': {tag_keys[tag_key]: token for tag_key, token in tokens.items()},
+            'on_hit': getattr(request, '_page_cache_on_hit', None),
+        }, timeout=None)
+
+
+def _build_response(entry):
+    response = HttpResponse(entry['content'], status=entry['status'])
+    for header, value in entry['headers'].items():
+        response[header] = value
+    return response
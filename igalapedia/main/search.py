@@ -0,0 +1,225 @@
+"""
+Site-wide search over dictionary words, history articles and published blog posts.
+
+Each searchable object has a plain-text SearchDocument row (title, a
+diacritic-free keywords form of the title, and body text with the HTML
+stripped). main.signals upserts the row whenever a source object is saved and
+removes it when the object is deleted or stops being public; the
+rebuild_search_index command recreates the whole table from the sources.
+
+The documents are indexed by migration 0007: an FTS5 table on SQLite and a
+weighted tsvector column with a GIN index on PostgreSQL. site_search() runs
+one ranked query and returns typed results whose title and snippet have the
+matched terms wrapped in <mark>.
+"""
+from django.db import connection
+from django.db.models import Prefetch, Q
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from core.fulltext import fts5_query, query_tokens, tsquery
+from core.richtext import make_excerpt, render_rich_text
+from dictionary.utils import normalize_word
+
+
+MAX_RESULTS = 50
+
+# Highlight markers put around matches by the database; replaced by <mark>
+# after the text has been escaped.
+_START, _STOP = '\x02', '\x03'
+
+_SQLITE_SQL = """
+SELECT d.kind, d.url,
+       highlight(main_searchdocument_fts, 0, %s, %s),
+       snippet(main_searchdocument_fts, 2, %s, %s, '…', 24)
+FROM main_searchdocument_fts
+JOIN main_searchdocument d ON d.id = main_searchdocument_fts.rowid
+WHERE main_searchdocument_fts MATCH %s{kind_filter}
+ORDER BY bm25(main_searchdocument_fts, 10.0, 10.0, 1.0), d.id
+LIMIT %s
+"""
+
+# Rank first and build headlines only for the rows that are returned.
+_POSTGRES_SQL = """
+WITH hits AS (
+    SELECT d.id, ts_rank(d.search_vector, q.query) AS rank
+    FROM main_searchdocument d, to_tsquery('english', %s) AS q(query)
+    WHERE d.search_vector @@ q.query{kind_filter}
+    ORDER BY rank DESC, d.id
+    LIMIT %s
+)
+SELECT d.kind, d.url,
+       ts_headline('english', d.title, q.query, %s),
+       ts_headline('english', d.body, q.query, %s)
+FROM hits
+JOIN main_searchdocument d ON d.id = hits.id,
+     to_tsquery('english', %s) AS q(query)
+ORDER BY hits.rank DESC, d.id
+"""
+
+_TITLE_HEADLINE = f'StartSel="{_START}", StopSel="{_STOP}", HighlightAll=true'
+_BODY_HEADLINE = f'StartSel="{_START}", StopSel="{_STOP}", MinWords=15, MaxWords=35'
+
+
+def word_search_fields(word, meanings=None):
+    """SearchDocument fields for a dictionary word; meanings are looked up when not given."""
+    if meanings is None:
+        meanings = word.meanings.order_by('id').values_list('meaning', flat=True)
+    return {
+        'title': word.word,
+        'keywords': word.lookup_key or normalize_word(word.word),
+        'body': '; '.join(meanings),
+        'url': reverse('single-word', kwargs={'slug': word.slug}),
+    }
+
+
+def history_search_fields(article):
+    """SearchDocument fields for a history article: excerpt and both language versions."""
+    texts = [
+        article.summary,
+        render_rich_text(article.content_english_html).text,
+        render_rich_text(article.content_igala_html).text,
+    ]
+    return {
+        'title': article.title,
+        'keywords': normalize_word(article.title)[:200],
+        'body': '\n'.join(text for text in texts if text),
+        'url': reverse('history_detail', kwargs={'slug': article.slug}),
+    }
+
+
+def blog_search_fields(post):
+    """SearchDocument fields for a blog post, or None if it is not public."""
+    if post.status != 'published' or post.is_hidden:
+        return None
+    return {
+        'title': post.title,
+        'keywords': normalize_word(post.title)[:200],
+        'body': render_rich_text(post.body_html).text,
+        'url': reverse('blog:blog_detail', kwargs={'slug': post.slug}),
+    }
+
+
+SEARCH_FIELDS = {
+    'word': word_search_fields,
+    'history': history_search_fields,
+    'blog': blog_search_fields,
+}
+
+# Saves that touch none of these fields leave the document as it was.
+SOURCE_FIELDS = {
+    'word': {'word', 'slug'},
+    'history': {'title', 'slug', 'excerpt', 'content_english', 'content_igala'},
+    'blog': {'title', 'slug', 'body', 'status', 'is_hidden'},
+}
+
+
+def sync_search_document(kind, obj, update_fields=None, created=False):
+    """Insert, update or remove the SearchDocument for a saved source object."""
+    from .models import SearchDocument
+
+    if update_fields is not None and not SOURCE_FIELDS[kind] & set(update_fields):
+        return
+    fields = SEARCH_FIELDS[kind](obj)
+    if fields is None:
+        # A new object that is not searchable (e.g. a draft post) has no document yet.
+        if not created:
+            remove_search_document(kind, obj.pk)
+        return
+    SearchDocument.objects.update_or_create(kind=kind, object_id=obj.pk, defaults=fields)
+
+
+def remove_search_document(kind, object_id):
+    """Drop the SearchDocument for a deleted (or no longer public) source object."""
+    from .models import SearchDocument
+
+    SearchDocument.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def iter_search_documents():
+    """Unsaved SearchDocument instances for every searchable object (used by rebuild_search_index)."""
+    from dictionary.models import Words, Meaning
+    from history.models import HistoryArticle
+    from blog.models import BlogPost
+    from .models import SearchDocument
+
+    words = Words.objects.prefetch_related(
+        Prefetch('meanings', queryset=Meaning.objects.order_by('id').only('word_id', 'meaning'))
+    )
+    for word in words.iterator(chunk_size=2000):
+        meanings = [meaning.meaning for meaning in word.meanings.all()]
+        yield SearchDocument(kind='word', object_id=word.pk, **word_search_fields(word, meanings))
+    articles = HistoryArticle.objects.defer('content_english', 'content_igala')
+    for article in articles.iterator(chunk_size=200):
+        yield SearchDocument(kind='history', object_id=article.pk, **history_search_fields(article))
+    posts = BlogPost.objects.filter(status='published', is_hidden=False).defer('body')
+    for post in posts.iterator(chunk_size=200):
+        yield SearchDocument(kind='blog', object_id=post.pk, **blog_search_fields(post))
+
+
+def _highlight(text):
+    """Escape text from the index and turn the highlight markers into <mark> tags."""
+    html = escape(text or '').replace(_START, '<mark>').replace(_STOP, '</mark>')
+    return mark_safe(html)
+
+
+def _fallback_rows(tokens, kind, limit):
+    """Unindexed LIKE search for database backends without a full-text index."""
+    from .models import SearchDocument
+
+    condition = Q()
+    for token in tokens:
+        condition &= Q(title__icontains=token) | Q(keywords__icontains=token) | Q(body__icontains=token)
+    documents = SearchDocument.objects.filter(condition)
+    if kind:
+        documents = documents.filter(kind=kind)
+    documents = documents.order_by('title', 'id').values_list('kind', 'url', 'title', 'body')[:limit]
+    return [(k, url, title, make_excerpt(body, 200)) for k, url, title, body in documents]
+
+
+def site_search(term, kind=None, limit=20):
+    """
+    Search every content type, or only `kind` ('word', 'history' or 'blog').
+    Returns a list of dicts ordered by relevance:
+    {kind, kind_label, url, title, snippet}, where title and snippet are safe
+    HTML with the matched terms in <mark>.
+    """
+    from .models import SearchDocument
+
+    tokens = query_tokens(term)
+    if not tokens:
+        return []
+    if kind not in SEARCH_FIELDS:
+        kind = None
+    limit = max(1, min(limit, MAX_RESULTS))
+    kind_filter = ' AND d.kind = %s' if kind else ''
+    kind_params = [kind] if kind else []
+
+    if connection.vendor == 'sqlite':
+        sql = _SQLITE_SQL.format(kind_filter=kind_filter)
+        params = [_START, _STOP, _START, _STOP, fts5_query(tokens), *kind_params, limit]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+    elif connection.vendor == 'postgresql':
+        query = tsquery(tokens)
+        sql = _POSTGRES_SQL.format(kind_filter=kind_filter)
+        params = [query, *kind_params, limit, _TITLE_HEADLINE, _BODY_HEADLINE, query]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+    else:
+        rows = _fallback_rows(tokens, kind, limit)
+
+    labels = dict(SearchDocument.KIND_CHOICES)
+    return [
+        {
+            'kind': row_kind,
+            'kind_label': labels[row_kind],
+            'url': url,
+            'title': _highlight(title),
+            'snippet': _highlight(snippet),
+        }
+        for row_kind, url, title, snippet in rows
+    ]
@@ -0,0 +1,215 @@
+from django.conf import settings
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from blog.models import BlogPost
+from dictionary.models import Words, Meaning, Example, ContributionStats
+from history.models import HistoryArticle
+from .feeds_utils import sync_feed_item, remove_feed_item
+from .search import sync_search_document, remove_search_document
+from .models import Community, Pioneer, SiteCounters
+from .page_cache import purge_tags
+
+
+@receiver(post_save, sender=Pioneer)
+@receiver(post_delete, sender=Pioneer)
+def pioneer_purge_pages(sender, raw=False, **kwargs):
+    if not raw:
+        purge_tags('pioneers')
+
+
+@receiver(post_save, sender=Community)
+@receiver(post_delete, sender=Community)
+def community_purge_pages(sender, raw=False, **kwargs):
+    if not raw:
+        purge_tags('community')
+
+
+# Discovery feed (FeedItem) maintenance
+
+@receiver(post_save, sender=BlogPost)
+def blog_post_feed_item(sender, instance, raw=False, **kwargs):
+    """Publishing, editing, hiding or unhiding a post updates, adds or drops its feed item."""
+    if not raw:
+        sync_feed_item('blog', instance)
+
+
+@receiver(post_save, sender=HistoryArticle)
+def history_article_feed_item(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_feed_item('history', instance)
+
+
+@receiver(post_save, sender=Words)
+def word_feed_item(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_feed_item('word', instance)
+
+
+@receiver(post_save, sender=Meaning)
+@receiver(post_delete, sender=Meaning)
+def meaning_feed_item(sender, instance, raw=False, **kwargs):
+    """A word's feed excerpt is its first meaning."""
+    if raw:
+        return
+    word = Words.objects.filter(pk=instance.word_id).first()
+    if word is not None:
+        sync_feed_item('word', word)
+
+
+@receiver(post_delete, sender=BlogPost)
+def blog_post_feed_item_deleted(sender, instance, **kwargs):
+    remove_feed_item('blog', instance.pk)
+
+
+@receiver(post_delete, sender=HistoryArticle)
+def history_article_feed_item_deleted(sender, instance, **kwargs):
+    remove_feed_item('history', instance.pk)
+
+
+@receiver(post_delete, sender=Words)
+def word_feed_item_deleted(sender, instance, **kwargs):
+    remove_feed_item('word', instance.pk)
+
+
+# Site search (SearchDocument) maintenance
+
+@receiver(post_save, sender=BlogPost)
+def blog_post_search_document(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Only published, visible posts are searchable."""
+    if not raw:
+        sync_search_document('blog', instance, update_fields, created=created)
+
+
+@receiver(post_save, sender=HistoryArticle)
+def history_article_search_document(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw:
+        sync_search_document('history', instance, update_fields)
+
+
+@receiver(post_save, sender=Words)
+def word_search_document(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw:
+        sync_search_document('word', instance, update_fields)
+
+
+@receiver(post_save, sender=Meaning)
+@receiver(post_delete, sender=Meaning)
+def meaning_search_document(sender, instance, raw=False, **kwargs):
+    """A word's document body is the text of its meanings."""
+    if raw:
+        return
+    word = Words.objects.filter(pk=instance.word_id).first()
+    if word is not None:
+        sync_search_document('word', word)
+
+
+@receiver(post_delete, sender=BlogPost)
+def blog_post_search_document_deleted(sender, instance, **kwargs):
+    remove_search_document('blog', instance.pk)
+
+
+@receiver(post_delete, sender=HistoryArticle)
+def history_article_search_document_deleted(sender, instance, **kwargs):
+    remove_search_document('history', instance.pk)
+
+
+@receiver(post_delete, sender=Words)
+def word_search_document_deleted(sender, instance, **kwargs):
+    remove_search_document('word', instance.pk)
+
+
+# Site counters (SiteCounters): deltas applied in the same transaction as the change
+
+def _has_audio(word):
+    # None when the field was deferred and the previous state is unknown
+    if 'pronunciation' not in word.__dict__:
+        return None
+    return bool(word.pronunciation)
+
+
+def _is_contributor(stats):
+    if 'approved_words_count' not in stats.__dict__:
+        return None
+    return (stats.approved_words_count or 0) > 0
+
+
+@receiver(post_init, sender=Words)
+def word_remember_audio(sender, instance, **kwargs):
+    instance._had_audio = _has_audio(instance)
+
+
+@receiver(post_save, sender=Words)
+def word_counters(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    had_audio = False if created else instance._had_audio
+    has_audio = _has_audio(instance)
+    audio_delta = 0
+    if had_audio is not None and has_audio is not None:
+        audio_delta = int(has_audio) - int(had_audio)
+    SiteCounters.bump(word_count=int(created), audio_count=audio_delta)
+    instance._had_audio = has_audio
+
+
+@receiver(post_delete, sender=Words)
+def word_counters_deleted(sender, instance, **kwargs):
+    SiteCounters.bump(word_count=-1, audio_count=-int(bool(instance._had_audio)))
+
+
+@receiver(post_save, sender=Example)
+def example_counters(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        SiteCounters.bump(example_count=1)
+
+
+@receiver(post_delete, sender=Example)
+def example_counters_deleted(sender, instance, **kwargs):
+    SiteCounters.bump(example_count=-1)
+
+
+@receiver(post_save, sender=HistoryArticle)
+def history_counters(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        SiteCounters.bump(history_count=1)
+
+
+@receiver(post_delete, sender=HistoryArticle)
+def history_counters_deleted(sender, instance, **kwargs):
+    SiteCounters.bump(history_count=-1)
+
+
+@receiver(post_init, sender=ContributionStats)
+def contribution_stats_remember(sender, instance, **kwargs):
+    instance._was_contributor = _is_contributor(instance)
+
+
+@receiver(post_save, sender=ContributionStats)
+def contribution_stats_counters(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    was = False if created else instance._was_contributor
+    now = _is_contributor(instance)
+    if was is not None and now is not None and was != now:
+        SiteCounters.bump(contributor_count=1 if now else -1)
+    instance._was_contributor = now
+
+
+@receiver(post_delete, sender=ContributionStats)
+def contribution_stats_counters_deleted(sender, instance, **kwargs):
+    if instance._was_contributor:
+        SiteCounters.bump(contributor_count=-1)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def user_counters(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        SiteCounters.bump(user_count=1)
+        # The home page falls back to the user count while nobody has an approved word
+        purge_tags('site-counters')
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def user_counters_deleted(sender, instance, **kwargs):
+    SiteCounters.bump(user_count=-1)
+    purge_tags('site-counters')
@@ -1,3 +1,364 @@
-from django.test import TestCase
+import hashlib
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.db.models import Count
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import BlogPost, BlogPostView
+from dictionary.models import Words, Meaning, PartOfSpeech
+from history.models import HistoryArticle
+from . import view_tracking
+from .hyperloglog import HyperLogLog
+from .models import DailyViews, FeedItem, SiteCounters, VisitorSketch
+from .search import site_search
+from .utils import encode_cursor, keyset_paginate
+
+
+class SiteSearchTests(TestCase):
+    """One ranked query finds every content type and follows edits as they are saved."""
+
+    @classmethod
+    def setUpTestData(cls):
+        noun = PartOfSpeech.objects.create(name='noun')
+        cls.word = Words.objects.create(word='Ọkọ')
+        Meaning.objects.create(word=cls.word, meaning='husband; a married man', part_of_speech=noun)
+        cls.article = HistoryArticle.objects.create(
+            title='The Attah of Igala',
+            content_english='<p>The Attah rules from Idah, where every husband pays homage.</p>',
+        )
+        cls.author = get_user_model().objects.create_user('author', password='pass12345')
+        cls.post = BlogPost.objects.create(
+            author=cls.author, title='Market days', body='<p>Husband &amp; wife <b>trade</b> at Ega.</p>',
+            status='published',
+        )
+
+    def test_results_are_typed_ranked_and_highlighted(self):
+        with self.assertNumQueries(1):
+            results = site_search('husband')
+        self.assertEqual({r['kind'] for r in results}, {'word', 'history', 'blog'})
+        self.assertEqual(results[0]['kind'], 'word')
+        blog = next(r for r in results if r['kind'] == 'blog')
+        self.assertIn('<mark>Husband</mark> &amp; wife', blog['snippet'])
+
+    def test_diacritics_and_prefixes_match(self):
+        self.assertEqual([r['url'] for r in site_search('oko')], [reverse('single-word', args=[self.word.slug])])
+        self.assertEqual([r['kind'] for r in site_search('atta', kind='history')], ['history'])
+
+    def test_index_follows_saves(self):
+        self.post.status = 'draft'
+        self.post.save()
+        self.assertEqual(site_search('trade'), [])
+        self.article.title = 'Kings of Idah'
+        self.article.save()
+        self.assertEqual(site_search('attah of igala'), [])
+        self.assertEqual(len(site_search('kings')), 1)
+
+    def test_api(self):
+        response = self.client.get(reverse('search_api'), {'q': 'husband', 'type': 'blog'})
+        self.assertEqual([r['type'] for r in response.json()['results']], ['blog'])
+
+
+class FeedItemSyncTests(TestCase):
+    """Signals keep one feed row per public item, and rebuild_feed reproduces the same table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = get_user_model().objects.create_user('author', password='pass12345')
+
+    def feed(self):
+        return set(FeedItem.objects.values_list('item_type', 'object_id', 'title', 'excerpt', 'url', 'date'))
+
+    def feed_keys(self):
+        return set(FeedItem.objects.values_list('item_type', 'object_id'))
+
+    def test_post_follows_publish_hide_and_delete(self):
+        post = BlogPost.objects.create(author=self.author, title='Ocho', body='<p>Hello</p>', status='draft')
+        self.assertEqual(self.feed_keys(), set())
+        post.status = 'published'
+        post.save()
+        self.assertEqual(self.feed_keys(), {('blog', post.pk)})
+        post.is_hidden = True
+        post.save(update_fields=['is_hidden', 'updated_at'])
+        self.assertEqual(self.feed_keys(), set())
+        post.is_hidden = False
+        post.title = 'Ocho Ega'
+        post.save()
+        self.assertEqual(FeedItem.objects.get().title, 'Ocho Ega')
+        post.status = 'draft'
+        post.save()
+        self.assertEqual(self.feed_keys(), set())
+        post.status = 'published'
+        post.save()
+        post.delete()
+        self.assertEqual(self.feed_keys(), set())
+
+    def test_articles_and_words_are_added_and_removed(self):
+        article = HistoryArticle.objects.create(title='The Attah of Igala', excerpt='Kings at Idah')
+        word = Words.objects.create(word='omi')
+        self.assertEqual(self.feed_keys(), {('history', article.pk), ('word', word.pk)})
+        Meaning.objects.create(word=word, meaning='water', part_of_speech=PartOfSpeech.objects.create(name='noun'))
+        self.assertEqual(FeedItem.objects.get(item_type='word').excerpt, 'water')
+        article.delete()
+        word.delete()
+        self.assertEqual(self.feed_keys(), set())
+
+    def test_rebuild_matches_incremental_state(self):
+        HistoryArticle.objects.create(title='The Attah of Igala', excerpt='Kings at Idah')
+        word = Words.objects.create(word='omi')
+        Meaning.objects.create(word=word, meaning='water', part_of_speech=PartOfSpeech.objects.create(name='noun'))
+        BlogPost.objects.create(author=self.author, title='Ocho', body='<p>Hello</p>', status='published')
+        BlogPost.objects.create(author=self.author, title='Draft', body='<p>Soon</p>', status='draft')
+        BlogPost.objects.create(author=self.author, title='Hidden', body='<p>Gone</p>', status='published', is_hidden=True)
+        incremental = self.feed()
+        self.assertEqual(len(incremental), 3)
+        call_command('rebuild_feed', stdout=StringIO())
+        self.assertEqual(self.feed(), incremental)
+
+
+class KeysetCursorTests(TestCase):
+    """Tampered cursors are ignored like malformed ones instead of failing the query."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for word in ('ata', 'ebo', 'omi'):
+            Words.objects.create(word=word)
+
+    def page(self, cursor):
+        return [w.word for w in keyset_paginate(Words.objects.all(), ['lookup_key', 'id'], 2, cursor)]
+
+    def test_bad_cursors_start_from_the_first_page(self):
+        for data in ({'k': ['a', 'x']}, {'k': ['a']}, {'k': [['a'], 1]}, {'k': 'ata'}, ['ata', 1]):
+            self.assertEqual(self.page(encode_cursor(data)), ['ata', 'ebo'])
+        self.assertEqual(self.page('not base64!'), ['ata', 'ebo'])
+
+    def test_valid_cursor_pages_on(self):
+        first = keyset_paginate(Words.objects.all(), ['lookup_key', 'id'], 2)
+        self.assertEqual(self.page(first.next_cursor), ['omi'])
+
+
+class SiteCountersTests(TestCase):
+    """Signals move the counters with each change, and never below zero."""
+
+    def setUp(self):
+        SiteCounters.load()
+
+    def counters(self):
+        return SiteCounters.objects.values('word_count', 'audio_count', 'history_count', 'user_count').get()
+
+    def test_creates_and_deletes_move_the_counters(self):
+        word = Words.objects.create(word='omi', pronunciation='word_sounds/omi.mp3')
+        article = HistoryArticle.objects.create(title='Idah')
+        user = get_user_model().objects.create_user('reader', password='pass12345')
+        self.assertEqual(self.counters(), {'word_count': 1, 'audio_count': 1, 'history_count': 1, 'user_count': 1})
+        word.delete()
+        article.delete()
+        user.delete()
+        self.assertEqual(self.counters(), {'word_count': 0, 'audio_count': 0, 'history_count': 0, 'user_count': 0})
+
+    def test_removing_audio_is_counted(self):
+        word = Words.objects.create(word='omi', pronunciation='word_sounds/omi.mp3')
+        word.pronunciation = ''
+        word.save()
+        self.assertEqual(self.counters()['audio_count'], 0)
+
+    def test_drifted_counter_stops_at_zero(self):
+        word = Words.objects.create(word='omi')
+        SiteCounters.objects.update(word_count=0)
+        word.delete()
+        self.assertEqual(self.counters()['word_count'], 0)
+
+
+@override_settings(VIEW_FLUSH_INTERVAL=0)
+class ViewTrackingTests(TestCase):
+    """Views are buffered in memory, deduplicated per visitor and day, and survive a failed flush."""
+
+    @classmethod
+    def setUpTestData(cls):
+        author = get_user_model().objects.create_user('author', password='pass12345')
+        cls.post = BlogPost.objects.create(author=author, title='Ocho', body='<p>Hello</p>', status='published')
+
+    def setUp(self):
+        with view_tracking._lock:
+            view_tracking._buffer.clear()
+
+    def view(self, ip='10.0.0.1'):
+        view_tracking.record_view('blog', self.post.pk, RequestFactory().get('/', REMOTE_ADDR=ip))
+
+    def view_count(self):
+        self.post.refresh_from_db(fields=['view_count'])
+        return self.post.view_count
+
+    def test_views_wait_in_the_buffer_until_flushed(self):
+        with self.assertNumQueries(0):
+            self.view()
+            self.view()
+            self.view('10.0.0.2')
+        self.assertEqual(view_tracking.pending_views(), 2)
+        self.assertEqual(BlogPostView.objects.count(), 0)
+        self.assertEqual(view_tracking.flush_views(), 2)
+        self.assertEqual(view_tracking.pending_views(), 0)
+        self.assertEqual((BlogPostView.objects.count(), self.view_count()), (2, 2))
+
+    def test_repeat_visitor_is_not_counted_again(self):
+        self.view()
+        view_tracking.flush_views()
+        self.view()
+        view_tracking.flush_views()
+        self.assertEqual((BlogPostView.objects.count(), self.view_count()), (1, 1))
+
+    def test_flush_adds_new_visitors_to_the_sketch(self):
+        self.view()
+        self.view('10.0.0.2')
+        view_tracking.flush_views()
+        with mock.patch.object(VisitorSketch, 'add_visitors') as add_visitors:
+            self.view()
+            view_tracking.flush_views()
+        add_visitors.assert_not_called()
+        self.assertEqual(VisitorSketch.unique_visitors('blog', self.post.pk), 2)
+        self.assertEqual(VisitorSketch.unique_visitors('blog', self.post.pk, days=7), 2)
+
+    def test_admin_shows_unique_visitors(self):
+        self.view()
+        view_tracking.flush_views()
+        admin = get_user_model().objects.create_superuser('admin', password='pass12345')
+        self.client.force_login(admin)
+        response = self.client.get(reverse('admin:blog_blogpost_change', args=[self.post.pk]))
+        self.assertContains(response, 'Unique visitors (all time)')
+
+    def assert_retry_counts_once(self, failing):
+        self.view()
+        with mock.patch.object(view_tracking, failing, side_effect=DatabaseError('gone')), \
+                self.assertLogs('main.view_tracking', 'ERROR'):
+            view_tracking.flush_views()
+        # Nothing of the failed batch was kept.
+        self.assertEqual((view_tracking.pending_views(), BlogPostView.objects.count()), (1, 0))
+        view_tracking.flush_views()
+        self.assertEqual((BlogPostView.objects.count(), view_tracking.pending_views()), (1, 0))
+        self.assertEqual(self.view_count(), 1)
+        self.assertEqual(VisitorSketch.unique_visitors('blog', self.post.pk), 1)
+
+    def test_failed_count_update_keeps_the_views(self):
+        self.assert_retry_counts_once('_bump_view_counts')
+
+    def test_failed_sketch_update_keeps_the_views(self):
+        self.assert_retry_counts_once('_update_sketches')
+
+    def cached_detail(self):
+        """The anonymous detail page, stored in the page cache on the second request."""
+        caches[settings.PAGE_CACHE_ALIAS].clear()
+        url = reverse('blog:blog_detail', kwargs={'slug': self.post.slug})
+        self.client.get(url)
+        self.client.get(url)
+        return url
+
+    def test_flush_purges_pages_showing_the_count(self):
+        url = self.cached_detail()
+        with self.captureOnCommitCallbacks(execute=True):
+            view_tracking.flush_views()
+        self.assertContains(self.client.get(url), '1 view<')
+
+    def test_reconcile_purges_pages_showing_the_count(self):
+        BlogPost.objects.filter(pk=self.post.pk).update(view_count=7)
+        url = self.cached_detail()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('reconcile_view_counts', stdout=StringIO())
+        self.assertContains(self.client.get(url), '1 view<')
+
+    def test_views_of_deleted_posts_are_skipped(self):
+        self.view()
+        BlogPost.objects.filter(pk=self.post.pk).delete()
+        self.assertEqual(view_tracking.flush_views(), 1)
+        self.assertEqual(BlogPostView.objects.count(), 0)
+
+
+class ViewCompactionTests(TestCase):
+    """compact_views rolls raw views up before pruning them, and later rebuilds keep the pruned visitors."""
+
+    @classmethod
+    def setUpTestData(cls):
+        author = get_user_model().objects.create_user('author', password='pass12345')
+        cls.post = BlogPost.objects.create(author=author, title='Ocho', body='<p>Hello</p>', status='published')
+        today = timezone.localdate()
+        cls.old_day = today - timedelta(days=100)
+        cls.recent_day = today - timedelta(days=2)
+        views = [
+            (cls.old_day, 'a'), (cls.old_day, 'b'), (cls.old_day, 'c'),
+            (cls.recent_day, 'a'), (cls.recent_day, 'd'),
+        ]
+        BlogPostView.objects.bulk_create(
+            BlogPostView(post=cls.post, ip_hash=ip_hash, viewed_date=day) for day, ip_hash in views
+        )
+        for day in (cls.old_day, cls.recent_day):
+            ip_hashes = [ip_hash for view_day, ip_hash in views if view_day == day]
+            VisitorSketch.add_visitors('blog', cls.post.pk, day, ip_hashes)
+
+    def setUp(self):
+        # compact_views flushes the buffer first; views left by other tests don't belong here.
+        with view_tracking._lock:
+            view_tracking._buffer.clear()
+
+    def compact(self):
+        call_command('compact_views', keep_days=90, stdout=StringIO())
+
+    def test_rollup_matches_the_pruned_rows(self):
+        raw = dict(
+            BlogPostView.objects.filter(viewed_date__lt=timezone.localdate())
+            .values('viewed_date').annotate(n=Count('id')).values_list('viewed_date', 'n')
+        )
+        self.compact()
+        self.compact()
+        rollup = dict(DailyViews.objects.filter(kind='blog', object_id=self.post.pk).values_list('day', 'unique_views'))
+        self.assertEqual(rollup, raw)
+        self.assertEqual(rollup, {self.old_day: 3, self.recent_day: 2})
+        self.assertEqual(set(BlogPostView.objects.values_list('viewed_date', flat=True)), {self.recent_day})
+
+    def test_reconciled_count_includes_pruned_days(self):
+        self.compact()
+        call_command('reconcile_view_counts', stdout=StringIO())
+        self.post.refresh_from_db(fields=['view_count'])
+        self.assertEqual(self.post.view_count, 5)
+
+    def test_rebuild_after_compaction_keeps_pruned_visitors(self):
+        self.compact()
+        call_command('rebuild_visitor_sketches', stdout=StringIO())
+        self.assertEqual(VisitorSketch.unique_visitors('blog', self.post.pk), 4)
+        self.assertEqual(VisitorSketch.unique_visitors('blog', self.post.pk, days=7), 2)
+        self.assertFalse(VisitorSketch.objects.filter(day=self.old_day).exists())
+
+
+class HyperLogLogTests(TestCase):
+    """Sketch estimates stay close to the true distinct count and merge like set unions."""
+
+    ip_hashes = [
+        hashlib.sha256(f'10.{i >> 16}.{(i >> 8) & 255}.{i & 255}'.encode()).hexdigest()
+        for i in range(10000)
+    ]
+
+    def test_estimate_is_within_three_percent(self):
+        sketch = HyperLogLog()
+        sketch.update(self.ip_hashes)
+        sketch.update(self.ip_hashes[:5000])
+        self.assertAlmostEqual(sketch.count(), 10000, delta=300)
+
+    def test_union_matches_a_single_sketch(self):
+        first, second, whole = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        first.update(self.ip_hashes[:6000])
+        second.update(self.ip_hashes[4000:])
+        whole.update(self.ip_hashes)
+        self.assertEqual(HyperLogLog.union([first, second]).count(), whole.count())
+        self.assertEqual(HyperLogLog(whole.to_bytes()).count(), whole.count())
+
+    def test_small_counts_are_exact_enough(self):
+        sketch = HyperLogLog()
+        self.assertEqual(sketch.count(), 0)
+        sketch.update(self.ip_hashes[:100])
+        self.assertAlmostEqual(sketch.count(), 100, delta=3)
@@ -17,4 +17,8 @@ urlpatterns = [
     # Feed
     path('feed/', views.feed_page, name='feed'),
     path('api/feed/', views.feed_api, name='feed_api'),
+
+    # Search
+    path('search/', views.search, name='search'),
+    path('api/search/', views.search_api, name='search_api'),
 ]
@@ -1,5 +1,9 @@
+import base64
 import hashlib
+import json
 
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.db.models import Count, Q
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.shortcuts import get_object_or_404
@@ -86,3 +90,134 @@ def get_filtered_queryset(queryset, filter_class, request):
     """
     filter_instance = filter_class(request.GET, queryset=queryset)
     return filter_instance.qs, filter_instance
+
+
+def get_cached_count(cache_key, queryset, timeout=None):
+    """
+    Return queryset.count(), cached under cache_key.
+    Callers put a version in the key (or delete it) when the rows change.
+    """
+    count = cache.get(cache_key)
+    if count is None:
+        count = queryset.count()
+        cache.set(cache_key, count, timeout)
+    return count
+
+
+def encode_cursor(data):
+    """Opaque, URL-safe token for a pagination cursor."""
+    raw = json.dumps(data, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Inverse of encode_cursor; returns None for missing or malformed tokens."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        return json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+
+
+class KeysetPage:
+    """One page of a keyset-paginated queryset, with tokens for its neighbours."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def _keyset_filter(fields, values, forward):
+    """Rows strictly after (forward) or before the given key, for ascending fields."""
+    op = 'gt' if forward else 'lt'
+    condition = Q()
+    for i, field in enumerate(fields):
+        step = Q(**{f'{field}__{op}': values[i]})
+        for prev_field, prev_value in zip(fields[:i], values[:i]):
+            step &= Q(**{prev_field: prev_value})
+        condition |= step
+    return condition
+
+
+def _cursor_key(model, fields, values):
+    """
+    The cursor's key values converted to each field's Python type, or None when
+    they do not fit the fields (a tampered or stale token), so it is ignored.
+    """
+    if not isinstance(values, list) or len(values) != len(fields):
+        return None
+    key = []
+    for name, value in zip(fields, values):
+        if value is not None and not isinstance(value, (str, int, float)):
+            return None
+        field = model._meta.get_field(name)
+        try:
+            value = field.to_python(value)
+        except ValidationError:
+            return None
+        if value is None and not field.null:
+            return None
+        key.append(value)
+    return key
+
+
+def keyset_paginate(queryset, fields, per_page, cursor=None):
+    """
+    Paginate a queryset by key instead of OFFSET.
+
+    Args:
+        queryset: QuerySet to paginate
+        fields: Ascending field names that together uniquely order the rows
+        per_page: Number of results per page
+        cursor: Token from a previous page's next_cursor/previous_cursor
+
+    Returns:
+        KeysetPage; each page costs one indexed range query and no COUNT
+    """
+    fields = list(fields)
+    data = decode_cursor(cursor)
+    values = _cursor_key(queryset.model, fields, data.get('k')) if isinstance(data, dict) else None
+    forward = values is None or data.get('d') != 'p'
+
+    qs = queryset
+    if values is not None:
+        qs = qs.filter(_keyset_filter(fields, values, forward))
+    if forward:
+        qs = qs.order_by(*fields)
+    else:
+        qs = qs.order_by(*[f'-{field}' for field in fields])
+
+    rows = list(qs[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if not forward:
+        rows.reverse()
+
+    def key_of(obj):
+        key = [getattr(obj, field) for field in fields]
+        return [v.isoformat() if hasattr(v, 'isoformat') else v for v in key]
+
+    next_cursor = previous_cursor = None
+    if rows:
+        if has_more or not forward:
+            next_cursor = encode_cursor({'d': 'n', 'k': key_of(rows[-1])})
+        if values is not None and (forward or has_more):
+            previous_cursor = encode_cursor({'d': 'p', 'k': key_of(rows[0])})
+    return KeysetPage(rows, next_cursor, previous_cursor)
@@ -0,0 +1,205 @@
+"""
+Write-behind recording of unique daily views for blog posts and history articles.
+
+record_view() only adds a (content, ip_hash, date) triple to an in-process
+buffer, so page reads (and page-cache hits) never wait on the database. A
+daemon thread per process writes the buffer out every VIEW_FLUSH_INTERVAL
+seconds, or as soon as VIEW_BUFFER_SIZE triples are waiting, with one
+bulk_create(ignore_conflicts=True) per model: the unique (object, ip_hash,
+viewed_date) constraint drops repeat views, including ones buffered by other
+processes. The same flush folds the new visitors into each object's
+HyperLogLog sketches (main.models.VisitorSketch, shown as unique visitors in
+the admin) and adds them to the view_count column of the post or article, so list pages read a plain column
+(`python manage.py reconcile_view_counts` corrects any drift), and purges the
+cached pages that show those counts. Whatever is
+left is flushed when the process exits.
+
+Each kind's rows, counts and sketches are written in one transaction. If
+writing a batch fails (say the database connection drops during a deploy),
+nothing of it is kept and its views go back into the buffer for the next
+flush, where they count as new again. A
+crash can lose at most one interval of views, which is acceptable for
+visitor counts. With VIEW_FLUSH_INTERVAL = 0 no thread is started and callers
+flush explicitly with flush_views() (tests do this).
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import Counter
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .page_cache import purge_tags
+from .utils import get_client_ip_hash
+
+logger = logging.getLogger(__name__)
+
+# kind -> (model label, foreign key column)
+TRACKED_VIEWS = {
+    'blog': ('blog.BlogPostView', 'post_id'),
+    'history': ('history.ArticleView', 'article_id'),
+}
+
+# kind -> page-cache tags of the pages that show an object's view_count
+VIEW_COUNT_TAGS = {
+    'blog': ('blog:{}', 'blog-list'),
+    'history': ('history:{}',),
+}
+
+_lock = threading.Lock()
+_wakeup = threading.Event()
+_buffer = set()
+_owner_pid = None
+_flusher = None
+
+# A failed batch is put back only while the buffer is below this many
+# multiples of VIEW_BUFFER_SIZE, so a long outage cannot grow it without bound.
+MAX_BACKLOG_FACTOR = 20
+
+
+def _buffer_size():
+    return getattr(settings, 'VIEW_BUFFER_SIZE', 500)
+
+
+def _flush_interval():
+    return getattr(settings, 'VIEW_FLUSH_INTERVAL', 30)
+
+
+def _flush_loop():
+    while True:
+        _wakeup.wait(_flush_interval())
+        _wakeup.clear()
+        try:
+            flush_views()
+        except Exception:
+            # Never let one bad flush stop the thread; the next one retries.
+            logger.exception('View flush failed')
+        finally:
+            connections.close_all()
+
+
+def _ensure_flusher():
+    """Start this process's flusher thread (again after a fork or if it died). Call with _lock held."""
+    global _owner_pid, _flusher
+    pid = os.getpid()
+    if _owner_pid != pid:
+        # A forked worker inherits the parent's buffer but not its thread.
+        _buffer.clear()
+        _owner_pid = pid
+        _flusher = None
+    if _flush_interval() > 0 and (_flusher is None or not _flusher.is_alive()):
+        _flusher = threading.Thread(target=_flush_loop, name='view-flusher', daemon=True)
+        _flusher.start()
+
+
+def record_view(kind, object_id, request):
+    """Queue one view of a TRACKED_VIEWS object by this visitor today."""
+    ip_hash = get_client_ip_hash(request)
+    if not ip_hash:
+        return
+    with _lock:
+        _ensure_flusher()
+        _buffer.add((kind, object_id, ip_hash, timezone.localdate()))
+        full = len(_buffer) >= _buffer_size()
+    if full:
+        _wakeup.set()
+
+
+def pending_views():
+    """Number of views waiting to be written by this process."""
+    with _lock:
+        return len(_buffer)
+
+
+def flush_views(at_exit=False):
+    """Write every buffered view now; returns the number of triples flushed."""
+    global _buffer
+    with _lock:
+        batch, _buffer = _buffer, set()
+    if not batch:
+        return 0
+
+    by_kind = {}
+    for kind, object_id, ip_hash, viewed_date in batch:
+        by_kind.setdefault(kind, []).append((object_id, ip_hash, viewed_date))
+
+    for kind, views in by_kind.items():
+        try:
+            _flush_kind(kind, views)
+        except Exception as exc:
+            if at_exit:
+                # The database may already be gone (e.g. a destroyed test database).
+                logger.warning('Dropped %d buffered %s view(s) at exit: %s', len(views), kind, exc)
+                continue
+            logger.exception('Could not write %d buffered %s view(s)', len(views), kind)
+            _requeue(kind, views)
+    return len(batch)
+
+
+@transaction.atomic
+def _flush_kind(kind, views):
+    label, fk = TRACKED_VIEWS[kind]
+    model = apps.get_model(label)
+    target = model._meta.get_field(fk).related_model
+    # Skip objects deleted since they were viewed, so one stale id cannot fail the batch.
+    live = set(target.objects.filter(pk__in={view[0] for view in views}).values_list('pk', flat=True))
+    views = [view for view in views if view[0] in live]
+    # Views recorded by an earlier flush (or another process) are not new visitors.
+    seen = set(
+        model.objects.filter(
+            **{f'{fk}__in': live},
+            ip_hash__in={view[1] for view in views},
+            viewed_date__in={view[2] for view in views},
+        ).values_list(fk, 'ip_hash', 'viewed_date')
+    )
+    new_views = [view for view in views if view not in seen]
+    objs = [
+        model(**{fk: object_id, 'ip_hash': ip_hash, 'viewed_date': viewed_date})
+        for object_id, ip_hash, viewed_date in new_views
+    ]
+    model.objects.bulk_create(objs, batch_size=500, ignore_conflicts=True)
+    _bump_view_counts(target, new_views)
+    purge_view_count_pages(kind, (object_id for object_id, _, _ in new_views))
+    # Repeat visitors are already in the sketch, so only new visitor-days touch it.
+    _update_sketches(kind, new_views)
+
+
+def _requeue(kind, views):
+    """Put a failed batch back for the next flush, unless the backlog is already too long."""
+    with _lock:
+        if len(_buffer) >= _buffer_size() * MAX_BACKLOG_FACTOR:
+            logger.warning('View backlog full; dropped %d %s view(s)', len(views), kind)
+            return
+        _buffer.update((kind, *view) for view in views)
+
+
+def purge_view_count_pages(kind, object_ids):
+    """Drop the cached pages that show the view_count of these objects."""
+    object_ids = set(object_ids)
+    if object_ids:
+        purge_tags(*{tag.format(object_id) for tag in VIEW_COUNT_TAGS[kind] for object_id in object_ids})
+
+
+def _bump_view_counts(target, new_views):
+    """Add the new visitor-days to each object's denormalized view_count."""
+    per_object = Counter(object_id for object_id, _, _ in new_views)
+    for object_id, added in per_object.items():
+        target.objects.filter(pk=object_id).update(view_count=F('view_count') + added)
+
+
+def _update_sketches(kind, views):
+    from .models import VisitorSketch
+
+    visitors = {}
+    for object_id, ip_hash, viewed_date in views:
+        visitors.setdefault((object_id, viewed_date), []).append(ip_hash)
+    for (object_id, viewed_date), ip_hashes in visitors.items():
+        VisitorSketch.add_visitors(kind, object_id, viewed_date, ip_hashes)
+
+
+atexit.register(flush_views, at_exit=True)
@@ -5,44 +5,30 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db import IntegrityError
 from django.http import JsonResponse
-from .models import Community, Pioneer
+from .models import Community, Pioneer, SiteCounters
 from dictionary.models import Words, Example, ContributionStats
 from .utils import get_aggregated_counts, get_first_instance
 from .forms import CustomUserRegistrationForm, CustomLoginForm
 from .feeds_utils import get_feed_items
-from django.contrib.auth import get_user_model
+from .search import site_search
+from .page_cache import tag_page
 
 logger = logging.getLogger(__name__)
 
 
 def mainpage(request):
-    fields_to_count = [
-        ('word', ''),
-        ('pronunciation', ''),
-        ('igala_example', '')
-    ]
-    
     pioneers = Pioneer.objects.all()[:3]
     recent_words = Words.objects.select_related('contributor').order_by('-id')[:3]
     recent_examples = Example.objects.order_by('-id')[:2]
-    word_count = Words.objects.count()
-    audio_count = Words.objects.exclude(pronunciation__isnull=True).exclude(pronunciation='').count()
-    contributor_count = ContributionStats.objects.filter(approved_words_count__gt=0).count()
-    history_count = 0
-    try:
-        from history.models import HistoryArticle
-        history_count = HistoryArticle.objects.count()
-    except Exception:
-        pass
-    if contributor_count == 0:
-        User = get_user_model()
-        contributor_count = User.objects.count()
+    counters = SiteCounters.load()
+    contributor_count = counters.contributor_count or counters.user_count
 
+    tag_page(request, 'site-counters', 'recent-words', 'recent-examples', 'pioneers', 'community')
     context = {
-        'word_count': word_count,
-        'audio_count': audio_count,
+        'word_count': counters.word_count,
+        'audio_count': counters.audio_count,
         'contributor_count': contributor_count,
-        'history_count': history_count,
+        'history_count': counters.history_count,
         'community_stats': get_first_instance(Community),
         'pioneers': pioneers,
         'recent_words': recent_words,
@@ -54,6 +40,7 @@ def mainpage(request):
 
 def about(request):
     """About page view"""
+    tag_page(request)
     context = {
         'page_title': 'About Igalapedia'
     }
@@ -61,13 +48,52 @@ def about(request):
 
 
 def translator(request):
-    """Translator page view (placeholder for future implementation)"""
+    """Translator page view: English -> Igala word lookup (full translation still to come)"""
+    from dictionary.reverse_lookup import reverse_lookup
+
+    query = (request.GET.get('q') or '').strip()
     context = {
-        'page_title': 'English - Igala Translator'
+        'page_title': 'English - Igala Translator',
+        'query': query,
+        'results': reverse_lookup(query) if query else [],
     }
     return render(request, 'main/translator.html', context)
 
 
+def search(request):
+    """Site-wide search across dictionary words, history articles and blog posts."""
+    query = (request.GET.get('q') or '').strip()
+    kind = request.GET.get('type') or ''
+    context = {
+        'page_title': 'Search - Igalapedia',
+        'query': query,
+        'kind': kind,
+        'results': site_search(query, kind=kind) if query else [],
+    }
+    return render(request, 'main/search.html', context)
+
+
+def search_api(request):
+    """JSON API for the site search (?q=, optional ?type=word|history|blog and ?limit=)."""
+    try:
+        limit = min(50, max(1, int(request.GET.get('limit', 20))))
+    except (TypeError, ValueError):
+        limit = 20
+    results = site_search(request.GET.get('q'), kind=request.GET.get('type'), limit=limit)
+    return JsonResponse({
+        'results': [
+            {
+                'type': result['kind'],
+                'type_label': result['kind_label'],
+                'url': result['url'],
+                'title_html': result['title'],
+                'snippet_html': result['snippet'],
+            }
+            for result in results
+        ],
+    })
+
+
 def api_docs(request):
     """API documentation page view (placeholder for future implementation)"""
     context = {
@@ -156,18 +182,15 @@ def user_login(request):
     else:
         form = CustomLoginForm()
     
-    # Get dynamic statistics for the login page
-    total_words = Words.objects.count()
-    total_examples = Example.objects.count()
-    # Count contributors with at least one approved word
-    total_contributors = ContributionStats.objects.filter(approved_words_count__gt=0).count()
+    # Site statistics for the login page
+    counters = SiteCounters.load()
     
     context = {
         'form': form,
         'page_title': 'Login - Igalapedia',
-        'total_words': total_words,
-        'total_examples': total_examples,
-        'total_contributors': total_contributors,
+        'total_words': counters.word_count,
+        'total_examples': counters.example_count,
+        'total_contributors': counters.contributor_count,
     }
     return render(request, 'main/login.html', context)
 
@@ -227,6 +250,7 @@ def user_dashboard(request):
 def pioneers_page(request):
     """Display all pioneers"""
     pioneers = Pioneer.objects.all()
+    tag_page(request, 'pioneers')
     
     context = {
         'pioneers': pioneers,
@@ -238,10 +262,12 @@ def pioneers_page(request):
 def feed_page(request):
     """Discovery feed: mixed content from dictionary and history."""
     page_size = 12
-    items, has_more, total = get_feed_items(offset=0, limit=page_size)
+    items, next_cursor, total = get_feed_items(limit=page_size)
+    tag_page(request, 'feed')
     context = {
         'feed_items': items,
-        'has_more': has_more,
+        'has_more': next_cursor is not None,
+        'next_cursor': next_cursor,
         'total': total,
         'page_size': page_size,
         'page_title': 'Discover - IgalaHeritage',
@@ -250,13 +276,12 @@ def feed_page(request):
 
 
 def feed_api(request):
-    """JSON API for feed pagination (infinite scroll)."""
+    """JSON API for feed pagination (infinite scroll), paged by the opaque ?cursor= token."""
     try:
-        offset = max(0, int(request.GET.get('offset', 0)))
         limit = min(24, max(1, int(request.GET.get('limit', 12))))
     except (TypeError, ValueError):
-        offset, limit = 0, 12
-    items, has_more, total = get_feed_items(offset=offset, limit=limit)
+        limit = 12
+    items, next_cursor, total = get_feed_items(cursor=request.GET.get('cursor'), limit=limit)
     # Serialize for JSON (date to ISO string)
     out = []
     for it in items:
@@ -268,4 +293,9 @@ def feed_api(request):
             'type': it['type'],
             'date': it['date'].isoformat() if it.get('date') else None,
         })
-    return JsonResponse({'items': out, 'has_more': has_more, 'total': total})
\ No newline at end of file
+    return JsonResponse({
+        'items': out,
+        'has_more': next_cursor is not None,
+        'next_cursor': next_cursor,
+        'total': total,
+    })
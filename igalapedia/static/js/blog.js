@@ -1,5 +1,5 @@
 /**
- * Blog detail page: like toggle (AJAX), share buttons, reply toggle
+ * Blog detail page: like toggle (AJAX), share buttons, reply toggle, more comments
  */
 (function () {
   'use strict';
@@ -79,21 +79,61 @@
     });
   });
 
-  // Reply toggle
-  document.querySelectorAll('.blog-reply-toggle').forEach(function (btn) {
-    btn.addEventListener('click', function () {
-      var id = btn.dataset.commentId;
-      var wrap = document.getElementById('reply-form-' + id);
-      if (wrap) {
-        wrap.style.display = wrap.style.display === 'none' ? 'block' : 'none';
+  // Reply toggle (delegated: threads loaded later get the same behaviour).
+  // Comment threads are cached without CSRF tokens, so one shared reply form
+  // is moved under whichever comment is being answered.
+  var replyWrap = document.getElementById('blog-reply-form-wrap');
+  document.addEventListener('click', function (e) {
+    var toggle = e.target.closest('.blog-reply-toggle');
+    if (toggle && replyWrap) {
+      var comment = document.getElementById('comment-' + toggle.dataset.commentId);
+      var parentInput = replyWrap.querySelector('[name=parent]');
+      var isOpen = replyWrap.style.display !== 'none' && parentInput.value === toggle.dataset.commentId;
+      if (isOpen) {
+        replyWrap.style.display = 'none';
+        return;
       }
-    });
+      parentInput.value = toggle.dataset.commentId;
+      if (comment) comment.insertAdjacentElement('afterend', replyWrap);
+      replyWrap.style.display = 'block';
+      replyWrap.querySelector('textarea').focus();
+      return;
+    }
+    var cancel = e.target.closest('.blog-reply-cancel');
+    if (cancel && replyWrap) {
+      replyWrap.style.display = 'none';
+    }
   });
 
-  document.querySelectorAll('.blog-reply-cancel').forEach(function (btn) {
+  // Load more comment threads; each page carries the cursor of the next one.
+  function lastCursor(listEl) {
+    var pages = listEl.querySelectorAll('.blog-comment-page');
+    return pages.length ? pages[pages.length - 1].dataset.nextCursor || '' : '';
+  }
+
+  document.querySelectorAll('.blog-comments-more').forEach(function (btn) {
+    var listEl = document.getElementById('blog-comments-list');
+    if (!listEl) return;
+    if (lastCursor(listEl)) btn.style.display = '';
     btn.addEventListener('click', function () {
-      var wrap = btn.closest('.blog-reply-form-wrap');
-      if (wrap) wrap.style.display = 'none';
+      var cursor = lastCursor(listEl);
+      if (btn.disabled || !cursor) return;
+      btn.disabled = true;
+      var url = btn.dataset.url + '?cursor=' + encodeURIComponent(cursor);
+      fetch(url, { headers: { 'Accept': 'application/json' }, credentials: 'same-origin' })
+        .then(function (r) { return r.json(); })
+        .then(function (data) {
+          if (data.html) listEl.insertAdjacentHTML('beforeend', data.html);
+          if (lastCursor(listEl)) {
+            btn.disabled = false;
+          } else {
+            btn.parentElement.remove();
+          }
+        })
+        .catch(function () {
+          btn.disabled = false;
+          btn.textContent = 'Could not load comments. Try again.';
+        });
     });
   });
 })();
@@ -49,6 +49,24 @@
         return col;
     }
 
+    function renderSuggestions(suggestions) {
+        var col = document.createElement('div');
+        col.className = 'col-12 text-center pb-2';
+        var label = document.createElement('p');
+        label.className = 'text-muted mb-0';
+        label.textContent = 'Did you mean:';
+        col.appendChild(label);
+        suggestions.forEach(function (item, i) {
+            var a = document.createElement('a');
+            a.href = buildSingleWordUrl(item.slug);
+            a.className = 'fw-bold mx-1';
+            a.textContent = item.word;
+            col.appendChild(a);
+            if (i < suggestions.length - 1) col.appendChild(document.createTextNode(','));
+        });
+        return col;
+    }
+
     function renderLoading() {
         var col = document.createElement('div');
         col.className = 'col-12 text-center py-5 text-muted';
@@ -95,6 +113,9 @@
                     var words = data.words || [];
                     if (words.length === 0) {
                         row.appendChild(renderNoResults());
+                        if (data.suggestions && data.suggestions.length) {
+                            row.insertBefore(renderSuggestions(data.suggestions), row.firstChild);
+                        }
                     } else {
                         words.forEach(function (item) {
                             row.appendChild(renderWordCard(item.word, item.slug));
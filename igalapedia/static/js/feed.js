@@ -5,7 +5,7 @@
   var apiUrl = window.FEED_API_URL;
   var pageSize = window.FEED_PAGE_SIZE || 12;
   var hasMore = window.FEED_INITIAL_HAS_MORE !== false;
-  var offset = window.FEED_OFFSET || 0;
+  var cursor = window.FEED_CURSOR || '';
   var loading = false;
   var listEl = document.getElementById('feed-list');
   var sentinelEl = document.getElementById('feed-sentinel');
@@ -62,16 +62,16 @@
     if (loadingEl) loadingEl.style.display = 'block';
     if (hintEl) hintEl.style.display = 'none';
 
-    var url = apiUrl + '?offset=' + encodeURIComponent(offset) + '&limit=' + encodeURIComponent(pageSize);
+    var url = apiUrl + '?cursor=' + encodeURIComponent(cursor) + '&limit=' + encodeURIComponent(pageSize);
     fetch(url, { headers: { 'Accept': 'application/json' } })
       .then(function (res) { return res.json(); })
       .then(function (data) {
         if (data.items && data.items.length) {
           var html = data.items.map(buildCard).join('');
           listEl.insertAdjacentHTML('beforeend', html);
-          offset += data.items.length;
         }
-        hasMore = data.has_more === true;
+        cursor = data.next_cursor || '';
+        hasMore = data.has_more === true && cursor !== '';
         if (!hasMore && endEl) {
           endEl.style.display = 'block';
         }